@@ -0,0 +1,68 @@
+import argparse
+import json
+import random
+import string
+import time
+from typing import Any, Callable, Dict, List
+from ..storage.codec import available_codecs, get_codec
+
+def _word(rnd: random.Random, size: int) -> str:
+    return ''.join(rnd.choices(string.ascii_letters + 'абвгдеёжзийклмнопрстуфхцчшщыэюя ', k=size))
+
+def _user(rnd: random.Random) -> Dict[str, Any]:
+    return {'username': _word(rnd, 12), 'first_seen': rnd.randint(1600000000, 1700000000), 'messages': rnd.randint(0, 100000), 'warns': rnd.randint(0, 3), 'afk_reply': rnd.random() * 1700000000, 'notes': [_word(rnd, 24) for _ in range(rnd.randint(0, 4))], 'flags': {'muted': rnd.random() < 0.1, 'trusted': rnd.random() < 0.05}}
+
+def _chat(rnd: random.Random) -> Dict[str, Any]:
+    return {'title': _word(rnd, 20), 'autoreact': rnd.random() < 0.3, 'filters': {_word(rnd, 6): _word(rnd, 40) for _ in range(rnd.randint(0, 6))}, 'members': rnd.randint(2, 200000)}
+
+def build_database(size_mb: float, seed: int=0) -> Dict[str, Any]:
+    rnd = random.Random(seed)
+    data = {'config': {'owner_logs': [{'user_id': rnd.randint(10 ** 8, 10 ** 10), 'action': 'give_owner', 'target': str(rnd.randint(10 ** 8, 10 ** 10)), 'timestamp': time.time()} for _ in range(100)], 'auto_replies': {_word(rnd, 8): _word(rnd, 60) for _ in range(50)}}, 'modules': {'api_limiter': {'config': {'time_sample': 15, 'threshold': 100, 'local_floodwait': 30}, 'enabled': True}}, 'users': {}, 'chats': {}, 'misc': {}}
+    target = int(size_mb * 1024 * 1024)
+    size = len(json.dumps(data, ensure_ascii=False))
+    while size < target:
+        user_id = str(rnd.randint(10 ** 8, 10 ** 10))
+        data['users'][user_id] = _user(rnd)
+        size += len(json.dumps(data['users'][user_id], ensure_ascii=False)) + len(user_id) + 4
+        if rnd.random() < 0.2:
+            chat_id = str(-rnd.randint(10 ** 12, 10 ** 13))
+            data['chats'][chat_id] = _chat(rnd)
+            size += len(json.dumps(data['chats'][chat_id], ensure_ascii=False)) + len(chat_id) + 4
+    return data
+
+def _best(func: Callable, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+def run(size_mb: float=5.0, repeat: int=5) -> List[Dict[str, Any]]:
+    data = build_database(size_mb)
+    candidates = [('json (indent=2)', lambda obj: json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8'), json.loads)]
+    for name in available_codecs():
+        codec = get_codec(name)
+        candidates.append((name, codec.dumps, codec.loads))
+    results = []
+    for name, dumps, loads in candidates:
+        payload = dumps(data)
+        results.append({'codec': name, 'encode_ms': _best(lambda: dumps(data), repeat) * 1000, 'decode_ms': _best(lambda: loads(payload), repeat) * 1000, 'size_bytes': len(payload)})
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Argent storage codec micro-benchmark')
+    parser.add_argument('--size-mb', type=float, default=5.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args(argv)
+    results = run(args.size_mb, args.repeat)
+    print(f"{'codec':<18}{'encode ms':>12}{'decode ms':>12}{'size KB':>12}")
+    for row in results:
+        print(f"{row['codec']:<18}{row['encode_ms']:>12.1f}{row['decode_ms']:>12.1f}{row['size_bytes'] / 1024:>12.1f}")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'size_mb': args.size_mb, 'repeat': args.repeat, 'results': results}, f, indent=2)
+    return results
+if __name__ == '__main__':
+    main()
\ No newline at end of file
@@ -0,0 +1,70 @@
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+from ..utils.config_defaults import DEFAULT_CONFIG
+from ..utils.config_manager import ConfigManager
+PATHS = ('interface.hide_commands', 'userbot.command_prefix', 'api_id', 'performance.request_retries', 'modules.bench.missing')
+
+def _walk(data: Dict, path: str) -> Any:
+    current = data
+    for key in path.split('.'):
+        if isinstance(current, dict) and key in current:
+            current = current[key]
+        else:
+            return None
+    return current
+
+def legacy_get(config: ConfigManager, path: str, default: Any=None) -> Any:
+    for layer in (config._user_config, config._config, DEFAULT_CONFIG):
+        value = _walk(layer, path)
+        if value is not None:
+            return value
+    return default
+
+def _ns_per_call(func: Callable[[], Any], ops: int, repeat: int) -> float:
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in range(ops):
+            func()
+        best = min(best, time.perf_counter() - started)
+    return best / ops * 1000000000.0
+
+def run(ops: int=200000, repeat: int=5) -> List[Dict[str, Any]]:
+    data_dir = tempfile.mkdtemp(prefix='argent-bench-')
+    try:
+        config = ConfigManager(data_dir)
+        config.set_system('api_id', 12345)
+        results = []
+        for path in PATHS:
+            before = _ns_per_call(lambda: legacy_get(config, path, False), ops, repeat)
+            after = _ns_per_call(lambda: config.get(path, False), ops, repeat)
+            results.append({'path': path, 'before_ns': before, 'after_ns': after, 'speedup': before / after if after else 0.0})
+        before = _ns_per_call(lambda: legacy_get(config, 'interface.hide_commands', False), ops, repeat)
+        after = _ns_per_call(lambda: config.get_bool('interface.hide_commands'), ops, repeat)
+        results.append({'path': 'get_bool(interface.hide_commands)', 'before_ns': before, 'after_ns': after, 'speedup': before / after if after else 0.0})
+        after = _ns_per_call(lambda: config.settings.interface.hide_commands, ops, repeat)
+        results.append({'path': 'settings.interface.hide_commands', 'before_ns': before, 'after_ns': after, 'speedup': before / after if after else 0.0})
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='ConfigManager.get lookup benchmark (nested walk vs flat cache)')
+    parser.add_argument('--ops', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args(argv)
+    results = run(args.ops, args.repeat)
+    print(f"{'lookup':<40}{'before ns':>12}{'after ns':>12}{'speedup':>10}")
+    for row in results:
+        print(f"{row['path']:<40}{row['before_ns']:>12.0f}{row['after_ns']:>12.0f}{row['speedup']:>9.1f}x")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'ops': args.ops, 'repeat': args.repeat, 'results': results}, f, indent=2)
+    return results
+if __name__ == '__main__':
+    main()
\ No newline at end of file
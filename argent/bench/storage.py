@@ -0,0 +1,157 @@
+import argparse
+import json
+import logging
+import platform
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from .codec import build_database
+from ..storage.codec import available_codecs
+from ..storage.database import ArgentDatabase
+from ..utils.config_manager import ConfigManager
+from ..security.owner_manager import OwnerManager
+from ..security.permissions import PermissionEngine
+DEFAULT_SIZES = (0.001, 0.1, 1.0, 10.0, 50.0)
+DEFAULT_STORAGES = ('json', 'journal', 'sqlite')
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+def _latencies(func: Callable[[int], Any], ops: int, budget: float) -> List[float]:
+    samples = []
+    deadline = time.perf_counter() + budget
+    for i in range(ops):
+        started = time.perf_counter()
+        func(i)
+        finished = time.perf_counter()
+        samples.append(finished - started)
+        if finished > deadline:
+            break
+    return samples
+
+def _throughput(func: Callable[[int], Any], ops: int) -> float:
+    started = time.perf_counter()
+    for i in range(ops):
+        func(i)
+    elapsed = time.perf_counter() - started
+    return ops / elapsed if elapsed else 0.0
+
+def _summary(samples: List[float]) -> Dict[str, Any]:
+    total = sum(samples)
+    return {'ops': len(samples), 'ops_per_sec': len(samples) / total if total else 0.0, 'p50_ms': _percentile(samples, 0.5) * 1000, 'p99_ms': _percentile(samples, 0.99) * 1000}
+
+def _disk_size(path: Path) -> int:
+    return sum((p.stat().st_size for p in path.rglob('*') if p.is_file() and p.suffix != '.lock'))
+
+def _seed(data_dir: Path, storage: str, data: Dict[str, Any], shards: int):
+    db = ArgentDatabase(str(data_dir), write_behind=True, storage=storage, shards=shards)
+    try:
+        with db.batch():
+            for section, entries in data.items():
+                db.set_many(section, entries)
+        db.compact()
+    finally:
+        db.close()
+
+def bench_database(storage: str, size_mb: float, ops: int, write_ops: int, budget: float, shards: int=0) -> Dict[str, Any]:
+    data = build_database(size_mb)
+    user_ids = list(data['users']) or ['0']
+    rnd = random.Random(1)
+    keys = [rnd.choice(user_ids) for _ in range(ops)]
+    data_dir = Path(tempfile.mkdtemp(prefix='argent-bench-'))
+    try:
+        _seed(data_dir, storage, data, shards)
+        result = {'storage': storage, 'size_mb': size_mb, 'shards': shards, 'users': len(data['users'])}
+        started = time.perf_counter()
+        db = ArgentDatabase(str(data_dir), write_behind=False, storage=storage, shards=shards)
+        result['load_ms'] = (time.perf_counter() - started) * 1000
+        try:
+            result['get_ops_per_sec'] = _throughput(lambda i: db.get('users', keys[i]), ops)
+            result['get_user_data_ops_per_sec'] = _throughput(lambda i: db.get_user_data(keys[i], 'messages'), ops)
+            result['set'] = _summary(_latencies(lambda i: db.set_user_data(keys[i], 'messages', i), write_ops, budget))
+            result['set_config'] = _summary(_latencies(lambda i: db.set_config('bench_counter', i), write_ops, budget))
+        finally:
+            db.close()
+        db = ArgentDatabase(str(data_dir), write_behind=True, flush_interval=3600, storage=storage, shards=shards)
+        try:
+            result['set_write_behind_ops_per_sec'] = _throughput(lambda i: db.set_user_data(keys[i], 'messages', -i), ops)
+            started = time.perf_counter()
+            db.flush()
+            result['flush_ms'] = (time.perf_counter() - started) * 1000
+        finally:
+            db.close()
+        result['disk_bytes'] = _disk_size(data_dir)
+        return result
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def bench_config(ops: int, write_ops: int, budget: float) -> Dict[str, Any]:
+    data_dir = Path(tempfile.mkdtemp(prefix='argent-bench-'))
+    try:
+        config = ConfigManager(str(data_dir))
+        config.set_system('api_id', 12345)
+        return {'get_user_ops_per_sec': _throughput(lambda i: config.get('userbot.command_prefix'), ops), 'get_system_ops_per_sec': _throughput(lambda i: config.get('api_id'), ops), 'get_default_ops_per_sec': _throughput(lambda i: config.get('performance.request_retries'), ops), 'get_missing_ops_per_sec': _throughput(lambda i: config.get('modules.bench.missing.key', 0), ops), 'set': _summary(_latencies(lambda i: config.set('bench.counter', i), write_ops, budget))}
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def bench_owners(ops: int, write_ops: int, budget: float) -> Dict[str, Any]:
+    data_dir = Path(tempfile.mkdtemp(prefix='argent-bench-'))
+    logging.getLogger('argent.security.owner_manager').setLevel(logging.ERROR)
+    try:
+        owners = OwnerManager(str(data_dir))
+        owners.set_primary_owner(100000)
+        result = {'is_owner_ops_per_sec': _throughput(lambda i: owners.is_owner(100000 + i % 7), ops)}
+        engine = PermissionEngine(owners)
+        result['engine_is_owner_ops_per_sec'] = _throughput(lambda i: engine.is_owner(100000 + i % 7), ops)
+        result['engine_has_permission_ops_per_sec'] = _throughput(lambda i: engine.has_permission(100000 + i % 7, 'modules'), ops)
+        result['add_owner'] = _summary(_latencies(lambda i: owners.add_owner(200000 + i, 100000), write_ops, budget))
+        result['remove_owner'] = _summary(_latencies(lambda i: owners.remove_owner(200000 + i, 100000), write_ops, budget))
+        return result
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+def run(sizes=DEFAULT_SIZES, storages=DEFAULT_STORAGES, ops: int=20000, write_ops: int=200, budget: float=10.0, shards: int=0, progress: Optional[Callable[[str], None]]=None) -> Dict[str, Any]:
+    report = {'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'), 'python': platform.python_version(), 'platform': platform.platform(), 'codecs': available_codecs(), 'ops': ops, 'write_ops': write_ops, 'database': []}
+    for storage in storages:
+        for size_mb in sizes:
+            if progress:
+                progress(f'database {storage} {size_mb} MB')
+            report['database'].append(bench_database(storage, size_mb, ops, write_ops, budget, shards if storage != 'sqlite' else 0))
+    if progress:
+        progress('config manager')
+    report['config'] = bench_config(ops, write_ops, budget)
+    if progress:
+        progress('owner manager')
+    report['owners'] = bench_owners(ops, write_ops, budget)
+    return report
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Argent storage benchmark (ArgentDatabase, ConfigManager, OwnerManager)')
+    parser.add_argument('--sizes', default=','.join((str(size) for size in DEFAULT_SIZES)), help='database sizes in MB, comma separated')
+    parser.add_argument('--storage', default=','.join(DEFAULT_STORAGES), help='storage backends, comma separated')
+    parser.add_argument('--ops', type=int, default=20000)
+    parser.add_argument('--write-ops', type=int, default=200)
+    parser.add_argument('--budget', type=float, default=10.0, help='seconds per synchronous write series')
+    parser.add_argument('--shards', type=int, default=0)
+    parser.add_argument('--json', dest='json_path')
+    args = parser.parse_args(argv)
+    report = run([float(size) for size in args.sizes.split(',')], args.storage.split(','), args.ops, args.write_ops, args.budget, args.shards, progress=lambda stage: print(f'… {stage}', flush=True))
+    print(f"{'storage':<10}{'size MB':>9}{'load ms':>10}{'get/s':>12}{'set p50':>10}{'set p99':>10}{'wb set/s':>12}{'disk KB':>12}")
+    for row in report['database']:
+        print(f"{row['storage']:<10}{row['size_mb']:>9g}{row['load_ms']:>10.1f}{row['get_ops_per_sec']:>12.0f}{row['set']['p50_ms']:>10.2f}{row['set']['p99_ms']:>10.2f}{row['set_write_behind_ops_per_sec']:>12.0f}{row['disk_bytes'] / 1024:>12.1f}")
+    config = report['config']
+    print(f"config get/s: user {config['get_user_ops_per_sec']:.0f}, system {config['get_system_ops_per_sec']:.0f}, default {config['get_default_ops_per_sec']:.0f}, missing {config['get_missing_ops_per_sec']:.0f}; set p50 {config['set']['p50_ms']:.2f} ms, p99 {config['set']['p99_ms']:.2f} ms")
+    owners = report['owners']
+    print(f"owners is_owner/s {owners['is_owner_ops_per_sec']:.0f}, engine is_owner/s {owners['engine_is_owner_ops_per_sec']:.0f}, has_permission/s {owners['engine_has_permission_ops_per_sec']:.0f}; add p50 {owners['add_owner']['p50_ms']:.2f} ms, p99 {owners['add_owner']['p99_ms']:.2f} ms")
+    if args.json_path:
+        with open(args.json_path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    return report
+if __name__ == '__main__':
+    main()
\ No newline at end of file
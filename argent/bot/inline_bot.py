@@ -13,18 +13,21 @@ except Exception:
     DefaultBotProperties = None
 from ..storage.database import ArgentDatabase
 from ..security.owner_manager import OwnerManager
+from ..security.permissions import PermissionEngine
+from ..utils.offload import offloader
 logger = logging.getLogger(__name__)
 
 class ArgentInlineBot:
 
-    def __init__(self, bot_token: str, db: ArgentDatabase, userbot_client=None):
+    def __init__(self, bot_token: str, db: ArgentDatabase, userbot_client=None, permissions: Optional[PermissionEngine]=None):
         self.bot_token = bot_token
         self.db = db
         self.userbot_client = userbot_client
         self.bot: Optional[Bot] = None
         self.dp: Optional[Dispatcher] = None
         self._running = False
-        self.owner_manager = OwnerManager()
+        self.permissions = permissions or PermissionEngine(OwnerManager(str(db.data_dir)), db)
+        self.owner_manager = self.permissions.owner_manager
 
     async def start(self):
         try:
@@ -49,7 +52,7 @@ class ArgentInlineBot:
 
             async def wrapper(callback_or_message):
                 user_id = callback_or_message.from_user.id
-                if not self.owner_manager.is_owner(user_id):
+                if not self.permissions.is_owner(user_id):
                     if hasattr(callback_or_message, 'answer'):
                         await callback_or_message.answer('❌ Доступ запрещен', show_alert=True)
                     else:
@@ -64,11 +67,10 @@ class ArgentInlineBot:
             username = message.from_user.username or 'Unknown'
             first_name = message.from_user.first_name or 'Unknown'
             if not self.owner_manager.has_primary_owner():
-                if self.owner_manager.set_primary_owner(user_id):
-                    self.db.set_config('owners', [user_id])
+                if self.permissions.claim_primary(user_id):
                     await message.answer(f'🎉 <b>Добро пожаловать, владелец!</b>\n\n👑 <b>Вы стали основным владельцем Argent UserBot</b>\n🆔 <b>Ваш ID:</b> <code>{user_id}</code>\n👤 <b>Имя:</b> {first_name}\n📱 <b>Username:</b> @{username}\n\n🔐 <b>Безопасность:</b>\n• Только вы можете управлять ботом\n• Другие пользователи получат отказ в доступе\n• Вы можете добавлять других владельцев через настройки\n\n🚀 <b>Теперь вы можете пользоваться всеми функциями!</b>', reply_markup=InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text='🚀 Перейти к управлению', callback_data='main_menu')]]))
                     return
-            if not self.owner_manager.is_owner(user_id):
+            if not self.permissions.is_owner(user_id):
                 await message.answer(f'❌ <b>Доступ запрещен</b>\n\n🔒 <b>Этот бот принадлежит другому пользователю</b>\n\n💡 <b>Хотите свой собственный юзербот?</b>\n📂 GitHub: github.com/lonly19/Argent-Userbot')
                 return
             await self._show_main_menu(message)
@@ -186,10 +188,7 @@ class ArgentInlineBot:
             await cb.answer()
 
     async def _send_initial_setup(self):
-        owners = self.owner_manager.get_all_owners()
-        if not owners:
-            owners = self.db.get_config('owners', [])
-        for owner_id in owners:
+        for owner_id in self.permissions.owners:
             try:
                 await self.bot.send_message(owner_id, '🎉 <b>Argent UserBot успешно установлен!</b>\n<blockquote>🤖 <b>Inline бот создан и готов к работе</b>\n\n⚗️ <b>Доступные функции:</b>\n🔄 Управление перезагрузкой\n🌍 Настройка языка\n📦 Управление модулями\n👑 Управление овнерами\n📊 Системная информация\n\n🔬 <b>Начальная настройка:</b>\nВыберите интервал автоперезагрузки для стабильной работы</blockquote>', reply_markup=self._get_initial_setup_keyboard())
             except Exception as e:
@@ -246,9 +245,9 @@ class ArgentInlineBot:
     async def _show_system_info(self, message: Message, edit: bool=False):
         import psutil
         import time
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = await offloader.run(psutil.cpu_percent, interval=1)
         memory = psutil.virtual_memory()
-        owners_count = len(self.db.get_config('owners', []))
+        owners_count = len(self.permissions.owners)
         language = self.db.get_config('language', 'ru')
         text = f"\n\n📊 <b>Системная информация</b>\n\n<b>🖥️ Сервер:</b>\n• <b>CPU:</b> {cpu_percent}%\n• <b>RAM:</b> {memory.percent}%\n• <b>Диск:</b> Доступен\n\n<b>⚗️ Argent UserBot:</b>\n• <b>Версия:</b> 2.0.0\n• <b>Язык:</b> {language.upper()}\n• <b>Овнеров:</b> {owners_count}\n• <b>Статус:</b> ✅ Активен\n\n<b>🔬 Последнее обновление:</b> {time.strftime('%H:%M:%S')}\n\n        "
         keyboard = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text='🔄 Обновить', callback_data='system_info')], [InlineKeyboardButton(text='🏠 Главное меню', callback_data='main_menu')]])
@@ -277,8 +276,8 @@ class ArgentInlineBot:
         return InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text='🔙 Назад', callback_data='settings')], [InlineKeyboardButton(text='🏠 Главное меню', callback_data='main_menu')]])
 
     async def _show_owner_management(self, message: Message, edit: bool=False):
-        primary_owner = self.owner_manager.get_primary_owner()
-        all_owners = self.owner_manager.get_all_owners()
+        primary_owner = self.permissions.primary_owner
+        all_owners = self.permissions.owners
         total_owners = len(all_owners)
         text = f'<b>👑 Управление владельцами</b>\n<blockquote><b>🔐 Основной владелец:</b> <code>{primary_owner}</code>\n<b>👥 Всего владельцев:</b> {total_owners}\n\n<b>🛡️ Система безопасности:</b>\n• Только владельцы могут управлять ботом\n• Основного владельца нельзя удалить\n• Все действия логируются\n\n<b>⚙️ Доступные функции:</b></blockquote>'
         keyboard = InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text='👥 Список владельцев', callback_data='show_owners')], [InlineKeyboardButton(text='🔐 Информация о безопасности', callback_data='security_info')], [InlineKeyboardButton(text='🔙 Назад', callback_data='settings')], [InlineKeyboardButton(text='🏠 Главное меню', callback_data='main_menu')]])
@@ -288,8 +287,8 @@ class ArgentInlineBot:
             await message.answer(text, reply_markup=keyboard)
 
     async def _show_owners_list(self, message: Message, edit: bool=False):
-        primary_owner = self.owner_manager.get_primary_owner()
-        all_owners = self.owner_manager.get_all_owners()
+        primary_owner = self.permissions.primary_owner
+        all_owners = self.permissions.owners
         text = '<b>👥 Список владельцев</b>\n<blockquote>'
         for i, owner_id in enumerate(all_owners, 1):
             status = '👑 Основной' if owner_id == primary_owner else '👤 Обычный'
@@ -0,0 +1,113 @@
+import logging
+from itertools import product
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from telethon import events
+logger = logging.getLogger(__name__)
+Key = Tuple[bool, bool, bool]
+_BOTH = (False, True)
+
+class Subscription:
+    __slots__ = ('handler', 'module', 'incoming', 'outgoing', 'chats', 'private', 'media', 'active', 'keys')
+
+    def __init__(self, handler: Callable, module: str='core', incoming: Optional[bool]=None, outgoing: Optional[bool]=None, chats: Optional[Iterable[int]]=None, private: Optional[bool]=None, media: Optional[bool]=None, active: bool=True):
+        self.handler = handler
+        self.module = module
+        self.update(incoming=incoming, outgoing=outgoing, chats=chats, private=private, media=media, active=active)
+
+    def update(self, **changes):
+        for name, value in changes.items():
+            if name == 'chats' and value is not None:
+                value = frozenset((int(chat) for chat in value))
+            setattr(self, name, value)
+        if self.incoming and self.outgoing or (self.incoming is None and self.outgoing is None):
+            directions = _BOTH
+        elif self.incoming or self.outgoing is False:
+            directions = (False,)
+        else:
+            directions = (True,)
+        privates = _BOTH if self.private is None else (bool(self.private),)
+        medias = _BOTH if self.media is None else (bool(self.media),)
+        self.keys: Tuple[Key, ...] = tuple(product(directions, privates, medias))
+
+class EventBus:
+
+    def __init__(self):
+        self.subscriptions: List[Subscription] = []
+        self._wildcard: Dict[Key, Tuple[Subscription, ...]] = {}
+        self._by_chat: Dict[int, Dict[Key, Tuple[Subscription, ...]]] = {}
+        self._client = None
+        self.dispatched = 0
+        self.delivered = 0
+
+    def subscribe(self, subscription: Subscription) -> Subscription:
+        if subscription not in self.subscriptions:
+            self.subscriptions.append(subscription)
+            self._rebuild()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> bool:
+        if subscription not in self.subscriptions:
+            return False
+        self.subscriptions.remove(subscription)
+        self._rebuild()
+        return True
+
+    def unsubscribe_module(self, module: str) -> int:
+        kept = [subscription for subscription in self.subscriptions if subscription.module != module]
+        removed = len(self.subscriptions) - len(kept)
+        if removed:
+            self.subscriptions = kept
+            self._rebuild()
+        return removed
+
+    def update(self, subscription: Subscription, **changes):
+        subscription.update(**changes)
+        if subscription in self.subscriptions:
+            self._rebuild()
+
+    def _rebuild(self):
+        active = [subscription for subscription in self.subscriptions if subscription.active]
+        chats = set()
+        for subscription in active:
+            if subscription.chats is not None:
+                chats.update(subscription.chats)
+        wildcard = {key: tuple((s for s in active if s.chats is None and key in s.keys)) for key in product(_BOTH, _BOTH, _BOTH)}
+        by_chat = {}
+        for chat_id in chats:
+            by_chat[chat_id] = {key: tuple((s for s in active if key in s.keys and (s.chats is None or chat_id in s.chats))) for key in wildcard}
+        self._wildcard = {key: subscribers for key, subscribers in wildcard.items() if subscribers}
+        self._by_chat = {chat_id: {key: subscribers for key, subscribers in routes.items() if subscribers} for chat_id, routes in by_chat.items()}
+
+    def match(self, out: bool, private: bool, media: bool, chat_id: Optional[int]) -> Tuple[Subscription, ...]:
+        key = (out, private, media)
+        routes = self._by_chat.get(chat_id)
+        return (routes if routes is not None else self._wildcard).get(key, ())
+
+    async def dispatch(self, event):
+        self.dispatched += 1
+        if not self._wildcard and (not self._by_chat):
+            return
+        subscribers = self.match(bool(event.out), bool(event.is_private), event.media is not None, event.chat_id)
+        for subscription in subscribers:
+            self.delivered += 1
+            try:
+                await subscription.handler(event)
+            except events.StopPropagation:
+                break
+            except Exception as e:
+                logger.error(f'❌ Ошибка обработчика событий {subscription.module}: {e}')
+
+    def attach(self, client):
+        if self._client is client:
+            return
+        self.detach()
+        client.add_event_handler(self.dispatch, events.NewMessage())
+        self._client = client
+
+    def detach(self):
+        if self._client is not None:
+            self._client.remove_event_handler(self.dispatch)
+            self._client = None
+
+    def __len__(self) -> int:
+        return len(self.subscriptions)
\ No newline at end of file
@@ -0,0 +1,158 @@
+import asyncio
+import itertools
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Deque, Dict, List, Optional
+from .router import Command, CommandRouter
+logger = logging.getLogger(__name__)
+current_job: ContextVar[Optional['Job']] = ContextVar('current_job', default=None)
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+TIMEOUT = 'timeout'
+CANCELLED = 'cancelled'
+
+class Job:
+    __slots__ = ('id', 'command', 'args', 'event', 'chat_id', 'timeout', 'long', 'state', 'created_at', 'started_at', 'finished_at', 'task', 'future')
+
+    def __init__(self, job_id: int, command: Command, args: List[str], event, timeout: Optional[float], future: asyncio.Future):
+        self.id = job_id
+        self.command = command
+        self.args = args
+        self.event = event
+        self.chat_id = getattr(event, 'chat_id', None)
+        self.timeout = timeout
+        self.long = bool(command.meta.get('long'))
+        self.state = QUEUED
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.future = future
+
+    @property
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+class CommandExecutor:
+
+    def __init__(self, router: CommandRouter, workers: int=10, timeout: Optional[float]=None, history: int=20):
+        self.router = router
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(self.workers)
+        self._long_slots = asyncio.Semaphore(max(1, self.workers // 2))
+        self._queues: Dict[Any, Deque[Job]] = {}
+        self._drainers: Dict[Any, asyncio.Task] = {}
+        self._ids = itertools.count(1)
+        self.jobs: Dict[int, Job] = {}
+        self.history: Deque[Job] = deque(maxlen=history)
+
+    def timeout_for(self, command: Command) -> Optional[float]:
+        timeout = command.meta.get('timeout', self.timeout)
+        return timeout if timeout and timeout > 0 else None
+
+    def submit(self, event, command: Command, args: List[str]) -> Job:
+        job = Job(next(self._ids), command, args, event, self.timeout_for(command), asyncio.get_running_loop().create_future())
+        self.jobs[job.id] = job
+        if command.meta.get('inline'):
+            job.task = asyncio.create_task(self._run(job, gated=False))
+            return job
+        self._queues.setdefault(job.chat_id, deque()).append(job)
+        if job.chat_id not in self._drainers:
+            self._drainers[job.chat_id] = asyncio.create_task(self._drain(job.chat_id))
+        return job
+
+    async def run(self, event, command: Command, args: List[str]) -> bool:
+        return await asyncio.shield(self.submit(event, command, args).future)
+
+    async def _drain(self, chat_id: Any):
+        queue = self._queues[chat_id]
+        try:
+            while queue:
+                job = queue.popleft()
+                job.task = asyncio.create_task(self._run(job))
+                await asyncio.wait((job.task,))
+        finally:
+            self._queues.pop(chat_id, None)
+            self._drainers.pop(chat_id, None)
+
+    async def _run(self, job: Job, gated: bool=True) -> bool:
+        gates = ((self._long_slots, self._slots) if job.long else (self._slots,)) if gated else ()
+        acquired = []
+        result = False
+        try:
+            for gate in gates:
+                await gate.acquire()
+                acquired.append(gate)
+            job.state = RUNNING
+            job.started_at = time.time()
+            started = time.perf_counter()
+            token = current_job.set(job)
+            try:
+                result = await asyncio.wait_for(self.router.dispatch(job.event, job.command, job.args), job.timeout)
+                job.state = DONE if result else FAILED
+            except asyncio.TimeoutError:
+                job.state = TIMEOUT
+                self.router.metrics.observe(job.command.name, time.perf_counter() - started, asyncio.TimeoutError(f'timeout {job.timeout:g}s'))
+                logger.warning(f'⏱️ Command {job.command.name} timed out after {job.timeout:g}s')
+                await self._notify(job, f'⏱️ <b>Команда прервана по таймауту</b> (<code>{job.timeout:g}s</code>)')
+            except Exception as e:
+                job.state = FAILED
+                self.router.metrics.observe(job.command.name, time.perf_counter() - started, e)
+                logger.error(f'❌ Command {job.command.name} failed: {e}')
+            finally:
+                current_job.reset(token)
+        except asyncio.CancelledError:
+            job.state = CANCELLED
+            await self._notify(job, '🛑 <b>Команда отменена</b>')
+        finally:
+            for gate in acquired:
+                gate.release()
+            self._finish(job, result)
+        return result
+
+    def _finish(self, job: Job, result: bool):
+        job.finished_at = time.time()
+        self.jobs.pop(job.id, None)
+        self.history.append(job)
+        if not job.future.done():
+            job.future.set_result(result)
+
+    async def _notify(self, job: Job, text: str):
+        try:
+            await job.event.edit(text)
+        except Exception as e:
+            logger.debug(f'Job notification failed: {e}')
+
+    def cancel(self, job_id: int) -> bool:
+        job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        if job.task is not None:
+            job.task.cancel()
+            return True
+        queue = self._queues.get(job.chat_id)
+        if queue is not None and job in queue:
+            queue.remove(job)
+        job.state = CANCELLED
+        self._finish(job, False)
+        asyncio.create_task(self._notify(job, '🛑 <b>Команда отменена</b>'))
+        return True
+
+    def active(self) -> List[Job]:
+        return sorted(self.jobs.values(), key=lambda job: job.id)
+
+    async def shutdown(self):
+        current = current_job.get()
+        jobs = [job for job in self.active() if job is not current]
+        for job in jobs:
+            self.cancel(job.id)
+        tasks = [job.task for job in jobs if job.task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
\ No newline at end of file
@@ -8,6 +8,12 @@ from typing import Dict, List, Optional, Any, Type
 from pathlib import Path
 from ..storage.database import ArgentDatabase
 from ..utils.utils import ArgentUtils
+from ..utils.config_manager import ConfigManager
+from ..security.owner_manager import OwnerManager
+from ..security.permissions import PermissionEngine
+from .router import CommandRouter
+from .event_bus import EventBus, Subscription
+from .executor import CommandExecutor
 logger = logging.getLogger(__name__)
 
 class ModuleInfo:
@@ -34,6 +40,10 @@ class ArgentModule:
         self.client = None
         self.db = None
         self.utils = None
+        self.config = None
+        self.permissions = None
+        self.event_bus = None
+        self.handlers: List[Subscription] = []
 
     async def on_load(self):
         pass
@@ -41,20 +51,39 @@ class ArgentModule:
     async def on_unload(self):
         pass
 
-    def register_command(self, name: str, func: callable, description: str=''):
-        self.commands[name] = {'func': func, 'description': description, 'module': self.name}
+    def register_command(self, name: str, func: callable, description: str='', aliases: List[str]=(), usage: str='', **meta):
+        self.commands[name] = {'func': func, 'description': description, 'module': self.name, 'aliases': tuple(aliases), 'usage': usage, 'meta': meta}
+
+    def register_handler(self, func: callable, **filters) -> Subscription:
+        subscription = Subscription(func, self.name, **filters)
+        self.handlers.append(subscription)
+        return subscription
+
+    def update_handler(self, subscription: Subscription, **changes):
+        if self.event_bus is not None:
+            self.event_bus.update(subscription, **changes)
+        else:
+            subscription.update(**changes)
 
 class ArgentLoader:
 
-    def __init__(self, client, db: ArgentDatabase, utils: ArgentUtils):
+    def __init__(self, client, db: ArgentDatabase, utils: ArgentUtils, config: Optional[ConfigManager]=None, permissions: Optional[PermissionEngine]=None, router: Optional[CommandRouter]=None, event_bus: Optional[EventBus]=None, executor: Optional[CommandExecutor]=None):
         self.client = client
         self.db = db
         self.utils = utils
+        self.config = config
+        self.permissions = permissions or PermissionEngine(OwnerManager(str(db.data_dir)), db)
+        self.router = router or CommandRouter()
+        self.event_bus = event_bus or EventBus()
+        self.executor = executor or CommandExecutor(self.router)
         self.modules: Dict[str, ModuleInfo] = {}
-        self.commands: Dict[str, Dict] = {}
         self.modules_dir = Path('argent/modules')
         self.modules_dir.mkdir(exist_ok=True)
 
+    @property
+    def commands(self) -> Dict[str, Any]:
+        return {name: command for name, command in self.router.commands.items() if command.module != 'core'}
+
     async def load_all_modules(self):
         logger.info('🔬 Starting module discovery...')
         if not self.modules_dir.exists():
@@ -97,13 +126,18 @@ class ArgentLoader:
             instance.client = self.client
             instance.db = self.db
             instance.utils = self.utils
+            instance.config = self.config
+            instance.permissions = self.permissions
+            instance.event_bus = self.event_bus
             info = ModuleInfo(name=instance.name, version=instance.version, author=instance.author, description=instance.description, category=instance.category)
             info.instance = instance
             info.loaded = True
             for cmd_name, cmd_info in instance.commands.items():
-                full_cmd = f'.{cmd_name}'
-                self.commands[full_cmd] = cmd_info
-                info.commands.append(full_cmd)
+                self.router.register(cmd_name, cmd_info['func'], cmd_info.get('description', ''), module=module_name, category=instance.category, aliases=cmd_info.get('aliases', ()), usage=cmd_info.get('usage', ''), **cmd_info.get('meta', {}))
+                info.commands.append(cmd_name)
+            for subscription in instance.handlers:
+                subscription.module = module_name
+                self.event_bus.subscribe(subscription)
             self.modules[module_name] = info
             await instance.on_load()
             logger.info(f'✅ Loaded module: {instance.name} v{instance.version} by {instance.author}')
@@ -120,8 +154,8 @@ class ArgentLoader:
             info = self.modules[module_name]
             if info.instance:
                 await info.instance.on_unload()
-            for cmd in info.commands:
-                self.commands.pop(cmd, None)
+            self.router.unregister_module(module_name)
+            self.event_bus.unsubscribe_module(module_name)
             sys.modules.pop(f'argent.modules.{module_name}', None)
             del self.modules[module_name]
             logger.info(f'🗑️ Unloaded module: {module_name}')
@@ -130,6 +164,10 @@ class ArgentLoader:
             logger.error(f'❌ Error unloading module {module_name}: {e}')
             return False
 
+    async def unload_all(self):
+        for module_name in list(self.modules):
+            await self.unload_module(module_name)
+
     async def reload_module(self, module_name: str) -> bool:
         if module_name in self.modules:
             await self.unload_module(module_name)
@@ -150,13 +188,9 @@ class ArgentLoader:
         return categories
 
     async def execute_command(self, command: str, event, args: List[str]) -> bool:
-        if command not in self.commands:
+        if command.startswith(self.router.prefix):
+            command = command[len(self.router.prefix):]
+        routed = self.router.get(command)
+        if routed is None:
             return False
-        try:
-            cmd_info = self.commands[command]
-            await cmd_info['func'](event, args)
-            return True
-        except Exception as e:
-            logger.error(f'❌ Command execution error {command}: {e}')
-            await event.edit(f'⚠️ <b>Ошибка команды:</b> <code>{e}</code>')
-            return False
\ No newline at end of file
+        return await self.executor.run(event, routed, args)
\ No newline at end of file
@@ -0,0 +1,91 @@
+import time
+from typing import Any, Dict, List, Optional, Tuple
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+class Histogram:
+    __slots__ = ('bounds', 'counts', 'count', 'total', 'max', 'errors', 'last_error', 'last_error_at', 'last_at')
+
+    def __init__(self, bounds: Tuple[float, ...]=BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.errors = 0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+        self.last_at: Optional[float] = None
+
+    def observe(self, seconds: float, error: Optional[BaseException]=None):
+        index = 0
+        bounds = self.bounds
+        while index < len(bounds) and seconds > bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.last_at = time.time()
+        if error is not None:
+            self.errors += 1
+            self.last_error = f'{type(error).__name__}: {error}'[:200]
+            self.last_error_at = self.last_at
+
+    def percentile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            if seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                return min(self.max, lower + (upper - lower) * max(0.0, rank - seen) / count)
+            seen += count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {'count': self.count, 'errors': self.errors, 'mean': self.total / self.count if self.count else 0.0, 'p50': self.percentile(0.5), 'p95': self.percentile(0.95), 'p99': self.percentile(0.99), 'max': self.max, 'last_error': self.last_error, 'last_error_at': self.last_error_at, 'last_at': self.last_at}
+
+class CommandMetrics:
+    OTHER = '<other>'
+
+    def __init__(self, bounds: Tuple[float, ...]=BUCKETS, max_commands: int=512):
+        self.bounds = bounds
+        self.max_commands = max_commands
+        self._histograms: Dict[str, Histogram] = {}
+
+    def observe(self, name: str, seconds: float, error: Optional[BaseException]=None):
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            if len(self._histograms) >= self.max_commands:
+                name = self.OTHER
+                histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram(self.bounds)
+        histogram.observe(seconds, error)
+
+    def get(self, name: str) -> Optional[Histogram]:
+        return self._histograms.get(name)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {name: histogram.summary() for name, histogram in self._histograms.items()}
+
+    def top(self, limit: int=5, key: str='p95') -> List[Tuple[str, Dict[str, Any]]]:
+        return sorted(self.snapshot().items(), key=lambda item: item[1][key], reverse=True)[:limit]
+
+    def last_error(self) -> Optional[Tuple[str, Histogram]]:
+        failed = [(name, histogram) for name, histogram in self._histograms.items() if histogram.last_error_at]
+        return max(failed, key=lambda item: item[1].last_error_at) if failed else None
+
+    def totals(self) -> Tuple[int, int]:
+        return (sum((h.count for h in self._histograms.values())), sum((h.errors for h in self._histograms.values())))
+
+    def __len__(self) -> int:
+        return len(self._histograms)
+
+    def reset(self):
+        self._histograms.clear()
\ No newline at end of file
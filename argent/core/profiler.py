@@ -0,0 +1,195 @@
+import asyncio
+import cProfile
+import html
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import zlib
+from typing import Dict, List, Optional, Tuple
+from ..utils.offload import offloader
+logger = logging.getLogger(__name__)
+_PACKAGE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def short_path(filename: str) -> str:
+    if filename.startswith(_PACKAGE):
+        return os.path.relpath(filename, os.path.dirname(_PACKAGE))
+    return os.path.basename(filename)
+
+class SamplingProfiler:
+    INTERVAL = 0.005
+    MAX_DEPTH = 128
+
+    def __init__(self, interval: Optional[float]=None, max_depth: Optional[int]=None, all_threads: bool=True):
+        self.interval = interval or self.INTERVAL
+        self.max_depth = max_depth or self.MAX_DEPTH
+        self.all_threads = all_threads
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._labels: Dict[object, str] = {}
+        self._names: Dict[int, str] = {}
+        self._target: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self, target_thread: Optional[int]=None):
+        if self._thread is not None:
+            raise RuntimeError('profiler already running')
+        self.stacks = {}
+        self.samples = 0
+        self._target = target_thread if target_thread is not None or self.all_threads else threading.get_ident()
+        self._stop.clear()
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='argent-profiler', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict[str, int]:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self.duration = time.monotonic() - self.started_at
+        return self.stacks
+
+    async def profile(self, seconds: float) -> Dict[str, int]:
+        self.start()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            stacks = await offloader.run(self.stop)
+        return stacks
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = f'{code.co_name} ({short_path(code.co_filename)}:{code.co_firstlineno})'.replace(';', ',')
+        return label
+
+    def _thread_name(self, ident: int) -> str:
+        name = self._names.get(ident)
+        if name is None:
+            self._names = {thread.ident: thread.name for thread in threading.enumerate()}
+            name = self._names.setdefault(ident, f'thread-{ident}')
+        return name
+
+    def _run(self):
+        own = threading.get_ident()
+        interval = self.interval
+        stacks = self.stacks
+        while not self._stop.wait(interval):
+            frames = sys._current_frames()
+            for ident, frame in frames.items():
+                if ident == own or (self._target is not None and ident != self._target):
+                    continue
+                labels = []
+                depth = 0
+                while frame is not None and depth < self.max_depth:
+                    labels.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                    depth += 1
+                labels.append(self._thread_name(ident))
+                key = ';'.join(reversed(labels))
+                stacks[key] = stacks.get(key, 0) + 1
+            self.samples += 1
+            del frames
+
+    def collapsed(self) -> str:
+        return '\n'.join((f'{stack} {count}' for stack, count in sorted(self.stacks.items())))
+
+    def top(self, limit: int=10, thread: Optional[str]=None) -> List[Tuple[str, int]]:
+        own: Dict[str, int] = {}
+        for stack, count in self.stacks.items():
+            if thread is not None and (not stack.startswith(thread + ';')):
+                continue
+            leaf = stack.rsplit(';', 1)[-1]
+            own[leaf] = own.get(leaf, 0) + count
+        return sorted(own.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+def render_svg(stacks: Dict[str, int], title: str='Argent flame graph', width: int=1200, row: int=17) -> str:
+    root = [0, {}]
+    depth = 0
+    for stack, count in stacks.items():
+        node = root
+        node[0] += count
+        frames = stack.split(';')
+        depth = max(depth, len(frames))
+        for frame in frames:
+            node = node[1].setdefault(frame, [0, {}])
+            node[0] += count
+    total = root[0] or 1
+    height = (depth + 1) * row + 40
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="monospace" font-size="11">', f'<rect width="100%" height="100%" fill="#f8f8f8"/>', f'<text x="{width / 2}" y="20" text-anchor="middle" font-size="15">{html.escape(title)} ({total} samples)</text>']
+
+    def draw(children: Dict[str, list], x: float, level: int):
+        for name, (count, grandchildren) in sorted(children.items()):
+            span = count * width / total
+            if span >= 0.5:
+                y = height - (level + 1) * row
+                hue = zlib.crc32(name.encode()) % 55
+                label = html.escape(name)
+                chars = int(span / 7)
+                text = html.escape(name[:chars - 2] + '..' if len(name) > chars else name) if chars >= 3 else ''
+                parts.append(f'<g><title>{label} — {count} ({count * 100 / total:.1f}%)</title><rect x="{x:.2f}" y="{y}" width="{span:.2f}" height="{row - 1}" fill="hsl({hue},85%,60%)" rx="2"/><text x="{x + 3:.2f}" y="{y + row - 5}">{text}</text></g>')
+                draw(grandchildren, x, level + 1)
+            x += span
+    draw(root[1], 0.0, 0)
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+def cprofile_top(profile: cProfile.Profile, limit: int=15) -> List[Tuple[str, int, float, float]]:
+    rows = []
+    for (filename, line, func), (_, calls, own, cumulative, _) in pstats.Stats(profile).stats.items():
+        name = func if filename == '~' else f'{func} ({short_path(filename)}:{line})'
+        rows.append((name, calls, own, cumulative))
+    return sorted(rows, key=lambda row: row[3], reverse=True)[:limit]
+
+class MemoryProfiler:
+    FRAMES = 10
+    FILTERS = (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, '<frozen importlib._bootstrap>'), tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'), tracemalloc.Filter(False, '<unknown>'))
+
+    def __init__(self, frames: Optional[int]=None):
+        self.frames = frames or self.FRAMES
+        self.started_at: Optional[float] = None
+        self._baseline: Optional[tracemalloc.Snapshot] = None
+        self._owned = False
+
+    @property
+    def running(self) -> bool:
+        return self._baseline is not None
+
+    def start(self):
+        if self._baseline is not None:
+            raise RuntimeError('memory profiler already running')
+        self._owned = not tracemalloc.is_tracing()
+        if self._owned:
+            tracemalloc.start(self.frames)
+        self.started_at = time.time()
+        self._baseline = self._snapshot()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(self.FILTERS)
+
+    def diff(self, limit: int=15, key: str='lineno') -> List[tracemalloc.StatisticDiff]:
+        if self._baseline is None:
+            return []
+        return self._snapshot().compare_to(self._baseline, key)[:limit]
+
+    def stop(self, limit: int=15, key: str='lineno') -> List[tracemalloc.StatisticDiff]:
+        diffs = self.diff(limit, key)
+        self._baseline = None
+        if self._owned:
+            tracemalloc.stop()
+            self._owned = False
+        return diffs
+
+    def traced(self) -> Tuple[int, int]:
+        return tracemalloc.get_traced_memory() if tracemalloc.is_tracing() else (0, 0)
\ No newline at end of file
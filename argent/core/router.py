@@ -0,0 +1,126 @@
+import logging
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from .metrics import CommandMetrics
+logger = logging.getLogger(__name__)
+
+class Command:
+    __slots__ = ('name', 'func', 'description', 'module', 'category', 'aliases', 'usage', 'meta')
+
+    def __init__(self, name: str, func: Callable, description: str='', module: str='core', category: str='core', aliases: Iterable[str]=(), usage: str='', meta: Optional[Dict[str, Any]]=None):
+        self.name = name
+        self.func = func
+        self.description = description
+        self.module = module
+        self.category = category
+        self.aliases = tuple(aliases)
+        self.usage = usage
+        self.meta = meta or {}
+
+class CommandRouter:
+
+    def __init__(self, prefix: str='.', metrics: Optional[CommandMetrics]=None):
+        self.metrics = metrics or CommandMetrics()
+        self.commands: Dict[str, Command] = {}
+        self._routes: Dict[str, Command] = {}
+        self._shadowed: Dict[str, List[Command]] = {}
+        self.set_prefix(prefix)
+
+    def set_prefix(self, prefix: str):
+        prefix = prefix if isinstance(prefix, str) and prefix.strip() else '.'
+        self.prefix = prefix
+        self._first = prefix[0]
+        self._skip = len(prefix)
+
+    def register(self, name: str, func: Callable, description: str='', module: str='core', category: str='core', aliases: Iterable[str]=(), usage: str='', **meta) -> Command:
+        name = name.lower()
+        command = Command(name, func, description, module, category, [alias.lower() for alias in aliases], usage, meta)
+        previous = self.commands.get(name)
+        if previous is not None and previous.module != module:
+            logger.warning(f'⚠️ Команда {name} из {module} перекрывает команду из {previous.module}')
+            self._shadowed.setdefault(name, []).append(previous)
+        for alias in command.aliases:
+            current = self._routes.get(alias)
+            if current is not None and current.name != name:
+                logger.warning(f'⚠️ Алиас {alias} команды {name} уже занят командой {current.name}')
+        self.commands[name] = command
+        self._rebuild()
+        return command
+
+    def _rebuild(self):
+        routes = dict(self.commands)
+        for command in self.commands.values():
+            for alias in command.aliases:
+                routes.setdefault(alias, command)
+        self._routes = routes
+
+    def unregister(self, name: str, module: Optional[str]=None) -> bool:
+        name = name.lower()
+        stack = self._shadowed.get(name, [])
+        command = self.commands.get(name)
+        if command is not None and (module is None or command.module == module):
+            del self.commands[name]
+            if stack:
+                self.commands[name] = stack.pop()
+        elif module is not None and any((shadowed.module == module for shadowed in stack)):
+            stack[:] = [shadowed for shadowed in stack if shadowed.module != module]
+        else:
+            return False
+        if not stack:
+            self._shadowed.pop(name, None)
+        self._rebuild()
+        return True
+
+    def unregister_module(self, module: str) -> List[str]:
+        names = {name for name, command in self.commands.items() if command.module == module}
+        names.update((name for name, stack in self._shadowed.items() if any((shadowed.module == module for shadowed in stack))))
+        return [name for name in sorted(names) if self.unregister(name, module)]
+
+    def alias(self, alias: str, name: str) -> bool:
+        command = self.commands.get(name.lower())
+        alias = alias.lower()
+        if command is None or alias in self.commands:
+            return False
+        if alias not in command.aliases:
+            command.aliases += (alias,)
+        self._rebuild()
+        return True
+
+    def get(self, name: str) -> Optional[Command]:
+        return self._routes.get(name.lower())
+
+    def by_category(self) -> Dict[str, List[Command]]:
+        categories: Dict[str, List[Command]] = {}
+        for command in self.commands.values():
+            categories.setdefault(command.category, []).append(command)
+        return categories
+
+    def parse(self, text: str) -> Optional[Tuple[Command, List[str]]]:
+        if not text or text[0] != self._first or (self._skip > 1 and (not text.startswith(self.prefix))):
+            return None
+        body = text[self._skip:]
+        if not body or body[0].isspace():
+            return None
+        body = body.split(None, 1)
+        command = self._routes.get(body[0].lower())
+        if command is None:
+            return None
+        return (command, body[1].split() if len(body) > 1 else [])
+
+    async def dispatch(self, event, command: Command, args: List[str]) -> bool:
+        started = time.perf_counter()
+        try:
+            await command.func(event, args)
+            self.metrics.observe(command.name, time.perf_counter() - started)
+            return True
+        except Exception as e:
+            self.metrics.observe(command.name, time.perf_counter() - started, e)
+            logger.error(f'❌ Command execution error {command.name}: {e}')
+            await event.edit(f'⚠️ <b>Ошибка команды:</b> <code>{e}</code>')
+            return False
+
+    def __len__(self) -> int:
+        return len(self.commands)
+
+    def __contains__(self, name: str) -> bool:
+        return name.lower() in self._routes
\ No newline at end of file
@@ -540,19 +540,30 @@ if __name__ == '__main__':
 
 import asyncio
 import contextlib
+import cProfile
+import io
 import logging
 import os
 import platform
+import threading
 import time
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 from telethon import TelegramClient, events
 from telethon.sessions import StringSession
 from .loader import ArgentLoader
+from .router import CommandRouter
+from .event_bus import EventBus, Subscription
+from .executor import CommandExecutor, current_job
+from .watchdog import LoopWatchdog
+from .profiler import MemoryProfiler, SamplingProfiler, cprofile_top, render_svg, short_path
 from ..storage.database import ArgentDatabase
 from ..utils.utils import ArgentUtils
 from ..utils.config_manager import ConfigManager
+from ..utils.offload import offloader
 from ..storage.session_manager import SessionManager
 from ..storage.session_storage import SessionStorage
+from ..security.owner_manager import OwnerManager
+from ..security.permissions import PermissionEngine
 try:
     import psutil
 except Exception:
@@ -619,7 +630,9 @@ class ArgentUserBot:
         self.data_dir = data_dir
         self.client: Optional[TelegramClient] = None
         self.config = ConfigManager(data_dir)
-        self.db = ArgentDatabase(data_dir)
+        database = self.config.settings.database
+        self.db = ArgentDatabase(data_dir, write_behind=database.write_behind, flush_interval=database.flush_interval, storage=database.storage, codec=database.codec, shards=database.shards)
+        self.permissions = PermissionEngine(OwnerManager(data_dir), self.db)
         self.session_storage = SessionStorage(data_dir)
         self.session_manager = SessionManager(self.session_storage)
         self.utils = ArgentUtils()
@@ -631,6 +644,22 @@ class ArgentUserBot:
         self.version = self.config.get('userbot.version', '2.0.0')
         self.author = self.config.get('userbot.author', 'github.com/lonly19/Argent-Userbot')
         self.emoji = self.config.get('userbot.emoji', '⚗️')
+        self.router = CommandRouter(self.config.get_str('userbot.command_prefix', '.'))
+        self.executor = CommandExecutor(self.router, self.config.settings.performance.max_concurrent_requests)
+        self._register_core_commands()
+        self.event_bus = EventBus()
+        self.watchdog = LoopWatchdog()
+        self.profiler = SamplingProfiler()
+        self.memory_profiler = MemoryProfiler()
+        self._cprofile_active = False
+        self.config.subscribe('userbot', self._on_config_changed)
+
+    def _on_config_changed(self, path: str, old: Any, new: Any):
+        if path == 'userbot.command_prefix':
+            self.router.set_prefix(new)
+            logger.info(f'⚙️ Command prefix changed to {self.router.prefix!r}')
+        elif path in ('userbot.name', 'userbot.emoji') and isinstance(new, str):
+            setattr(self, path.split('.', 1)[1], new)
 
     async def start(self):
         logger.info(f'{self.emoji} Starting {self.name} v{self.version}')
@@ -663,7 +692,7 @@ class ArgentUserBot:
                 self.client.parse_mode = 'html'
             except Exception:
                 pass
-            self.loader = ArgentLoader(self.client, self.db, self.utils)
+            self.loader = ArgentLoader(self.client, self.db, self.utils, self.config, self.permissions, self.router, self.event_bus, self.executor)
             self._register_handlers()
             await self._load_configured_modules()
             bot_token = self.config.get_bot_token()
@@ -671,6 +700,8 @@ class ArgentUserBot:
                 await self._init_inline_bot(bot_token)
             self._running = True
             self._start_time = time.time()
+            self.watchdog.start()
+            self.config.start_watcher()
             await self._display_startup_info()
             try:
                 if not self.config.get('installed_banner_shown', False):
@@ -699,7 +730,7 @@ class ArgentUserBot:
     async def _init_inline_bot(self, bot_token: str):
         try:
             from ..bot.inline_bot import ArgentInlineBot
-            self.inline_bot = ArgentInlineBot(bot_token, self.db, self.client)
+            self.inline_bot = ArgentInlineBot(bot_token, self.db, self.client, self.permissions)
             await self.inline_bot.start()
             logger.info('🤖 Inline bot initialized')
         except Exception as e:
@@ -714,55 +745,43 @@ class ArgentUserBot:
         except Exception as e:
             logger.error(f'❌ Error displaying startup info: {e}')
 
+    def _register_core_commands(self):
+        core = (('help', self._cmd_help, 'это меню', 'core', ''), ('info', self._cmd_info, 'краткая информация о боте', 'core', ''), ('sysinfo', self._cmd_sysinfo, 'подробная системная информация', 'core', ''), ('ping', self._cmd_ping, 'проверка скорости', 'core', ''), ('stats', self._cmd_stats, 'статистика работы', 'core', ''), ('config', self._cmd_config, 'управление конфигурацией', 'core', ''), ('sessions', self._cmd_sessions, 'управление сессиями', 'core', ''), ('restart', self._cmd_restart, 'перезапуск юзербота', 'core', ''), ('modules', self._cmd_modules, 'список модулей', 'loader', ''), ('load', self._cmd_load, 'загрузить модуль', 'loader', '&lt;module&gt;'), ('unload', self._cmd_unload, 'выгрузить модуль', 'loader', '&lt;module&gt;'), ('reload', self._cmd_reload, 'перезагрузить модуль', 'loader', '&lt;module&gt;'))
+        for name, func, description, category, usage in core:
+            self.router.register(name, func, description, module='core', category=category, usage=usage)
+        self.router.register('tasks', self._cmd_tasks, 'выполняющиеся команды', module='core', category='core', inline=True)
+        self.router.register('flame', self._cmd_flame, 'сэмплирующий профилировщик', module='core', category='core', usage='[сек] [Гц] [svg]', long=True, timeout=0)
+        self.router.register('profile', self._cmd_profile, 'профилировать команду через cProfile', module='core', category='core', usage='[-n N] &lt;команда&gt; [аргументы]', long=True, timeout=0)
+        self.router.register('memprof', self._cmd_memprof, 'снимки памяти tracemalloc', module='core', category='core', usage='start|stop|diff|status')
+        self.router.register('cancel', self._cmd_cancel, 'отменить команду', module='core', category='core', usage='&lt;id|all&gt;', inline=True)
+
     def _register_handlers(self):
 
-        @self.client.on(events.NewMessage(outgoing=True))
         async def handle_outgoing(event: events.NewMessage.Event):
-            text = event.raw_text
-            if not text or not text.startswith('.'):
+            routed = self.router.parse(event.raw_text)
+            if routed is None:
                 return
-            parts = text.split()
-            command = parts[0].lower()
-            args = parts[1:] if len(parts) > 1 else []
-            if self.config.get('interface.hide_commands', False):
+            if self.config.settings.interface.hide_commands:
                 return
             self._commands_executed += 1
-            if self.loader and await self.loader.execute_command(command, event, args):
-                return
-            await self._handle_core_command(command, event, args)
-
-    async def _handle_core_command(self, command: str, event: events.NewMessage.Event, args: List[str]):
-        if command == '.help':
-            await self._cmd_help(event, args)
-        elif command == '.info':
-            await self._cmd_info(event, args)
-        elif command == '.sysinfo':
-            await self._cmd_sysinfo(event, args)
-        elif command == '.ping':
-            await self._cmd_ping(event, args)
-        elif command == '.modules':
-            await self._cmd_modules(event, args)
-        elif command == '.load':
-            await self._cmd_load(event, args)
-        elif command == '.unload':
-            await self._cmd_unload(event, args)
-        elif command == '.reload':
-            await self._cmd_reload(event, args)
-        elif command == '.stats':
-            await self._cmd_stats(event, args)
-        elif command == '.config':
-            await self._cmd_config(event, args)
-        elif command == '.sessions':
-            await self._cmd_sessions(event, args)
-        elif command == '.restart':
-            await self._cmd_restart(event, args)
+            self.executor.submit(event, *routed)
+        self.event_bus.subscribe(Subscription(handle_outgoing, 'core', outgoing=True))
+        self.event_bus.attach(self.client)
 
     async def _cmd_help(self, event: events.NewMessage.Event, args: List[str]):
         if not self.loader:
             await event.edit('❌ Module loader not initialized')
             return
         categories = self.loader.get_commands_by_category()
-        help_text = f'<b>{self.emoji} {self.name} - Справочник</b>\n<blockquote><b>🧪 Основные команды:</b>\n<code>.help</code> — это меню\n<code>.info</code> — краткая информация о боте\n<code>.sysinfo</code> — подробная системная информация\n<code>.ping</code> — проверка скорости\n<code>.stats</code> — статистика работы\n<code>.config</code> — управление конфигурацией\n<code>.sessions</code> — управление сессиями\n<code>.restart</code> — перезапуск юзербота\n\n<b>⚙️ Управление модулями:</b>\n<code>.modules</code> — список модулей\n<code>.load &lt;module&gt;</code> — загрузить модуль\n<code>.unload &lt;module&gt;</code> — выгрузить модуль\n<code>.reload &lt;module&gt;</code> — перезагрузить модуль\n\n<b>📚 Категории модулей:</b>\n'
+        help_text = f'<b>{self.emoji} {self.name} - Справочник</b>\n<blockquote>'
+        core = self.router.by_category()
+        for category, title in (('core', '<b>🧪 Основные команды:</b>\n'), ('loader', '\n<b>⚙️ Управление модулями:</b>\n')):
+            help_text += title
+            for command in core.get(category, []):
+                if command.module == 'core':
+                    usage = f' {command.usage}' if command.usage else ''
+                    help_text += f'<code>{self.router.prefix}{command.name}{usage}</code> — {command.description}\n'
+        help_text += '\n<b>📚 Категории модулей:</b>\n'
         for category, commands in categories.items():
             if commands:
                 emoji_map = {'core': '🧪', 'utils': '🔧', 'admin': '👑', 'fun': '🎭', 'misc': '📦'}
@@ -920,9 +939,186 @@ class ArgentUserBot:
     async def _cmd_stats(self, event: events.NewMessage.Event, args: List[str]):
         uptime = time.time() - self._start_time
         db_stats = self.db.get_stats()
-        stats_text = f"\n\n<b>📊 {self.name} - Статистика</b>\n\n<b>⏱️ Время работы:</b>\n• <b>Запущен:</b> {self.utils.format_timestamp(int(self._start_time))}\n• <b>Работает:</b> {self.utils.format_duration(uptime)}\n• <b>Команд выполнено:</b> <code>{self._commands_executed}</code>\n\n<b>🧪 Модули:</b>\n• <b>Загружено:</b> <code>{(len(self.loader.modules) if self.loader else 0)}</code>\n• <b>Команд доступно:</b> <code>{(len(self.loader.commands) if self.loader else 0)}</code>\n\n<b>💾 База данных:</b>\n• <b>JSON секций:</b> <code>{db_stats.get('json_sections', 0)}</code>\n• <b>Записей модулей:</b> <code>{db_stats.get('module_data_count', 0)}</code>\n• <b>Записей пользователей:</b> <code>{db_stats.get('user_data_count', 0)}</code>\n• <b>Записей чатов:</b> <code>{db_stats.get('chat_data_count', 0)}</code>\n• <b>Размер JSON:</b> <code>{self.utils.format_bytes(db_stats.get('json_size', 0))}</code>\n• <b>Размер SQLite:</b> <code>{self.utils.format_bytes(db_stats.get('sqlite_size', 0))}</code>\n\n<b>🔬 Система:</b>\n• <b>Версия:</b> <code>{self.version}</code>\n• <b>Автор:</b> {self.author}\n\n"
+        stats_text = f"\n\n<b>📊 {self.name} - Статистика</b>\n\n<b>⏱️ Время работы:</b>\n• <b>Запущен:</b> {self.utils.format_timestamp(int(self._start_time))}\n• <b>Работает:</b> {self.utils.format_duration(uptime)}\n• <b>Команд выполнено:</b> <code>{self._commands_executed}</code>\n\n<b>🧪 Модули:</b>\n• <b>Загружено:</b> <code>{(len(self.loader.modules) if self.loader else 0)}</code>\n• <b>Команд доступно:</b> <code>{(len(self.loader.commands) if self.loader else 0)}</code>\n\n<b>💾 База данных:</b>\n• <b>JSON секций:</b> <code>{db_stats.get('json_sections', 0)}</code>\n• <b>Записей модулей:</b> <code>{db_stats.get('module_data_count', 0)}</code>\n• <b>Записей пользователей:</b> <code>{db_stats.get('user_data_count', 0)}</code>\n• <b>Записей чатов:</b> <code>{db_stats.get('chat_data_count', 0)}</code>\n• <b>Размер JSON:</b> <code>{self.utils.format_bytes(db_stats.get('json_size', 0))}</code>\n• <b>Размер SQLite:</b> <code>{self.utils.format_bytes(db_stats.get('sqlite_size', 0))}</code>\n• <b>Очередь записи:</b> <code>{db_stats.get('write_queue_depth', 0)}</code>\n\n<b>🔬 Система:</b>\n• <b>Версия:</b> <code>{self.version}</code>\n• <b>Автор:</b> {self.author}\n\n"
+        stats_text += self._format_command_metrics(show_all=bool(args) and args[0].lower() == 'all')
+        stats_text += self._format_loop_health()
         await event.edit(stats_text)
 
+    def _format_loop_health(self) -> str:
+        lag = self.watchdog.lag
+        text = f'\n<b>🐢 Цикл событий:</b>\n• <b>Задержка p50/p99/max:</b> <code>{lag.percentile(0.5) * 1000:.1f}/{lag.percentile(0.99) * 1000:.1f}/{lag.max * 1000:.1f} мс</code>\n• <b>Блокировок &gt;{self.watchdog.threshold * 1000:.0f} мс:</b> <code>{self.watchdog.stalls}</code>\n'
+        for stall in self.watchdog.top(3):
+            text += f'• <code>{self.utils.escape_html(stall.location)}</code> ×{stall.count}, макс <code>{stall.max * 1000:.0f} мс</code>\n'
+        pools = offloader.stats
+        text += f"• <b>Фоновые потоки:</b> <code>{pools['thread'].active}</code> активно, <code>{pools['thread'].completed}</code> выполнено | <b>процессы:</b> <code>{pools['process'].completed}</code>\n"
+        return text
+
+    def _format_command_metrics(self, show_all: bool=False) -> str:
+        metrics = self.router.metrics
+        total, errors = metrics.totals()
+        if not total:
+            return ''
+        rows = metrics.top(limit=len(metrics) if show_all else 5)
+        text = f'<b>⏱️ Команды (p50/p95/p99, мс):</b>\n• <b>Вызовов:</b> <code>{total}</code> | <b>Ошибок:</b> <code>{errors}</code>\n'
+        for name, data in rows:
+            text += f"• <code>{self.router.prefix}{self.utils.escape_html(name)}</code> ×{data['count']}: <code>{data['p50'] * 1000:.1f}/{data['p95'] * 1000:.1f}/{data['p99'] * 1000:.1f}</code>"
+            text += f" ❌{data['errors']}\n" if data['errors'] else '\n'
+        last = metrics.last_error()
+        if last:
+            name, histogram = last
+            text += f'• <b>Последняя ошибка:</b> <code>{self.router.prefix}{name}</code> ({self.utils.format_timestamp(int(histogram.last_error_at))}): <code>{self.utils.escape_html(histogram.last_error)}</code>\n'
+        if len(rows) < len(metrics):
+            text += f'<i>Все команды:</i> <code>{self.router.prefix}stats all</code>\n'
+        return text
+
+    async def _cmd_tasks(self, event: events.NewMessage.Event, args: List[str]):
+        current = current_job.get()
+        jobs = [job for job in self.executor.active() if job is not current]
+        text = f'<b>⚙️ Задачи ({len(jobs)}/{self.executor.workers} воркеров)</b>\n'
+        if not jobs:
+            text += '\n💤 <b>Нет выполняющихся команд</b>\n'
+        for job in jobs:
+            command = ' '.join([self.router.prefix + job.command.name] + job.args)[:60]
+            state = '▶️' if job.state == 'running' else '⏳'
+            text += f'\n{state} <code>#{job.id}</code> <code>{self.utils.escape_html(command)}</code> — {self.utils.format_duration(job.elapsed)}'
+        finished = list(self.executor.history)[-5:]
+        if finished:
+            icons = {'done': '✅', 'failed': '❌', 'timeout': '⏱️', 'cancelled': '🛑'}
+            text += '\n\n<b>📜 Недавние:</b>'
+            for job in reversed(finished):
+                text += f"\n{icons.get(job.state, '•')} <code>#{job.id}</code> <code>{self.router.prefix}{job.command.name}</code> — {self.utils.format_duration(job.elapsed)}"
+        text += f'\n\n<i>Отмена:</i> <code>{self.router.prefix}cancel &lt;id&gt;</code>'
+        await event.edit(text)
+
+    async def _cmd_cancel(self, event: events.NewMessage.Event, args: List[str]):
+        if not args:
+            await event.edit(f'❌ <b>Использование:</b> <code>{self.router.prefix}cancel &lt;id|all&gt;</code>')
+            return
+        current = current_job.get()
+        if args[0].lower() == 'all':
+            cancelled = [job.id for job in self.executor.active() if job is not current and self.executor.cancel(job.id)]
+            await event.edit(f'🛑 <b>Отменено задач:</b> <code>{len(cancelled)}</code>')
+            return
+        try:
+            job_id = int(args[0].lstrip('#'))
+        except ValueError:
+            await event.edit('❌ <b>Укажите номер задачи</b>')
+            return
+        if self.executor.cancel(job_id):
+            await event.edit(f'🛑 <b>Задача</b> <code>#{job_id}</code> <b>отменена</b>')
+        else:
+            await event.edit(f'❌ <b>Задача</b> <code>#{job_id}</code> <b>не найдена</b>')
+
+    async def _cmd_flame(self, event: events.NewMessage.Event, args: List[str]):
+        numbers = []
+        svg = False
+        for arg in args:
+            if arg.lower() == 'svg':
+                svg = True
+                continue
+            try:
+                numbers.append(float(arg))
+            except ValueError:
+                await event.edit(f'❌ <b>Использование:</b> <code>{self.router.prefix}flame [секунды] [Гц] [svg]</code>')
+                return
+        if self.profiler.running:
+            await event.edit('⚠️ <b>Профилировщик уже запущен</b>')
+            return
+        seconds = min(max(numbers[0], 1.0), 300.0) if numbers else 30.0
+        hz = min(max(numbers[1], 1.0), 1000.0) if len(numbers) > 1 else 1 / SamplingProfiler.INTERVAL
+        previous = self.profiler.interval
+        self.profiler.interval = 1 / hz
+        try:
+            await event.edit(f'🔥 <b>Профилирование:</b> <code>{seconds:g}s</code> при <code>{hz:g} Гц</code>...')
+            stacks = await self.profiler.profile(seconds)
+        finally:
+            self.profiler.interval = previous
+        if not stacks:
+            await event.edit('❌ <b>Не удалось собрать сэмплы</b>')
+            return
+        payload = render_svg(stacks, f'{self.name} — {seconds:g}s') if svg else self.profiler.collapsed()
+        document = io.BytesIO(payload.encode('utf-8'))
+        document.name = f"argent-flame-{int(time.time())}.{('svg' if svg else 'txt')}"
+        caption = f'🔥 <b>Flame graph</b>\n• <b>Сэмплов:</b> <code>{self.profiler.samples}</code> за <code>{self.profiler.duration:.1f}s</code>\n• <b>Стеков:</b> <code>{len(stacks)}</code>\n\n<b>🔝 Горячие функции (цикл событий):</b>\n'
+        loop_samples = sum((count for stack, count in stacks.items() if stack.startswith(threading.current_thread().name + ';'))) or 1
+        for label, count in self.profiler.top(5, threading.current_thread().name):
+            caption += f'• <code>{self.utils.escape_html(label[:70])}</code> — {count * 100 / loop_samples:.1f}%\n'
+        await self.client.send_file(event.chat_id, document, caption=caption[:1024], force_document=True)
+        await event.edit(f'✅ <b>Профиль готов:</b> <code>{document.name}</code>')
+
+    async def _cmd_profile(self, event: events.NewMessage.Event, args: List[str]):
+        limit = 15
+        if len(args) > 1 and args[0] == '-n':
+            try:
+                limit = min(max(int(args[1]), 1), 50)
+            except ValueError:
+                pass
+            args = args[2:]
+        if not args:
+            await event.edit(f'❌ <b>Использование:</b> <code>{self.router.prefix}profile [-n N] &lt;команда&gt; [аргументы]</code>')
+            return
+        name = args[0][len(self.router.prefix):] if args[0].startswith(self.router.prefix) else args[0]
+        command = self.router.get(name)
+        if command is None or command.name in ('profile', 'flame'):
+            await event.edit(f'❌ <b>Команда</b> <code>{self.utils.escape_html(name)}</code> <b>не найдена или не может быть профилирована</b>')
+            return
+        if self._cprofile_active:
+            await event.edit('⚠️ <b>cProfile уже запущен</b>')
+            return
+        self._cprofile_active = True
+        profile = cProfile.Profile()
+        status = ''
+        started = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                await asyncio.wait_for(self.router.dispatch(event, command, args[1:]), self.executor.timeout_for(command))
+            finally:
+                profile.disable()
+        except asyncio.TimeoutError:
+            status = ' ⏱️ таймаут'
+        finally:
+            self._cprofile_active = False
+        elapsed = time.perf_counter() - started
+        rows = '\n'.join((f'{cumulative * 1000:9.1f} {own * 1000:9.1f} {calls:>7} {self.utils.escape_html(label[:80])}' for label, calls, own, cumulative in cprofile_top(profile, limit)))
+        report = f'📈 <b>cProfile</b> <code>{self.router.prefix}{command.name}</code> — <code>{elapsed * 1000:.1f} мс</code>{status}\n<i>⚠️ Профиль всего цикла событий: в него попадают и другие задачи, выполнявшиеся одновременно с командой</i>\n<pre>   cum ms    own ms   calls функция\n{rows}</pre>'
+        if len(report) > 4000:
+            document = io.BytesIO(report.replace('<pre>', '').replace('</pre>', '').encode('utf-8'))
+            document.name = f'argent-profile-{command.name}.txt'
+            await self.client.send_file(event.chat_id, document, caption=f'📈 <b>cProfile</b> <code>{self.router.prefix}{command.name}</code>\n<i>⚠️ Профиль всего цикла событий за время выполнения команды</i>', force_document=True)
+        else:
+            await event.respond(report)
+
+    async def _cmd_memprof(self, event: events.NewMessage.Event, args: List[str]):
+        action = args[0].lower() if args else 'status'
+        memory = self.memory_profiler
+        if action == 'start':
+            if memory.running:
+                await event.edit('⚠️ <b>tracemalloc уже запущен</b>')
+                return
+            memory.start()
+            await event.edit(f'🧠 <b>tracemalloc запущен</b> (<code>{memory.frames}</code> кадров)\n<i>Отчет:</i> <code>{self.router.prefix}memprof stop</code>')
+            return
+        if action in ('stop', 'diff'):
+            if not memory.running:
+                await event.edit(f'❌ <b>tracemalloc не запущен:</b> <code>{self.router.prefix}memprof start</code>')
+                return
+            duration = time.time() - memory.started_at
+            current, peak = memory.traced()
+            diffs = memory.stop() if action == 'stop' else memory.diff()
+            text = f'🧠 <b>Аллокации за {self.utils.format_duration(duration)}</b>\n• <b>Сейчас:</b> <code>{self.utils.format_bytes(current)}</code> | <b>Пик:</b> <code>{self.utils.format_bytes(peak)}</code>\n<pre>'
+            for diff in diffs:
+                frame = diff.traceback[0]
+                text += f'{diff.size_diff / 1024:+10.1f} KiB {diff.count_diff:+7} {self.utils.escape_html(short_path(frame.filename))}:{frame.lineno}\n'
+            text += '</pre>' if diffs else 'без изменений</pre>'
+            await event.edit(text)
+            return
+        if memory.running:
+            current, peak = memory.traced()
+            await event.edit(f'🧠 <b>tracemalloc активен</b> {self.utils.format_duration(time.time() - memory.started_at)}\n• <b>Сейчас:</b> <code>{self.utils.format_bytes(current)}</code> | <b>Пик:</b> <code>{self.utils.format_bytes(peak)}</code>')
+        else:
+            await event.edit(f'🧠 <b>tracemalloc отключен</b>\n<code>{self.router.prefix}memprof start|stop|diff|status</code>')
+
     async def _cmd_config(self, event: events.NewMessage.Event, args: List[str]):
         if not args:
             config_text = f'<b>⚙️ {self.name} - Конфигурация</b>\n<blockquote><b>📋 Использование:</b>\n<code>.config get &lt;path&gt;</code> — получить значение\n<code>.config set &lt;path&gt; &lt;value&gt;</code> — установить значение\n<code>.config reset &lt;path&gt;</code> — сбросить к умолчанию\n<code>.config list</code> — показать всю конфигурацию\n\n<b>📝 Примеры:</b>\n<code>.config get userbot.name</code>\n<code>.config set userbot.emoji 🧪</code>\n<code>.config reset modules.auto_load</code></blockquote>'
@@ -1041,6 +1237,9 @@ class ArgentUserBot:
         await self.client.run_until_disconnected()
 
     async def stop(self):
+        await self.executor.shutdown()
+        if self.loader is not None:
+            await self.loader.unload_all()
         try:
             if hasattr(self, 'inline_bot'):
                 await self.inline_bot.stop()
@@ -1050,6 +1249,15 @@ class ArgentUserBot:
             await self.session_manager.disconnect()
         except Exception:
             pass
+        self.event_bus.detach()
+        self.watchdog.stop()
+        offloader.shutdown()
+        self.config.stop_watcher()
+        self.config.flush()
+        try:
+            self.db.close()
+        except Exception as e:
+            logger.error(f'❌ Database close on stop failed: {e}')
         self._running = False
         logger.info(f'🛑 {self.name} stopped')
 
@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import List, Optional, Tuple
+from .metrics import Histogram
+logger = logging.getLogger(__name__)
+LAG_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+_PACKAGE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Stall:
+    __slots__ = ('location', 'count', 'total', 'max', 'stack', 'last_at')
+
+    def __init__(self, location: str):
+        self.location = location
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.stack = ''
+        self.last_at = 0.0
+
+class LoopWatchdog:
+    INTERVAL = 0.1
+    THRESHOLD = 0.25
+
+    def __init__(self, interval: Optional[float]=None, threshold: Optional[float]=None, max_offenders: int=50, stack_depth: int=12):
+        self.interval = interval or self.INTERVAL
+        self.threshold = threshold or self.THRESHOLD
+        self.max_offenders = max_offenders
+        self.stack_depth = stack_depth
+        self.lag = Histogram(LAG_BUCKETS)
+        self.offenders = {}
+        self.stalls = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._beat = 0.0
+        self._captured_beat = 0.0
+        self._pending: Optional[Tuple[str, str]] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop]=None):
+        if self._task is not None:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = self._loop.create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._monitor, name='argent-watchdog', daemon=True)
+        self._thread.start()
+        logger.info(f'🐢 Loop watchdog started (threshold {self.threshold * 1000:.0f}ms)')
+
+    def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._thread = None
+
+    async def _heartbeat(self):
+        interval = self.interval
+        while True:
+            expected = time.monotonic() + interval
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self._beat = now
+            self.lag.observe(lag)
+            pending, self._pending = (self._pending, None)
+            if pending is not None and lag >= self.threshold:
+                self._record(pending[0], pending[1], lag)
+
+    def _monitor(self):
+        while not self._stop.wait(self.threshold / 2):
+            beat = self._beat
+            if beat == self._captured_beat or time.monotonic() - beat - self.interval < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._captured_beat = beat
+            self._pending = (self._locate(frame), ''.join(traceback.format_stack(frame, limit=self.stack_depth)))
+
+    def _locate(self, frame) -> str:
+        innermost = frame
+        while frame is not None:
+            filename = frame.f_code.co_filename
+            if frame.f_code.co_name == '_run' and filename.endswith(os.path.join('asyncio', 'events.py')):
+                frame = None
+                break
+            if filename.startswith(_PACKAGE):
+                break
+            frame = frame.f_back
+        frame = frame or innermost
+        filename = os.path.relpath(frame.f_code.co_filename, os.path.dirname(_PACKAGE)) if frame.f_code.co_filename.startswith(_PACKAGE) else os.path.basename(frame.f_code.co_filename)
+        return f'{filename}:{frame.f_lineno} {frame.f_code.co_name}'
+
+    def _record(self, location: str, stack: str, duration: float):
+        self.stalls += 1
+        stall = self.offenders.get(location)
+        if stall is None:
+            if len(self.offenders) >= self.max_offenders:
+                del self.offenders[min(self.offenders.values(), key=lambda item: (item.total, item.last_at)).location]
+            stall = self.offenders[location] = Stall(location)
+        stall.count += 1
+        stall.total += duration
+        stall.max = max(stall.max, duration)
+        stall.stack = stack
+        stall.last_at = time.time()
+        logger.warning(f'🐢 Event loop blocked for {duration:.3f}s at {location}')
+
+    def top(self, limit: int=5) -> List[Stall]:
+        return sorted(self.offenders.values(), key=lambda item: item.total, reverse=True)[:limit]
+
+    def reset(self):
+        self.lag = Histogram(LAG_BUCKETS)
+        self.offenders.clear()
+        self.stalls = 0
\ No newline at end of file
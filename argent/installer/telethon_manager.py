@@ -9,6 +9,8 @@ from typing import Dict, Optional, Tuple
 from telethon import TelegramClient
 from telethon.sessions import StringSession
 from telethon.errors import SessionPasswordNeededError, FloodWaitError, PhoneCodeInvalidError
+from ..storage.codec import atomic_write, dumps_pretty
+from ..storage.filelock import FileLock
 try:
     import qrcode
 except Exception:
@@ -38,8 +40,14 @@ class SessionStore:
 
     def save_install(self, user_session: str, bot_token: str, api_id: int, api_hash: str) -> None:
         data = {'bot_token': bot_token, 'api_id': api_id, 'api_hash': api_hash, 'user_session': user_session, 'version': 1}
-        with open(self.config_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        lock = FileLock(os.path.join(self.base_dir, 'config'))
+        try:
+            with lock:
+                current = self.load_install() or {}
+                current.update(data)
+                atomic_write(self.config_path, dumps_pretty(current))
+        finally:
+            lock.close()
 
     def load_install(self) -> Optional[dict]:
         if not os.path.exists(self.config_path):
@@ -14,7 +14,7 @@ class HerokuFeaturesModule(ArgentModule):
         super().__init__()
         self.description = '🚀 Классические функции Argent c научным подходом'
         self.register_command('alive', self.cmd_alive, '💫 Проверка активности')
-        self.register_command('speedtest', self.cmd_speedtest, '🌐 Тест скорости')
+        self.register_command('speedtest', self.cmd_speedtest, '🌐 Тест скорости', long=True, timeout=120)
         self.register_command('usage', self.cmd_usage, '📊 Использование ресурсов')
         self.register_command('logs', self.cmd_logs, '📋 Системные логи')
         self.register_command('update', self.cmd_update, '🔄 Обновление системы')
@@ -33,7 +33,7 @@ class HerokuFeaturesModule(ArgentModule):
     async def cmd_alive(self, event, args):
         start_time = time.time()
         import psutil
-        cpu = psutil.cpu_percent(interval=1)
+        cpu = await self.utils.run_sync(psutil.cpu_percent, interval=1)
         memory = psutil.virtual_memory()
         me = await self.client.get_me()
         uptime = self.db.get_config('start_time', time.time())
@@ -46,13 +46,13 @@ class HerokuFeaturesModule(ArgentModule):
         await event.edit('🌐 <b>Тестирование скорости...</b>\n\n🔬 Анализ сетевых соединений...')
         try:
             import speedtest
-            st = speedtest.Speedtest()
+            st = await self.utils.run_sync(speedtest.Speedtest)
             await event.edit('🌐 <b>Поиск оптимального сервера...</b>')
-            st.get_best_server()
+            await self.utils.run_sync(st.get_best_server)
             await event.edit('📥 <b>Тестирование загрузки...</b>')
-            download_speed = st.download() / 1000000
+            download_speed = await self.utils.run_sync(st.download) / 1000000
             await event.edit('📤 <b>Тестирование отдачи...</b>')
-            upload_speed = st.upload() / 1000000
+            upload_speed = await self.utils.run_sync(st.upload) / 1000000
             ping = st.results.ping
             await event.edit(f"🌐 <b>Результаты теста скорости</b>\n\n<blockquote>\n<b>📥 Загрузка:</b> <code>{download_speed:.2f} Mbps</code>\n<b>📤 Отдача:</b> <code>{upload_speed:.2f} Mbps</code>\n<b>🏓 Пинг:</b> <code>{ping:.2f} ms</code>\n\n<b>🔬 Провайдер:</b> {st.results.client['isp']}\n<b>🌍 Сервер:</b> {st.results.server['name']} ({st.results.server['country']})\n\n<b>⚛️ Качество соединения:</b> {('🟢 Отличное' if download_speed > 50 else '🟡 Хорошее' if download_speed > 10 else '🔴 Слабое')}\n</blockquote>")
         except ImportError:
@@ -63,7 +63,7 @@ class HerokuFeaturesModule(ArgentModule):
     async def cmd_usage(self, event, args):
         import psutil
         import os
-        cpu_percent = psutil.cpu_percent(interval=1)
+        cpu_percent = await self.utils.run_sync(psutil.cpu_percent, interval=1)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage('/')
         process = psutil.Process(os.getpid())
@@ -75,7 +75,7 @@ class HerokuFeaturesModule(ArgentModule):
     async def cmd_logs(self, event, args):
         import subprocess
         try:
-            result = subprocess.run(['tail', '-20', '/var/log/syslog'], capture_output=True, text=True, timeout=10)
+            result = await self.utils.run_sync(subprocess.run, ['tail', '-20', '/var/log/syslog'], capture_output=True, text=True, timeout=10)
             if result.returncode == 0:
                 logs = result.stdout
                 if len(logs) > 3500:
@@ -92,13 +92,13 @@ class HerokuFeaturesModule(ArgentModule):
         await event.edit('🔄 <b>Проверка обновлений...</b>')
         try:
             import subprocess
-            result = subprocess.run(['git', 'status', '--porcelain'], capture_output=True, text=True, timeout=10)
+            result = await self.utils.run_sync(subprocess.run, ['git', 'status', '--porcelain'], capture_output=True, text=True, timeout=10)
             if result.returncode == 0:
                 if result.stdout.strip():
                     await event.edit('⚠️ <b>Есть локальные изменения</b>\n\n🔬 Сначала сохраните изменения')
                     return
                 await event.edit('📥 <b>Загрузка обновлений...</b>')
-                result = subprocess.run(['git', 'pull'], capture_output=True, text=True, timeout=30)
+                result = await self.utils.run_sync(subprocess.run, ['git', 'pull'], capture_output=True, text=True, timeout=30)
                 if 'Already up to date' in result.stdout:
                     await event.edit('✅ <b>Система актуальна</b>\n\n🧪 Обновления не требуются')
                 else:
@@ -132,17 +132,17 @@ class HerokuFeaturesModule(ArgentModule):
             import os
             if os.name == 'nt':
                 try:
-                    result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30, creationflags=subprocess.CREATE_NO_WINDOW)
+                    result = await self.utils.run_sync(subprocess.run, command, shell=True, capture_output=True, text=True, timeout=30, creationflags=subprocess.CREATE_NO_WINDOW)
                     stderr_lines = result.stderr.split('\n') if result.stderr else []
                     filtered_stderr = '\n'.join([line for line in stderr_lines if 'PRN' not in line and 'гбва®©бвў®' not in line])
                     output = result.stdout + filtered_stderr
                 except Exception:
-                    result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+                    result = await self.utils.run_sync(subprocess.run, command, shell=True, capture_output=True, text=True, timeout=30)
                     stderr_lines = result.stderr.split('\n') if result.stderr else []
                     filtered_stderr = '\n'.join([line for line in stderr_lines if 'PRN' not in line and 'гбва®©бвў®' not in line])
                     output = result.stdout + filtered_stderr
             else:
-                result = subprocess.run(command, shell=True, capture_output=True, text=True, timeout=30)
+                result = await self.utils.run_sync(subprocess.run, command, shell=True, capture_output=True, text=True, timeout=30)
                 output = result.stdout + result.stderr
             if len(output) > 3500:
                 output = output[-3500:]
@@ -271,7 +271,7 @@ class HerokuFeaturesModule(ArgentModule):
         try:
             from googletrans import Translator
             translator = Translator()
-            result = translator.translate(text, dest=target_lang)
+            result = await self.utils.run_sync(translator.translate, text, dest=target_lang)
             await event.edit(f"🌍 <b>Перевод завершен</b>\n\n<blockquote>\n<b>📝 Оригинал ({result.src}):</b>\n{text}\n\n<b>🔄 Перевод ({target_lang}):</b>\n{result.text}\n\n<b>🔬 Достоверность:</b> {(int(result.confidence * 100) if hasattr(result, 'confidence') else 'N/A')}%\n</blockquote>")
         except ImportError:
             await event.edit('❌ <b>Модуль googletrans не установлен</b>\n\n📦 Установите: <code>pip install googletrans==4.0.0-rc1</code>')
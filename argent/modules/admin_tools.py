@@ -16,7 +16,7 @@ class AdminToolsModule(ArgentModule):
         self.register_command('mute', self.cmd_mute, '🔇 Замутить пользователя')
         self.register_command('unmute', self.cmd_unmute, '🔊 Размутить пользователя')
         self.register_command('kick', self.cmd_kick, '👢 Кикнуть пользователя')
-        self.register_command('purge', self.cmd_purge, '🧹 Очистить сообщения')
+        self.register_command('purge', self.cmd_purge, '🧹 Очистить сообщения', long=True, timeout=0)
         self.register_command('chatinfo', self.cmd_chatinfo, 'ℹ️ нформация о чате')
 
     async def _get_user_from_message(self, event):
@@ -11,6 +11,7 @@ from telethon.tl.tlobject import TLRequest
 from telethon.tl.types import Message
 from telethon.utils import is_list_like
 from argent.core.loader import ArgentModule
+from argent.utils.offload import offloader
 try:
     from argent.config.api_limiter_defaults import API_LIMITER_CONFIG, PROTECTION_PROFILES
 except ImportError:
@@ -36,6 +37,7 @@ class APILimiterModule(ArgentModule):
     __version__ = '1.2.0'
     __author__ = 'Argent UserBot Team'
     __category__ = 'core'
+    TRIGGER_HISTORY = 1000
 
     def __init__(self):
         super().__init__()
@@ -47,6 +49,7 @@ class APILimiterModule(ArgentModule):
         self._original_call = None
         self._installed = False
         self._config = API_LIMITER_CONFIG.copy()
+        self._triggers = None
         self.register_command('apilimit', self.cmd_apilimit, '🛡️ Управление API лимитером')
         self.register_command('apiconfig', self.cmd_apiconfig, '⚙️ Конфигурация API лимитера')
         self.register_command('apistats', self.cmd_apistats, '📊 Статистика API запросов')
@@ -58,16 +61,24 @@ class APILimiterModule(ArgentModule):
         try:
             logger.info('🔄 Инициализация API Limiter...')
             await asyncio.sleep(1)
-            saved_config = self.db.get('modules', 'api_limiter_config')
+            saved_config = self.db.get_module_config('api_limiter', 'config')
             if saved_config:
                 self._config.update(saved_config)
                 logger.info('📋 Конфигурация загружена из БД')
             else:
-                self.db.set('modules', 'api_limiter_config', self._config)
+                self.db.set_module_config('api_limiter', 'config', self._config)
                 logger.info('📋 Создана дефолтная конфигурация')
-            protection_enabled = self.db.get('modules', 'api_limiter_enabled')
+            protection_enabled = self.db.get_module_config('api_limiter', 'enabled')
+            self._triggers = self.db.timeseries('api_limiter_triggers', self.TRIGGER_HISTORY)
+            self.db.delete_module_config('api_limiter', 'last_trigger')
+            self.db.delete('api_limiter', 'last_trigger')
             if protection_enabled is not None:
                 self._protection_enabled = protection_enabled
+            if self.config is not None:
+                self.config.subscribe('api_limiter', self._on_config_changed)
+                profile_name = self.config.get_str('api_limiter.profile')
+                if profile_name:
+                    self._apply_profile(profile_name)
             logger.info('⏳ Запуск установки защиты через 3 секунды...')
             await asyncio.sleep(3)
             asyncio.create_task(self._install_protection())
@@ -76,9 +87,37 @@ class APILimiterModule(ArgentModule):
             logger.error(f'❌ Failed to initialize API Limiter: {e}')
 
     async def on_unload(self):
+        if self.config is not None:
+            self.config.unsubscribe('api_limiter', self._on_config_changed)
         await self._uninstall_protection()
         logger.info('🛡️ API Limiter module unloaded')
 
+    def _apply_profile(self, profile_name: str) -> bool:
+        profile = PROTECTION_PROFILES.get(profile_name.lower())
+        if profile is None:
+            return False
+        self._config.update(profile['config'])
+        self.db.set_module_config('api_limiter', 'config', self._config)
+        self._ratelimiter.clear()
+        self._lock = False
+        return True
+
+    def _on_config_changed(self, path: str, old: Any, new: Any):
+        key = path.split('.', 1)[1] if '.' in path else ''
+        if key == 'profile':
+            if isinstance(new, str) and self._apply_profile(new):
+                logger.info(f'📋 Профиль API Limiter применен из конфигурации: {new}')
+            elif new is not None:
+                logger.warning(f'⚠️ Неизвестный профиль API Limiter в конфигурации: {new}')
+        elif key == 'enabled':
+            self._protection_enabled = bool(new)
+            self.db.set_module_config('api_limiter', 'enabled', self._protection_enabled)
+            logger.info(f"🛡️ API Limiter {('включен' if self._protection_enabled else 'выключен')} из конфигурации")
+        elif key in self._config and new is not None:
+            self._config[key] = new
+            self.db.set_module_config('api_limiter', 'config', self._config)
+            logger.info(f'⚙️ API Limiter: {key} = {new}')
+
     async def _install_protection(self):
         try:
             logger.info('🔄 Ожидание инициализации клиента...')
@@ -175,8 +214,12 @@ class APILimiterModule(ArgentModule):
     async def _handle_rate_limit(self):
         try:
             self._lock = True
-            report_data = {'timestamp': time.time(), 'requests_count': len(self._ratelimiter), 'time_window': self._config['time_sample'], 'threshold': self._config['threshold'], 'requests': [{'name': name, 'time': req_time} for name, req_time in self._ratelimiter[-50:]]}
-            self.db.set('modules', 'api_limiter_last_trigger', report_data)
+            top_requests = {}
+            for name, _ in self._ratelimiter:
+                top_requests[name] = top_requests.get(name, 0) + 1
+            report_data = {'requests_count': len(self._ratelimiter), 'time_window': self._config['time_sample'], 'threshold': self._config['threshold'], 'top': sorted(top_requests.items(), key=lambda x: x[1], reverse=True)[:10]}
+            if self._triggers is not None:
+                await offloader.run(self._triggers.append, 'rate_limit', report_data, time.time())
             logger.warning(f"🚨 API rate limit triggered! Requests: {len(self._ratelimiter)}/{self._config['threshold']} in {self._config['time_sample']}s")
             await asyncio.sleep(self._config['local_floodwait'])
             self._lock = False
@@ -193,11 +236,11 @@ class APILimiterModule(ArgentModule):
         action = args[0].lower()
         if action == 'on':
             self._protection_enabled = True
-            self.db.set('modules', 'api_limiter_enabled', True)
+            self.db.set_module_config('api_limiter', 'enabled', True)
             await event.edit('✅ <b>API Limiter включен</b>')
         elif action == 'off':
             self._protection_enabled = False
-            self.db.set('modules', 'api_limiter_enabled', False)
+            self.db.set_module_config('api_limiter', 'enabled', False)
             await event.edit('🔴 <b>API Limiter выключен</b>')
         elif action == 'reset':
             self._ratelimiter.clear()
@@ -228,7 +271,7 @@ class APILimiterModule(ArgentModule):
             elif isinstance(self._config[param], list):
                 value = value.split(',') if ',' in value else [value]
             self._config[param] = value
-            self.db.set('modules', 'api_limiter_config', self._config)
+            self.db.set_module_config('api_limiter', 'config', self._config)
             await event.edit(f'✅ <b>Параметр обновлен:</b>\n<code>{param} = {value}</code>')
         except ValueError:
             await event.edit(f'❌ <b>Неверный тип значения для параметра:</b> <code>{param}</code>')
@@ -240,14 +283,15 @@ class APILimiterModule(ArgentModule):
             request_types = {}
             for name, req_time in recent_requests:
                 request_types[name] = request_types.get(name, 0) + 1
-            last_trigger = self.db.get('modules', 'api_limiter_last_trigger')
+            last_trigger = await offloader.run(self._triggers.last) if self._triggers is not None else None
             stats_text = f"\n📊 <b>Статистика API Limiter</b>\n\n<b>📈 Текущее состояние:</b>\n• Запросов в буфере: <code>{len(recent_requests)}</code>\n• Порог срабатывания: <code>{self._config['threshold']}</code>\n• Заблокирован до: <code>{('Да' if current_time < self._suspend_until else 'Нет')}</code>\n\n<b>🔥 Топ запросов:</b>\n"
             sorted_types = sorted(request_types.items(), key=lambda x: x[1], reverse=True)
             for i, (req_type, count) in enumerate(sorted_types[:5], 1):
                 stats_text += f'{i}. <code>{req_type}</code>: {count}\n'
             if last_trigger:
-                trigger_time = self.utils.format_timestamp(int(last_trigger['timestamp']))
+                trigger_time = self.utils.format_timestamp(int(last_trigger['ts']))
                 stats_text += f'\n<b>🚨 Последнее срабатывание:</b>\n<code>{trigger_time}</code>'
+                stats_text += f"\n<b>📅 Срабатываний за сутки:</b> <code>{await offloader.run(self._triggers.count, since=time.time() - 86400)}</code>"
             await event.edit(stats_text)
         except Exception as e:
             await event.edit(f'❌ <b>Ошибка получения статистики:</b> <code>{e}</code>')
@@ -278,10 +322,7 @@ class APILimiterModule(ArgentModule):
             return
         try:
             profile = PROTECTION_PROFILES[profile_name]
-            self._config.update(profile['config'])
-            self.db.set('modules', 'api_limiter_config', self._config)
-            self._ratelimiter.clear()
-            self._lock = False
+            self._apply_profile(profile_name)
             await event.edit(f"\n✅ <b>Профиль применен:</b> <code>{profile_name}</code>\n\n<b>📝 Описание:</b> {profile['description']}\n\n<b>⚙️ Новые настройки:</b>\n• Порог: <code>{self._config['threshold']}</code>\n• Окно времени: <code>{self._config['time_sample']}s</code>\n• Время блокировки: <code>{self._config['local_floodwait']}s</code>\n• Задержки: <code>{self._config['min_delay']}-{self._config['max_delay']}s</code>\n\n<b>🔄 Статистика сброшена</b>\n")
         except Exception as e:
             await event.edit(f'❌ <b>Ошибка применения профиля:</b> <code>{e}</code>')
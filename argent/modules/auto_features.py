@@ -1,14 +1,17 @@
 import asyncio
+import logging
 import time
 import random
 from datetime import datetime, timedelta
 from argent.core.loader import ArgentModule
-from telethon.events import NewMessage
+logger = logging.getLogger(__name__)
 
 class AutoFeaturesModule(ArgentModule):
     __version__ = '1.0.0'
     __author__ = 'github.com/lonly19/Argent-Userbot'
     __category__ = 'utils'
+    AFK_COOLDOWN = 300
+    SCHEDULE_EXPIRE = 86400
 
     def __init__(self):
         super().__init__()
@@ -17,39 +20,75 @@ class AutoFeaturesModule(ArgentModule):
         self.register_command('autoreact', self.cmd_autoreact, ' Настроить авто-реакции')
         self.register_command('autopm', self.cmd_autopm, '📨 Авто-ответ в ЛС')
         self.register_command('schedule', self.cmd_schedule, '⏰ Запланировать сообщение')
-        self.register_command('broadcast', self.cmd_broadcast, '📢 Рассылка сообщений')
+        self.register_command('broadcast', self.cmd_broadcast, '📢 Рассылка сообщений', long=True, timeout=0)
         self.register_command('afk', self.cmd_afk, ' Режим AFK')
         self.register_command('autoread', self.cmd_autoread, '👁️ Авто-прочтение')
         self.register_command('autotype', self.cmd_autotype, '⌨️ Авто-печатание')
         self.register_command('autoforward', self.cmd_autoforward, '↗️ Авто-пересылка')
         self.auto_tasks = {}
+        self._watched_keys = ('auto_replies', 'auto_reactions', 'afk_mode')
+        self._auto_replies = []
+        self._auto_reactions = None
+        self._afk = None
+        self._reply_handler = self.register_handler(self._handle_auto_reply, incoming=True, active=False)
+        self._react_handler = self.register_handler(self._handle_auto_react, active=False)
+        self._afk_handler = self.register_handler(self._handle_afk, incoming=True, active=False)
 
     async def on_load(self):
-        self.client.add_event_handler(self._handle_auto_reply, NewMessage(incoming=True))
-        self.client.add_event_handler(self._handle_auto_react, NewMessage)
+        for key in self._watched_keys:
+            self.db.subscribe('config', key, self._on_config_changed)
+            self._on_config_changed('config', key, self.db.get_config(key))
         asyncio.create_task(self._scheduled_messages_loop())
-        self.client.add_event_handler(self._handle_afk, NewMessage(incoming=True))
+
+    async def on_unload(self):
+        for key in self._watched_keys:
+            self.db.unsubscribe('config', key, self._on_config_changed)
+
+    def _on_config_changed(self, section, key, value):
+        if key == 'auto_replies':
+            self._auto_replies = [(trigger.lower(), response) for trigger, response in (value or {}).items()]
+            self.update_handler(self._reply_handler, active=bool(self._auto_replies))
+        elif key == 'auto_reactions':
+            if not value or not value.get('enabled', False):
+                self._auto_reactions = None
+                self.update_handler(self._react_handler, active=False)
+            else:
+                self._auto_reactions = (value.get('chance', 10), list(value.get('reactions', ['👍', '❤️', '', '🔥', '⚡'])))
+                self.update_handler(self._react_handler, active=True, chats=self._chat_ids(value.get('chats')))
+        elif key == 'afk_mode':
+            self._afk = value if value and value.get('enabled') else None
+            self.update_handler(self._afk_handler, active=self._afk is not None)
+
+    def _chat_ids(self, chats):
+        if not chats:
+            return None
+        if isinstance(chats, (str, int)):
+            chats = [chats]
+        chat_ids = []
+        for chat in chats:
+            try:
+                chat_ids.append(int(chat))
+            except (TypeError, ValueError):
+                logger.warning(f'⚠️ auto_reactions: пропущен некорректный ID чата {chat!r}')
+        return chat_ids
 
     async def _handle_auto_reply(self, event):
-        auto_replies = self.db.get_config('auto_replies', {})
-        for trigger, response in auto_replies.items():
-            if trigger.lower() in event.text.lower():
+        if not self._auto_replies:
+            return
+        text = (event.text or '').lower()
+        for trigger, response in self._auto_replies:
+            if trigger in text:
                 await asyncio.sleep(random.uniform(1, 3))
                 await event.respond(response)
                 break
 
     async def _handle_auto_react(self, event):
-        auto_reactions = self.db.get_config('auto_reactions', {})
-        if not auto_reactions.get('enabled', False):
-            return
-        chat_id = event.chat_id
-        allowed_chats = auto_reactions.get('chats', [])
-        if allowed_chats and chat_id not in allowed_chats:
+        auto_reactions = self._auto_reactions
+        if auto_reactions is None:
             return
-        chance = auto_reactions.get('chance', 10)
+        chance, reactions = auto_reactions
         if random.randint(1, 100) > chance:
             return
-        reactions = auto_reactions.get('reactions', ['👍', '❤️', '', '🔥', '⚡'])
         reaction = random.choice(reactions)
         try:
             await asyncio.sleep(random.uniform(2, 5))
@@ -62,38 +101,38 @@ class AutoFeaturesModule(ArgentModule):
             try:
                 scheduled = self.db.get_config('scheduled_messages', [])
                 current_time = time.time()
-                for i, msg in enumerate(scheduled):
+                finished = []
+                for msg in scheduled:
                     if msg['time'] <= current_time:
                         try:
                             await self.client.send_message(msg['chat_id'], msg['text'])
-                            scheduled.pop(i)
-                            self.db.set_config('scheduled_messages', scheduled)
+                            finished.append(msg)
                         except:
-                            pass
+                            if current_time - msg['time'] > self.SCHEDULE_EXPIRE:
+                                finished.append(msg)
+                if finished:
+                    scheduled = [msg for msg in self.db.get_config('scheduled_messages', []) if msg not in finished]
+                    await self.db.aset_config('scheduled_messages', scheduled)
                 await asyncio.sleep(60)
             except:
                 await asyncio.sleep(60)
 
     async def _handle_afk(self, event):
-        afk_data = self.db.get_config('afk_mode')
-        if not afk_data or not afk_data.get('enabled'):
+        afk_data = self._afk
+        if afk_data is None:
             return
         if event.sender_id == (await self.client.get_me()).id:
             return
-        last_responses = afk_data.get('last_responses', {})
         user_id = str(event.sender_id)
-        if user_id in last_responses:
-            if time.time() - last_responses[user_id] < 300:
-                return
+        if self.db.get('afk_responses', user_id) is not None:
+            return
         afk_message = afk_data.get('message', ' Я сейчас AFK')
         afk_since = afk_data.get('since', time.time())
         duration = self.utils.format_duration(time.time() - afk_since)
         full_message = f'{afk_message}\n\n⏰ AFK уже: {duration}'
         try:
             await event.respond(full_message)
-            last_responses[user_id] = time.time()
-            afk_data['last_responses'] = last_responses
-            self.db.set_config('afk_mode', afk_data)
+            await self.db.aset('afk_responses', user_id, time.time(), ttl=self.AFK_COOLDOWN)
         except:
             pass
 
@@ -141,6 +180,12 @@ class AutoFeaturesModule(ArgentModule):
             self.db.set_config('auto_replies', {})
             await event.edit('✅ <b>Все авто-ответы очищены</b>')
 
+    def _update_auto_reactions(self, **changes):
+        with self.db.batch():
+            auto_reactions = self.db.get_config('auto_reactions', {})
+            auto_reactions.update(changes)
+            self.db.set_config('auto_reactions', auto_reactions)
+
     async def cmd_autoreact(self, event, args):
         if not args:
             auto_reactions = self.db.get_config('auto_reactions', {})
@@ -151,14 +196,10 @@ class AutoFeaturesModule(ArgentModule):
             return
         action = args[0].lower()
         if action in ['on', 'enable']:
-            auto_reactions = self.db.get_config('auto_reactions', {})
-            auto_reactions['enabled'] = True
-            self.db.set_config('auto_reactions', auto_reactions)
+            self._update_auto_reactions(enabled=True)
             await event.edit('✅ <b>Авто-реакции включены</b>')
         elif action in ['off', 'disable']:
-            auto_reactions = self.db.get_config('auto_reactions', {})
-            auto_reactions['enabled'] = False
-            self.db.set_config('auto_reactions', auto_reactions)
+            self._update_auto_reactions(enabled=False)
             await event.edit('❌ <b>Авто-реакции отключены</b>')
         elif action == 'chance':
             if len(args) < 2:
@@ -169,9 +210,7 @@ class AutoFeaturesModule(ArgentModule):
                 if not 1 <= chance <= 100:
                     await event.edit('❌ <b>Вероятность должна быть от 1 до 100</b>')
                     return
-                auto_reactions = self.db.get_config('auto_reactions', {})
-                auto_reactions['chance'] = chance
-                self.db.set_config('auto_reactions', auto_reactions)
+                self._update_auto_reactions(chance=chance)
                 await event.edit(f'✅ <b>Вероятность авто-реакций установлена: {chance}%</b>')
             except ValueError:
                 await event.edit('❌ <b>Укажите корректное число</b>')
@@ -180,9 +219,7 @@ class AutoFeaturesModule(ArgentModule):
                 await event.edit('❌ **Использование:** `.autoreact reactions <эмодзи>`')
                 return
             reactions = args[1:]
-            auto_reactions = self.db.get_config('auto_reactions', {})
-            auto_reactions['reactions'] = reactions
-            self.db.set_config('auto_reactions', auto_reactions)
+            self._update_auto_reactions(reactions=reactions)
             await event.edit(f"✅ <b>Реакции обновлены:</b> {' '.join(reactions)}")
 
     async def cmd_autopm(self, event, args):
@@ -253,9 +290,9 @@ class AutoFeaturesModule(ArgentModule):
         except:
             await event.edit('❌ <b>Не удалось найти чат</b>')
             return
-        scheduled = self.db.get_config('scheduled_messages', [])
+        scheduled = await self.db.aget_config('scheduled_messages', [])
         scheduled.append({'time': send_time, 'chat_id': chat_id, 'text': message})
-        self.db.set_config('scheduled_messages', scheduled)
+        await self.db.aset_config('scheduled_messages', scheduled)
         send_date = datetime.fromtimestamp(send_time).strftime('%Y-%m-%d %H:%M:%S')
         await event.edit(f'\n\n⏰ <b>Сообщение запланировано</b>\n\n<b>📅 Время отправки:</b> {send_date}\n\n<b>💬 Чат:</b> <code>{chat_id}</code>\n\n<b>📝 Сообщение:</b> {message}\n\n<b>⚛️ Сообщение будет отправлено автоматически</b>\n\n        ')
 
@@ -294,7 +331,7 @@ class AutoFeaturesModule(ArgentModule):
             await event.edit('✅ <b>AFK режим отключен</b>')
             return
         message = ' '.join(args)
-        afk_data = {'enabled': True, 'message': message, 'since': time.time(), 'last_responses': {}}
+        afk_data = {'enabled': True, 'message': message, 'since': time.time()}
         self.db.set_config('afk_mode', afk_data)
         await event.edit(f"\n\n <b>AFK режим включен</b>\n\n<b>📝 Сообщение:</b> {message}\n\n<b>⏰ Начало:</b> {datetime.now().strftime('%H:%M:%S')}\n\n<b>⚛️ Буду автоматически отвечать на сообщения</b>\n\n        ")
 
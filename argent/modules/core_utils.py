@@ -59,16 +59,19 @@ class CoreUtilsModule(ArgentModule):
 
     async def cmd_setprefix(self, event, args):
         if not args:
-            current_prefix = getattr(self.client, 'command_prefix', '.')
+            current_prefix = self.config.get_str('userbot.command_prefix', '.') if self.config is not None else getattr(self.client, 'command_prefix', '.')
             await event.edit(f'\n🔧 <b>Управление префиксом</b>\n\n<b>📝 Текущий префикс:</b> <code>{current_prefix}</code>\n\n<b>💡 Использование:</b> <code>.setprefix &lt;новый_префикс&gt;</code>\n\n<b>📋 Примеры:</b>\n• <code>.setprefix !</code>\n• <code>.setprefix /</code>\n• <code>.setprefix .</code>\n')
             return
         new_prefix = args[0]
         if len(new_prefix) > 3:
             await event.edit('❌ <b>Ошибка:</b> Префикс не может быть длиннее 3 символов')
             return
-        if not new_prefix.strip():
-            await event.edit('❌ <b>Ошибка:</b> Префикс не может быть пустым')
+        if not new_prefix.strip() or any((char.isspace() for char in new_prefix)):
+            await event.edit('❌ <b>Ошибка:</b> Префикс не может быть пустым или содержать пробелы')
             return
-        self.client.command_prefix = new_prefix
-        await event.edit(f'\n✅ <b>Префикс изменен!</b>\n\n<b>🔧 Новый префикс:</b> <code>{new_prefix}</code>\n\n<b>💡 Пример использования:</b> <code>{new_prefix}help</code>\n\n<b>⚠️ Примечание:</b> Изменения действуют до перезапуска\n')
+        if self.config is not None:
+            self.config.set('userbot.command_prefix', new_prefix)
+        else:
+            self.client.command_prefix = new_prefix
+        await event.edit(f'\n✅ <b>Префикс изменен!</b>\n\n<b>🔧 Новый префикс:</b> <code>{new_prefix}</code>\n\n<b>💡 Пример использования:</b> <code>{new_prefix}help</code>\n\n<b>💾 Примечание:</b> Префикс сохранен в конфигурации\n')
 module = CoreUtilsModule()
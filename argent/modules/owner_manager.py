@@ -2,11 +2,14 @@ import asyncio
 import time
 from datetime import datetime, timedelta
 from argent.core.loader import ArgentModule
+from argent.security.permissions import DEFAULT_OWNER_PERMISSIONS
+from argent.utils.offload import offloader
 
 class OwnerManagerModule(ArgentModule):
     __version__ = '1.0.0'
     __author__ = 'github.com/lonly19/Argent-Userbot'
     __category__ = 'admin'
+    LOG_CAPACITY = 5000
 
     def __init__(self):
         super().__init__()
@@ -19,40 +22,70 @@ class OwnerManagerModule(ArgentModule):
         self.register_command('permissions', self.cmd_permissions, '🔐 Управление правами')
         self.register_command('sudo', self.cmd_sudo, '🔧 Выполнить от имени овнера')
         self.register_command('ownerlog', self.cmd_owner_log, '📊 Лог действий овнеров')
+        self._series = None
+        self._pending_logs = []
+        self._log_flush = None
+        self._log_lock = asyncio.Lock()
+
+    @property
+    def _log(self):
+        if self._series is None:
+            self._series = self.db.timeseries('owner_logs', self.LOG_CAPACITY)
+        return self._series
 
     async def on_load(self):
+        self.db.add_close_hook(self._drain_logs)
         me = await self.client.get_me()
-        owners = self.db.get_config('owners', [])
-        if me.id not in owners:
-            owners.append(me.id)
-            self.db.set_config('owners', owners)
-        if not self.db.get_config('owner_permissions'):
-            self.db.set_config('owner_permissions', {})
-        if not self.db.get_config('owner_logs'):
-            self.db.set_config('owner_logs', [])
+        if not self.permissions.is_owner(me.id):
+            self.permissions.add_owner(me.id)
+        legacy_logs = self.db.get_config('owner_logs')
+        if legacy_logs is not None:
+            await offloader.run(self._log.extend, [(log['action'], {'user_id': log['user_id'], 'target': log.get('target')}, log.get('timestamp')) for log in legacy_logs])
+            self.db.delete('config', 'owner_logs')
+        self.permissions.expire()
+        for user_id in self.permissions.owners:
+            expires = self.permissions.expires_at(user_id)
+            if expires is not None:
+                asyncio.create_task(self._remove_temp_owner_after(user_id, max(0.0, expires - time.time())))
 
     def _is_owner(self, user_id: int) -> bool:
-        owners = self.db.get_config('owners', [])
-        return user_id in owners
+        return self.permissions.is_owner(user_id)
 
     def _is_main_owner(self, user_id: int) -> bool:
-        owners = self.db.get_config('owners', [])
-        return len(owners) > 0 and owners[0] == user_id
+        return self.permissions.is_primary(user_id)
 
     def _has_permission(self, user_id: int, permission: str) -> bool:
-        if self._is_main_owner(user_id):
-            return True
-        permissions = self.db.get_config('owner_permissions', {})
-        user_perms = permissions.get(str(user_id), [])
-        return permission in user_perms or 'all' in user_perms
+        return self.permissions.has_permission(user_id, permission)
+
+    async def on_unload(self):
+        self.db.remove_close_hook(self._drain_logs)
+        await self._flush_logs()
 
     def _log_action(self, user_id: int, action: str, target: str=None):
-        logs = self.db.get_config('owner_logs', [])
-        log_entry = {'user_id': user_id, 'action': action, 'target': target, 'timestamp': time.time(), 'date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-        logs.append(log_entry)
-        if len(logs) > 100:
-            logs = logs[-100:]
-        self.db.set_config('owner_logs', logs)
+        self._pending_logs.append((action, {'user_id': user_id, 'target': target}, time.time()))
+        if self._log_flush is None or self._log_flush.done():
+            try:
+                self._log_flush = asyncio.get_running_loop().create_task(self._flush_logs())
+            except RuntimeError:
+                self._drain_logs()
+
+    def _drain_logs(self):
+        records, self._pending_logs = (self._pending_logs, [])
+        if records:
+            self._log.extend(records)
+
+    async def _flush_logs(self):
+        async with self._log_lock:
+            while self._pending_logs:
+                records, self._pending_logs = (self._pending_logs, [])
+                await offloader.run(self._log.extend, records)
+
+    async def _query_logs(self, **filters):
+        await self._flush_logs()
+        return await offloader.run(self._log.query, **filters)
+
+    def _log_date(self, record: dict) -> str:
+        return datetime.fromtimestamp(record['ts']).strftime('%Y-%m-%d %H:%M:%S')
 
     async def cmd_give_owner(self, event, args):
         if not self._is_owner(event.sender_id):
@@ -63,15 +96,10 @@ class OwnerManagerModule(ArgentModule):
             return
         reply_msg = await event.get_reply_message()
         user_id = reply_msg.sender_id
-        owners = self.db.get_config('owners', [])
-        if user_id in owners:
+        if not self.permissions.add_owner(user_id, DEFAULT_OWNER_PERMISSIONS, granted_by=event.sender_id):
             await event.edit('⚠️ <b>Пользователь уже является овнером</b>')
             return
-        owners.append(user_id)
-        self.db.set_config('owners', owners)
-        permissions = self.db.get_config('owner_permissions', {})
-        permissions[str(user_id)] = ['modules', 'system', 'admin']
-        self.db.set_config('owner_permissions', permissions)
+        owners = self.permissions.owners
         self._log_action(event.sender_id, 'give_owner', str(user_id))
         user_info = await self.utils.get_user_info(user_id)
         username = user_info.get('username', 'Unknown') if user_info else 'Unknown'
@@ -92,7 +120,7 @@ class OwnerManagerModule(ArgentModule):
             return
         reply_msg = await event.get_reply_message()
         user_id = reply_msg.sender_id
-        owners = self.db.get_config('owners', [])
+        owners = self.permissions.owners
         if self._is_main_owner(user_id):
             await event.edit('❌ <b>Нельзя удалить главного овнера</b>')
             return
@@ -102,11 +130,8 @@ class OwnerManagerModule(ArgentModule):
         if user_id not in owners:
             await event.edit('⚠️ <b>Пользователь не является овнером</b>')
             return
-        owners.remove(user_id)
-        self.db.set_config('owners', owners)
-        permissions = self.db.get_config('owner_permissions', {})
-        permissions.pop(str(user_id), None)
-        self.db.set_config('owner_permissions', permissions)
+        self.permissions.remove_owner(user_id)
+        owners = self.permissions.owners
         self._log_action(event.sender_id, 'remove_owner', str(user_id))
         user_info = await self.utils.get_user_info(user_id)
         username = user_info.get('username', 'Unknown') if user_info else 'Unknown'
@@ -114,8 +139,7 @@ class OwnerManagerModule(ArgentModule):
         await event.edit(f'\n\n❌ <b>Овнерка отозвана</b>\n\n<b>👤 Пользователь:</b> {first_name} (@{username})\n\n<b>🆔 ID:</b> <code>{user_id}</code>\n\n<b>⚛️ Статус:</b> Доступ отозван\n\n<b>🔬 Удалил:</b> Вы\n\n<b>📊 Осталось овнеров:</b> <code>{len(owners)}</code>\n\n        ')
 
     async def cmd_owner_list(self, event, args):
-        owners = self.db.get_config('owners', [])
-        permissions = self.db.get_config('owner_permissions', {})
+        owners = self.permissions.owners
         if not owners:
             await event.edit('👥 <b>Список овнеров пуст</b>')
             return
@@ -129,9 +153,9 @@ class OwnerManagerModule(ArgentModule):
                 else:
                     username = 'Unknown'
                     first_name = 'Unknown'
-                user_perms = permissions.get(str(owner_id), [])
+                user_perms = self.permissions.get_permissions(owner_id)
                 perm_text = ', '.join(user_perms) if user_perms else 'Базовые'
-                status = '🔱 Главный' if i == 1 else '👑 Овнер'
+                status = '🔱 Главный' if self._is_main_owner(owner_id) else '👑 Овнер'
                 owners_text += f'\n\n<b>{i}.</b> {first_name} (@{username})\n\n• <b>ID:</b> <code>{owner_id}</code>\n\n• <b>Статус:</b> {status}\n\n• <b>Права:</b> {perm_text}\n\n'
             except Exception as e:
                 owners_text += f'<b>{i}.</b> Unknown User (<code>{owner_id}</code>)\n\n'
@@ -152,19 +176,11 @@ class OwnerManagerModule(ArgentModule):
         if not duration:
             await event.edit('❌ <b>Неверный формат времени</b>\n\nПримеры: 1h, 30m, 2d, 1w')
             return
-        owners = self.db.get_config('owners', [])
-        if user_id in owners:
+        if self._is_owner(user_id):
             await event.edit('⚠️ <b>Пользователь уже является овнером</b>')
             return
-        temp_owners = self.db.get_config('temp_owners', {})
         expire_time = time.time() + duration
-        temp_owners[str(user_id)] = {'expire_time': expire_time, 'granted_by': event.sender_id, 'granted_at': time.time()}
-        self.db.set_config('temp_owners', temp_owners)
-        owners.append(user_id)
-        self.db.set_config('owners', owners)
-        permissions = self.db.get_config('owner_permissions', {})
-        permissions[str(user_id)] = ['modules']
-        self.db.set_config('owner_permissions', permissions)
+        self.permissions.add_owner(user_id, ['modules'], expires_at=expire_time, granted_by=event.sender_id)
         self._log_action(event.sender_id, 'temp_owner', f'{user_id}:{duration_str}')
         asyncio.create_task(self._remove_temp_owner_after(user_id, duration))
         user_info = await self.utils.get_user_info(user_id)
@@ -175,16 +191,10 @@ class OwnerManagerModule(ArgentModule):
 
     async def _remove_temp_owner_after(self, user_id: int, duration: int):
         await asyncio.sleep(duration)
-        owners = self.db.get_config('owners', [])
-        if user_id in owners:
-            owners.remove(user_id)
-            self.db.set_config('owners', owners)
-        permissions = self.db.get_config('owner_permissions', {})
-        permissions.pop(str(user_id), None)
-        self.db.set_config('owner_permissions', permissions)
-        temp_owners = self.db.get_config('temp_owners', {})
-        temp_owners.pop(str(user_id), None)
-        self.db.set_config('temp_owners', temp_owners)
+        expires = self.permissions.expires_at(user_id)
+        if expires is None or expires > time.time():
+            return
+        self.permissions.remove_owner(user_id)
         try:
             await self.client.send_message(user_id, '⏰ <b>Временная овнерка истекла</b>\n\n🔒 Ваш доступ к Argent UserBot отозван')
         except:
@@ -196,23 +206,18 @@ class OwnerManagerModule(ArgentModule):
             return
         reply_msg = await event.get_reply_message()
         user_id = reply_msg.sender_id
-        owners = self.db.get_config('owners', [])
-        if user_id not in owners:
+        if user_id not in self.permissions.owners:
             await event.edit('❌ <b>Пользователь не является овнером</b>')
             return
         user_info = await self.utils.get_user_info(user_id)
         username = user_info.get('username', 'Unknown') if user_info else 'Unknown'
         first_name = user_info.get('first_name', 'Unknown') if user_info else 'Unknown'
-        permissions = self.db.get_config('owner_permissions', {})
-        user_perms = permissions.get(str(user_id), [])
-        temp_owners = self.db.get_config('temp_owners', {})
-        is_temp = str(user_id) in temp_owners
-        logs = self.db.get_config('owner_logs', [])
-        user_logs = [log for log in logs if log['user_id'] == user_id]
-        info_text = f"\n\nℹ️ <b>нформация об овнере</b>\n\n<b>👤 Пользователь:</b> {first_name} (@{username})\n\n<b>🆔 ID:</b> <code>{user_id}</code>\n\n<b>👑 Статус:</b> {('🔱 Главный овнер' if self._is_main_owner(user_id) else '👑 Овнер')}\n\n<b>⏰ Тип:</b> {('Временный' if is_temp else 'Постоянный')}\n\n<b>🔐 Права доступа:</b>\n\n{(chr(10).join([f'• {perm}' for perm in user_perms]) if user_perms else '• Базовые права')}\n\n<b>📊 Статистика:</b>\n\n• <b>Действий выполнено:</b> {len(user_logs)}\n\n• <b>Последняя активность:</b> {(user_logs[-1]['date'] if user_logs else 'Нет данных')}\n\n        "
+        user_perms = self.permissions.get_permissions(user_id)
+        is_temp = self.permissions.is_temporary(user_id)
+        user_logs = [log for log in await self._query_logs() if log['data']['user_id'] == user_id]
+        info_text = f"\n\nℹ️ <b>нформация об овнере</b>\n\n<b>👤 Пользователь:</b> {first_name} (@{username})\n\n<b>🆔 ID:</b> <code>{user_id}</code>\n\n<b>👑 Статус:</b> {('🔱 Главный овнер' if self._is_main_owner(user_id) else '👑 Овнер')}\n\n<b>⏰ Тип:</b> {('Временный' if is_temp else 'Постоянный')}\n\n<b>🔐 Права доступа:</b>\n\n{(chr(10).join([f'• {perm}' for perm in user_perms]) if user_perms else '• Базовые права')}\n\n<b>📊 Статистика:</b>\n\n• <b>Действий выполнено:</b> {len(user_logs)}\n\n• <b>Последняя активность:</b> {(self._log_date(user_logs[-1]) if user_logs else 'Нет данных')}\n\n        "
         if is_temp:
-            temp_info = temp_owners[str(user_id)]
-            expire_time = temp_info['expire_time']
+            expire_time = self.permissions.expires_at(user_id)
             remaining = expire_time - time.time()
             if remaining > 0:
                 info_text += f'\n<b>⏰ Остается времени:</b> {self.utils.format_duration(remaining)}'
@@ -228,9 +233,8 @@ class OwnerManagerModule(ArgentModule):
             await event.edit('\n\n🔐 **Управление правами доступа**\n\n**📋 Доступные права:**\n\n• `all` - все права\n\n• `modules` - управление модулями\n\n• `system` - системные настройки\n\n• `admin` - административные функции\n\n• `owner` - управление овнерами\n\n**🔧 Команды:**\n\n• `.permissions list` - список прав всех овнеров\n\n• `.permissions <user_id> <права>` - установить права\n\n• `.permissions <user_id> remove <право>` - удалить право\n\n**💡 Пример:** `.permissions 123456789 modules system`\n\n            ')
             return
         if args[0] == 'list':
-            permissions = self.db.get_config('owner_permissions', {})
             perm_text = '🔐 <b>Права доступа овнеров</b>\n\n'
-            for user_id, perms in permissions.items():
+            for user_id, perms in self.permissions.all_permissions().items():
                 try:
                     user_info = await self.utils.get_user_info(int(user_id))
                     username = user_info.get('username', 'Unknown') if user_info else 'Unknown'
@@ -246,19 +250,12 @@ class OwnerManagerModule(ArgentModule):
             new_perms = args[1:]
             if 'remove' in new_perms:
                 perm_to_remove = new_perms[new_perms.index('remove') + 1]
-                permissions = self.db.get_config('owner_permissions', {})
-                user_perms = permissions.get(str(user_id), [])
-                if perm_to_remove in user_perms:
-                    user_perms.remove(perm_to_remove)
-                    permissions[str(user_id)] = user_perms
-                    self.db.set_config('owner_permissions', permissions)
+                if self.permissions.revoke_permission(user_id, perm_to_remove):
                     await event.edit(f'✅ <b>Право <code>{perm_to_remove}</code> удалено у пользователя <code>{user_id}</code></b>')
                 else:
                     await event.edit(f'❌ <b>У пользователя нет права <code>{perm_to_remove}</code></b>')
             else:
-                permissions = self.db.get_config('owner_permissions', {})
-                permissions[str(user_id)] = new_perms
-                self.db.set_config('owner_permissions', permissions)
+                self.permissions.set_permissions(user_id, new_perms)
                 await event.edit(f"\n\n✅ <b>Права обновлены</b>\n\n<b>👤 Пользователь:</b> <code>{user_id}</code>\n\n<b>🔐 Новые права:</b> {', '.join(new_perms)}\n\n                ")
         except (ValueError, IndexError):
             await event.edit('❌ <b>Неверный формат команды</b>')
@@ -278,19 +275,19 @@ class OwnerManagerModule(ArgentModule):
         if not self._is_owner(event.sender_id):
             await event.edit('❌ <b>Доступ запрещен:</b> Только овнеры могут просматривать логи')
             return
-        logs = self.db.get_config('owner_logs', [])
-        if not logs:
+        recent_logs = await self._query_logs(limit=10, newest_first=True)
+        if not recent_logs:
             await event.edit('📊 <b>Лог действий пуст</b>')
             return
-        recent_logs = logs[-10:]
         log_text = '📊 <b>Лог действий овнеров</b>\n\n'
-        for log in reversed(recent_logs):
+        for record in recent_logs:
+            log = record['data']
             try:
                 user_info = await self.utils.get_user_info(log['user_id'])
                 username = user_info.get('username', 'Unknown') if user_info else 'Unknown'
-                log_text += f"""\n\n<b>{log['date']}</b>\n\n👤 @{username} ({log['user_id']})\n\n🔧 {log['action']}\n\n{(f"🎯 {log['target']}" if log.get('target') else '')}\n\n"""
+                log_text += f"""\n\n<b>{self._log_date(record)}</b>\n\n👤 @{username} ({log['user_id']})\n\n🔧 {record['type']}\n\n{(f"🎯 {log['target']}" if log.get('target') else '')}\n\n"""
             except:
-                log_text += f"\n\n<b>{log['date']}</b>\n\n👤 Unknown ({log['user_id']})\n\n🔧 {log['action']}\n\n"
-        log_text += f'<b>📈 Всего записей:</b> {len(logs)}'
+                log_text += f"\n\n<b>{self._log_date(record)}</b>\n\n👤 Unknown ({log['user_id']})\n\n🔧 {record['type']}\n\n"
+        log_text += f'<b>📈 Всего записей:</b> {await offloader.run(len, self._log)}'
         await event.edit(log_text)
 module = OwnerManagerModule()
@@ -27,20 +27,22 @@ class SystemCoreModule(ArgentModule):
         self.restart_task = None
 
     async def on_load(self):
+        me = await self.client.get_me()
         if not self.db.get_config('language'):
             self.db.set_config('language', 'ru')
-        me = await self.client.get_me()
-        owners = self.db.get_config('owners', [])
-        if me.id not in owners:
-            owners.append(me.id)
-            self.db.set_config('owners', owners)
+        if not self.permissions.is_owner(me.id):
+            self.permissions.add_owner(me.id)
         restart_hours = self.db.get_config('auto_restart_hours')
         if restart_hours:
             await self._schedule_restart(restart_hours)
 
     def _is_owner(self, user_id: int) -> bool:
-        owners = self.db.get_config('owners', [])
-        return user_id in owners
+        return self.permissions.is_owner(user_id)
+
+    def _flush_state(self):
+        if self.config is not None:
+            self.config.flush()
+        self.db.close()
 
     async def _schedule_restart(self, hours: int):
         if self.restart_task:
@@ -48,12 +50,12 @@ class SystemCoreModule(ArgentModule):
 
         async def restart_timer():
             await asyncio.sleep(hours * 3600)
-            owners = self.db.get_config('owners', [])
-            for owner_id in owners:
+            for owner_id in self.permissions.owners:
                 try:
                     await self.client.send_message(owner_id, '🔄 <b>Автоматический перезапуск</b>\n\nUserBot перезапускается, подождите...')
                 except:
                     pass
+            self._flush_state()
             os.execv(sys.executable, ['python'] + sys.argv)
         self.restart_task = asyncio.create_task(restart_timer())
 
@@ -63,6 +65,7 @@ class SystemCoreModule(ArgentModule):
             return
         await event.edit('🔄 <b>Перезапуск...</b>\n\nUserBot перезапускается...')
         await asyncio.sleep(2)
+        self._flush_state()
         os.execv(sys.executable, ['python'] + sys.argv)
 
     async def cmd_shutdown(self, event, args):
@@ -71,6 +74,7 @@ class SystemCoreModule(ArgentModule):
             return
         await event.edit('⚡ <b>Выключение...</b>\n\nUserBot выключается...')
         await asyncio.sleep(2)
+        self._flush_state()
         sys.exit(0)
 
     async def cmd_addowner(self, event, args):
@@ -82,12 +86,10 @@ class SystemCoreModule(ArgentModule):
             return
         reply_msg = await event.get_reply_message()
         user_id = reply_msg.sender_id
-        owners = self.db.get_config('owners', [])
-        if user_id in owners:
+        if not self.permissions.add_owner(user_id, granted_by=event.sender_id):
             await event.edit('❌ <b>Пользователь уже является овнером</b>')
             return
-        owners.append(user_id)
-        self.db.set_config('owners', owners)
+        owners = self.permissions.owners
         user_info = await self.utils.get_user_info(user_id)
         username = user_info.get('username', 'Unknown') if user_info else 'Unknown'
         await event.edit(f'\n✅ <b>Овнер добавлен</b>\n\n<b>👤 Пользователь:</b> @{username} (<code>{user_id}</code>)\n\n<b>🔐 Права:</b> Полный доступ к боту\n\n<b>📝 Статус:</b> Активен\n\n<b>👥 Всего овнеров:</b> <code>{len(owners)}</code>\n')
@@ -101,21 +103,23 @@ class SystemCoreModule(ArgentModule):
             return
         reply_msg = await event.get_reply_message()
         user_id = reply_msg.sender_id
-        owners = self.db.get_config('owners', [])
+        owners = self.permissions.owners
         if len(owners) == 1 and user_id == event.sender_id:
             await event.edit('❌ <b>Нельзя удалить последнего овнера</b>')
             return
         if user_id not in owners:
             await event.edit('❌ <b>Пользователь не является овнером</b>')
             return
-        owners.remove(user_id)
-        self.db.set_config('owners', owners)
+        if not self.permissions.remove_owner(user_id):
+            await event.edit('❌ <b>Нельзя удалить главного овнера</b>')
+            return
+        owners = self.permissions.owners
         user_info = await self.utils.get_user_info(user_id)
         username = user_info.get('username', 'Unknown') if user_info else 'Unknown'
         await event.edit(f'\n✅ <b>Овнер удален</b>\n\n<b>👤 Пользователь:</b> @{username} (<code>{user_id}</code>)\n\n<b>🔐 Права:</b> Доступ отозван\n\n<b>📝 Статус:</b> Неактивен\n\n<b>👥 Всего овнеров:</b> <code>{len(owners)}</code>\n')
 
     async def cmd_owners(self, event, args):
-        owners = self.db.get_config('owners', [])
+        owners = self.permissions.owners
         if not owners:
             await event.edit('❌ <b>Овнеры не найдены</b>')
             return
@@ -188,14 +192,11 @@ class SystemCoreModule(ArgentModule):
             timestamp = current_time.strftime('%Y%m%d_%H%M%S')
             readable_time = current_time.strftime('%d.%m.%Y в %H:%M:%S')
             backup_data = {'backup_info': {'created_at': readable_time, 'timestamp': timestamp, 'version': '2.0.0', 'userbot': 'Argent UserBot', 'backup_type': 'full_data_backup'}, 'database': {}, 'config_files': {}, 'statistics': {}}
-            if hasattr(self.db, '_json_data'):
-                backup_data['database'] = self.db._json_data.copy()
-            else:
-                backup_data['database'] = {'config': self.db.get_section('config'), 'modules': self.db.get_section('modules'), 'users': self.db.get_section('users'), 'chats': self.db.get_section('chats'), 'misc': self.db.get_section('misc')}
+            backup_data['database'] = self.db.export()
             data_dir = Path('.argent_data')
             if data_dir.exists():
                 for file_path in data_dir.rglob('*'):
-                    if file_path.is_file() and (not file_path.suffix == '.session'):
+                    if file_path.is_file() and (not file_path.suffix == '.session') and ('shards' not in file_path.relative_to(data_dir).parts):
                         try:
                             relative_path = str(file_path.relative_to(data_dir))
                             if file_path.suffix == '.json':
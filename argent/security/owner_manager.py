@@ -1,10 +1,12 @@
 import os
-import json
 import logging
 import time
 import threading
-from typing import Optional, List
+from typing import Callable, FrozenSet, Optional, List
 from pathlib import Path
+from contextlib import contextmanager
+from ..storage.codec import atomic_write, json_codec
+from ..storage.filelock import FileLock, FileStamp
 logger = logging.getLogger(__name__)
 
 class OwnerManager:
@@ -14,54 +16,77 @@ class OwnerManager:
         self.config_dir.mkdir(exist_ok=True)
         self.config_file = self.config_dir / 'owner_config.json'
         self._lock = threading.Lock()
-        self._config = self._load_config()
+        self._file_lock = FileLock(self.config_file)
+        self._stamp = FileStamp(self.config_file)
+        self._owner_set: FrozenSet[int] = frozenset()
+        self._subscribers: List[Callable[[], None]] = []
+        with self._file_lock:
+            self._set_config(self._load_config())
+
+    def _set_config(self, config: dict):
+        self._config = config
+        self._owner_set = frozenset(config.get('owners') or ())
+
+    def _refresh(self, force: bool=False) -> bool:
+        if not self._stamp.changed(force):
+            return False
+        self._stamp.update()
+        self._set_config(self._load_config())
+        self._notify()
+        return True
+
+    def refresh(self) -> bool:
+        return self._refresh()
+
+    def subscribe(self, callback: Callable[[], None]):
+        if callback not in self._subscribers:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable[[], None]):
+        self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def _notify(self):
+        for callback in self._subscribers:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f'❌ Ошибка обработчика изменения владельцев: {e}')
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock, self._file_lock:
+            self._refresh(force=True)
+            yield self._config
 
     def _load_config(self) -> dict:
-        if not self.config_file.exists():
+        try:
+            content = self.config_file.read_bytes().strip()
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.error(f'Ошибка загрузки конфигурации владельцев: {e}')
+            return {}
+        if not content:
             return {}
-        for attempt in range(3):
+        try:
+            return json_codec().loads(content)
+        except ValueError as e:
+            logger.error(f'Ошибка JSON в конфигурации владельцев: {e}')
             try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    content = f.read().strip()
-                    if not content:
-                        if attempt == 0:
-                            time.sleep(0.1)
-                            continue
-                        else:
-                            return {}
-                    config = json.loads(content)
-                    return config
-            except json.JSONDecodeError as e:
-                logger.error(f'Ошибка JSON в конфигурации владельцев (попытка {attempt + 1}): {e}')
-                if attempt == 2:
-                    try:
-                        self.config_file.unlink()
-                    except:
-                        pass
-                    return {}
-                time.sleep(0.1)
-            except Exception as e:
-                logger.error(f'Ошибка загрузки конфигурации владельцев (попытка {attempt + 1}): {e}')
-                if attempt == 2:
-                    return {}
-                time.sleep(0.1)
-        return {}
+                self.config_file.replace(self.config_file.with_name(f'{self.config_file.name}.corrupt-{int(time.time())}'))
+            except OSError:
+                pass
+            return {}
 
     def _save_config(self) -> None:
         try:
             self.config_dir.mkdir(exist_ok=True)
-            temp_file = self.config_file.with_suffix('.tmp')
-            with open(temp_file, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, indent=2, ensure_ascii=False)
-            temp_file.replace(self.config_file)
+            atomic_write(self.config_file, json_codec().dumps(self._config))
+            self._stamp.update()
         except Exception as e:
             logger.error(f'Ошибка сохранения конфигурации владельцев: {e}')
-            try:
-                temp_file = self.config_file.with_suffix('.tmp')
-                if temp_file.exists():
-                    temp_file.unlink()
-            except:
-                pass
+        self._set_config(self._config)
+        self._notify()
 
     def set_primary_owner(self, user_id: int) -> bool:
         if not isinstance(user_id, int) or user_id <= 0:
@@ -70,8 +95,7 @@ class OwnerManager:
         if user_id < 1000:
             logger.error(f'Подозрительно маленький user_id: {user_id}')
             return False
-        with self._lock:
-            self._config = self._load_config()
+        with self._transaction():
             if self.has_primary_owner():
                 logger.warning(f'Попытка установить основного владельца {user_id}, но он уже существует')
                 return False
@@ -82,26 +106,29 @@ class OwnerManager:
             return True
 
     def has_primary_owner(self) -> bool:
+        self._refresh()
         return 'primary_owner' in self._config and self._config['primary_owner'] is not None
 
     def get_primary_owner(self) -> Optional[int]:
+        self._refresh()
         return self._config.get('primary_owner')
 
     def is_owner(self, user_id: int) -> bool:
-        owners = self._config.get('owners', [])
-        return user_id in owners
+        self._refresh()
+        return user_id in self._owner_set
 
     def add_owner(self, user_id: int, added_by: int) -> bool:
         if not self.is_owner(added_by):
             logger.warning(f'Пользователь {added_by} попытался добавить владельца {user_id} без прав')
             return False
-        owners = self._config.get('owners', [])
-        if user_id not in owners:
-            owners.append(user_id)
-            self._config['owners'] = owners
-            self._save_config()
-            return True
-        return False
+        with self._transaction():
+            owners = self._config.get('owners', [])
+            if user_id not in owners:
+                owners.append(user_id)
+                self._config['owners'] = owners
+                self._save_config()
+                return True
+            return False
 
     def remove_owner(self, user_id: int, removed_by: int) -> bool:
         if user_id == self.get_primary_owner():
@@ -110,24 +137,40 @@ class OwnerManager:
         if not self.is_owner(removed_by):
             logger.warning(f'Пользователь {removed_by} попытался удалить владельца {user_id} без прав')
             return False
-        owners = self._config.get('owners', [])
-        if user_id in owners:
-            owners.remove(user_id)
+        with self._transaction():
+            owners = self._config.get('owners', [])
+            if user_id in owners:
+                owners.remove(user_id)
+                self._config['owners'] = owners
+                self._save_config()
+                return True
+            return False
+
+    def set_owners(self, owners: List[int]) -> bool:
+        with self._transaction():
+            primary = self._config.get('primary_owner')
+            owners = list(dict.fromkeys(([primary] if primary else []) + list(owners)))
+            if owners == self._config.get('owners', []):
+                return False
             self._config['owners'] = owners
             self._save_config()
             return True
-        return False
 
     def get_all_owners(self) -> List[int]:
+        self._refresh()
         return self._config.get('owners', [])
 
     def is_setup_completed(self) -> bool:
+        self._refresh()
         return self._config.get('setup_completed', False)
 
     def reset_config(self) -> None:
-        self._config = {}
-        if self.config_file.exists():
-            self.config_file.unlink()
+        with self._transaction():
+            self._set_config({})
+            if self.config_file.exists():
+                self.config_file.unlink()
+            self._stamp.update()
+        self._notify()
 
     def get_config_info(self) -> dict:
         return {'has_primary_owner': self.has_primary_owner(), 'primary_owner': self.get_primary_owner(), 'total_owners': len(self.get_all_owners()), 'setup_completed': self.is_setup_completed(), 'config_file_exists': self.config_file.exists()}
@@ -0,0 +1,226 @@
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from .owner_manager import OwnerManager
+logger = logging.getLogger(__name__)
+ALL = 'all'
+PERMISSIONS = ('modules', 'system', 'admin', 'owner')
+DEFAULT_OWNER_PERMISSIONS = ('modules', 'system', 'admin')
+_DB_KEYS = ('owners', 'owner_permissions', 'temp_owners')
+
+def _user_id(value: Any) -> Optional[int]:
+    try:
+        user_id = int(value)
+    except (TypeError, ValueError):
+        return None
+    return user_id if user_id > 0 else None
+
+class PermissionEngine:
+    POLL_INTERVAL = 0.25
+
+    def __init__(self, owner_manager: Optional[OwnerManager]=None, db=None):
+        self.owner_manager = owner_manager or OwnerManager()
+        self.db = db
+        self._lock = threading.RLock()
+        self._bits: Dict[str, int] = {ALL: 1}
+        for name in PERMISSIONS:
+            self._bit(name)
+        self._order: Tuple[int, ...] = ()
+        self._owners: FrozenSet[int] = frozenset()
+        self._primary: Optional[int] = None
+        self._masks: Dict[int, int] = {}
+        self._expiry: Dict[int, float] = {}
+        self._subscribers: List[Callable] = []
+        self._next_poll = 0.0
+        self.owner_manager.subscribe(self._rebuild)
+        if db is not None:
+            for key in _DB_KEYS:
+                db.subscribe('config', key, self._on_db_changed)
+        self._rebuild()
+
+    def close(self):
+        self.owner_manager.unsubscribe(self._rebuild)
+        if self.db is not None:
+            for key in _DB_KEYS:
+                self.db.unsubscribe('config', key, self._on_db_changed)
+
+    def _bit(self, name: str) -> int:
+        bit = self._bits.get(name)
+        if bit is None:
+            bit = self._bits[name] = 1 << len(self._bits)
+        return bit
+
+    def mask(self, permissions: Iterable[str]) -> int:
+        mask = 0
+        for name in permissions or ():
+            if isinstance(name, str) and name:
+                mask |= self._bit(name)
+        return mask
+
+    def names(self, mask: int) -> List[str]:
+        return [name for name, bit in self._bits.items() if mask & bit]
+
+    def _db_config(self, key: str, default: Any) -> Any:
+        if self.db is None:
+            return default
+        value = self.db.get_config(key, default)
+        return value if isinstance(value, type(default)) else default
+
+    def _on_db_changed(self, section: str, key: str, value: Any):
+        self._rebuild()
+
+    def _rebuild(self):
+        with self._lock:
+            primary = _user_id(self.owner_manager.get_primary_owner())
+            candidates = ([primary] if primary else []) + list(self.owner_manager.get_all_owners()) + list(self._db_config('owners', []))
+            order = tuple(dict.fromkeys((user_id for user_id in map(_user_id, candidates) if user_id)))
+            masks = {}
+            for key, permissions in self._db_config('owner_permissions', {}).items():
+                user_id = _user_id(key)
+                if user_id and isinstance(permissions, list):
+                    masks[user_id] = self.mask(permissions)
+            expiry = {}
+            for key, info in self._db_config('temp_owners', {}).items():
+                user_id = _user_id(key)
+                if user_id and isinstance(info, dict) and isinstance(info.get('expire_time'), (int, float)):
+                    expiry[user_id] = float(info['expire_time'])
+            primary = primary or (order[0] if order else None)
+            before = self._snapshot()
+            self._order, self._owners, self._primary, self._masks, self._expiry = (order, frozenset(order), primary, masks, expiry)
+            after = self._snapshot()
+        if before != after and self._subscribers:
+            for user_id in sorted(before.keys() | after.keys()):
+                if before.get(user_id) != after.get(user_id):
+                    self._emit(user_id, before.get(user_id), after.get(user_id))
+
+    def _snapshot(self) -> Dict[int, int]:
+        return {user_id: -1 if user_id == self._primary else self._masks.get(user_id, 0) for user_id in self._order}
+
+    def subscribe(self, callback: Callable):
+        if callback not in self._subscribers:
+            self._subscribers = self._subscribers + [callback]
+
+    def unsubscribe(self, callback: Callable):
+        self._subscribers = [c for c in self._subscribers if c != callback]
+
+    def _emit(self, user_id: int, before: Optional[int], after: Optional[int]):
+        for callback in self._subscribers:
+            try:
+                callback(user_id, before, after)
+            except Exception as e:
+                logger.error(f'❌ Ошибка обработчика прав доступа: {e}')
+
+    def _poll(self):
+        now = time.monotonic()
+        if now >= self._next_poll:
+            self._next_poll = now + self.POLL_INTERVAL
+            self.owner_manager.refresh()
+
+    @property
+    def owners(self) -> Tuple[int, ...]:
+        self._poll()
+        return self._order
+
+    @property
+    def primary_owner(self) -> Optional[int]:
+        self._poll()
+        return self._primary
+
+    def is_owner(self, user_id: int) -> bool:
+        self._poll()
+        if user_id not in self._owners:
+            return False
+        expires = self._expiry.get(user_id)
+        return expires is None or expires > time.time()
+
+    def is_primary(self, user_id: int) -> bool:
+        self._poll()
+        return user_id is not None and user_id == self._primary
+
+    def is_temporary(self, user_id: int) -> bool:
+        return user_id in self._expiry
+
+    def expires_at(self, user_id: int) -> Optional[float]:
+        return self._expiry.get(user_id)
+
+    def has_permission(self, user_id: int, permission: str) -> bool:
+        if not self.is_owner(user_id):
+            return False
+        if user_id == self._primary:
+            return True
+        return bool(self._masks.get(user_id, 0) & (self._bits.get(permission, 0) | 1))
+
+    def get_permissions(self, user_id: int) -> List[str]:
+        return self.names(self._masks.get(user_id, 0))
+
+    def all_permissions(self) -> Dict[int, List[str]]:
+        return {user_id: self.names(mask) for user_id, mask in self._masks.items()}
+
+    def claim_primary(self, user_id: int) -> bool:
+        if not self.owner_manager.set_primary_owner(user_id):
+            return False
+        self._store(owners=[user_id] + [owner for owner in self._order if owner != user_id])
+        return True
+
+    def add_owner(self, user_id: int, permissions: Optional[Iterable[str]]=None, expires_at: Optional[float]=None, granted_by: Optional[int]=None) -> bool:
+        if user_id in self._owners and user_id not in self._expiry:
+            return False
+        masks = dict(self._masks)
+        if permissions is not None:
+            masks[user_id] = self.mask(permissions)
+        temp = self._temp_records()
+        temp.pop(str(user_id), None)
+        if expires_at is not None:
+            temp[str(user_id)] = {'expire_time': expires_at, 'granted_by': granted_by, 'granted_at': time.time()}
+        self._store(owners=list(self._order) + [user_id], masks=masks, temp=temp)
+        return True
+
+    def remove_owner(self, user_id: int) -> bool:
+        if user_id == self._primary or user_id not in self._owners:
+            return False
+        masks = {key: value for key, value in self._masks.items() if key != user_id}
+        temp = self._temp_records()
+        temp.pop(str(user_id), None)
+        self._store(owners=[owner for owner in self._order if owner != user_id], masks=masks, temp=temp)
+        return True
+
+    def set_permissions(self, user_id: int, permissions: Iterable[str]):
+        masks = dict(self._masks)
+        masks[user_id] = self.mask(permissions)
+        self._store(masks=masks)
+
+    def revoke_permission(self, user_id: int, permission: str) -> bool:
+        bit = self._bits.get(permission, 0)
+        mask = self._masks.get(user_id, 0)
+        if not mask & bit:
+            return False
+        masks = dict(self._masks)
+        masks[user_id] = mask & ~bit
+        self._store(masks=masks)
+        return True
+
+    def expire(self) -> List[int]:
+        now = time.time()
+        expired = [user_id for user_id, expires in self._expiry.items() if expires <= now]
+        for user_id in expired:
+            self.remove_owner(user_id)
+        return expired
+
+    def _temp_records(self) -> Dict[str, Any]:
+        stored = self._db_config('temp_owners', {})
+        return {str(user_id): stored.get(str(user_id)) or {'expire_time': expires} for user_id, expires in self._expiry.items()}
+
+    def _store(self, owners: Optional[List[int]]=None, masks: Optional[Dict[int, int]]=None, temp: Optional[Dict[str, Any]]=None):
+        if self.db is not None:
+            with self.db.batch():
+                if owners is not None:
+                    self.db.set_config('owners', list(dict.fromkeys(owners)))
+                if masks is not None:
+                    self.db.set_config('owner_permissions', {str(user_id): self.names(mask) for user_id, mask in masks.items()})
+                if temp is not None:
+                    self.db.set_config('temp_owners', temp)
+        if owners is not None:
+            expiry = temp if temp is not None else self._temp_records()
+            self.owner_manager.set_owners([user_id for user_id in owners if str(user_id) not in expiry])
+        self._rebuild()
\ No newline at end of file
@@ -0,0 +1,104 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Union
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+logger = logging.getLogger(__name__)
+
+class JsonCodec:
+    name = 'json'
+    suffix = '.json'
+    binary = False
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+class OrjsonCodec(JsonCodec):
+    name = 'orjson'
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+class MsgpackCodec:
+    name = 'msgpack'
+    suffix = '.msgpack'
+    binary = True
+
+    def dumps(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def loads(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+_CODECS = {'json': (JsonCodec, lambda: True), 'orjson': (OrjsonCodec, lambda: orjson is not None), 'msgpack': (MsgpackCodec, lambda: msgpack is not None)}
+_instances: Dict[str, Any] = {}
+
+def available_codecs() -> List[str]:
+    return [name for name, (_, available) in _CODECS.items() if available()]
+
+def get_codec(name: str='auto'):
+    if name == 'auto':
+        name = 'orjson' if orjson is not None else 'json'
+    if name not in _CODECS:
+        logger.warning(f'⚠️ Unknown codec {name!r}, falling back to json')
+        name = 'json'
+    elif not _CODECS[name][1]():
+        logger.warning(f'⚠️ Codec {name!r} is not installed, falling back to json')
+        name = 'orjson' if orjson is not None else 'json'
+    codec = _instances.get(name)
+    if codec is None:
+        codec = _instances[name] = _CODECS[name][0]()
+    return codec
+
+def json_codec():
+    return get_codec('auto')
+
+def codec_for_path(path: Path):
+    return get_codec('msgpack') if Path(path).suffix == MsgpackCodec.suffix else json_codec()
+
+def dumps_pretty(obj: Any) -> str:
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=str)
+
+def atomic_write(path: Path, payload: Union[bytes, str]) -> int:
+    path = Path(path)
+    if isinstance(payload, str):
+        payload = payload.encode('utf-8')
+    temp_path = path.with_suffix(path.suffix + '.tmp')
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return len(payload)
+    except Exception:
+        try:
+            if temp_path.exists():
+                temp_path.unlink()
+        except Exception:
+            pass
+        raise
+
+def read_file(path: Path, codec=None) -> Any:
+    codec = codec or codec_for_path(path)
+    with open(path, 'rb') as f:
+        return codec.loads(f.read())
+
+def write_file(path: Path, obj: Any, codec=None, pretty: bool=False) -> int:
+    if pretty:
+        return atomic_write(path, dumps_pretty(obj))
+    codec = codec or codec_for_path(path)
+    return atomic_write(path, codec.dumps(obj))
\ No newline at end of file
@@ -1,107 +1,1050 @@
-import json
+import asyncio
+import copy
 import logging
-from typing import Any, Dict, Optional, List
+import os
+import sqlite3
+import time
+from typing import Any, Callable, Dict, Optional, List, Tuple
+from collections.abc import Mapping
+from contextlib import contextmanager
 from pathlib import Path
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from .codec import atomic_write, dumps_pretty, get_codec, json_codec
+from .filelock import FileLock, FileStamp
+from .ttl import TimerWheel
+from .shards import ShardedSection, field_count
+from .records import RecordSection
+from .timeseries import TimeSeries, TimeSeriesStore
 logger = logging.getLogger(__name__)
 
+_EXPIRES = '_expires'
+_SHARDED_SECTIONS = ('users', 'chats')
+_MISSING = object()
+_TTL_SEP = '\x1f'
+_LEGACY_MODULE_KEYS = {'api_limiter_config': ('api_limiter', 'config'), 'api_limiter_enabled': ('api_limiter', 'enabled'), 'api_limiter_last_trigger': ('api_limiter', 'last_trigger')}
+
+def _default_sections() -> Dict[str, Dict]:
+    return {'config': {}, 'modules': {}, 'users': {}, 'chats': {}, 'misc': {}}
+
+def _plain(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {section: entries.to_dict() if isinstance(entries, RecordSection) else entries for section, entries in data.items()}
+
+class _JsonBackend:
+    name = 'json'
+    append_only = False
+    incremental = False
+
+    def __init__(self, data_dir: Path, codec=None):
+        self.codec = codec or json_codec()
+        self.path = data_dir / ('database' + self.codec.suffix)
+        self.legacy_path = data_dir / 'database.json'
+        self.journal_path = data_dir / 'database.journal'
+        self.needs_fold = False
+        self._upconvert = False
+        self._size = 0
+        self._stamp = FileStamp(self.path, self.journal_path)
+
+    def _read_snapshot(self) -> Optional[Dict[str, Any]]:
+        path, codec = self.path, self.codec
+        if not path.exists() and path != self.legacy_path and self.legacy_path.exists():
+            path, codec = self.legacy_path, json_codec()
+            self._upconvert = True
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            data = codec.loads(raw)
+            self._size = len(raw)
+            if not codec.binary and raw[:2] == b'{\n':
+                self._upconvert = True
+            return data
+        except ValueError as e:
+            broken = path.with_name(f'{path.name}.corrupt-{int(time.time())}')
+            os.replace(path, broken)
+            logger.error(f'❌ JSON DB is corrupted, moved to {broken.name}: {e}')
+            self._upconvert = False
+            return None
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        data = self._read_snapshot()
+        if self.journal_path.exists() and self.journal_path.stat().st_size:
+            data = data if data is not None else _default_sections()
+            replayed = self._replay(data)
+            self.needs_fold = self.name != 'journal' and replayed > 0
+        if self._upconvert:
+            logger.info(f'🔄 Up-converting database snapshot to {self.codec.name}')
+        return data
+
+    def _replay(self, data: Dict[str, Any]) -> int:
+        replayed = 0
+        codec = json_codec()
+        with open(self.journal_path, 'rb') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    op, section, key, *value = codec.loads(line)
+                except ValueError:
+                    logger.warning(f'⚠️ Skipping torn journal record at line {line_no}')
+                    continue
+                if op == 's':
+                    data.setdefault(section, {})[key] = value[0]
+                elif op == 'd':
+                    data.get(section, {}).pop(key, None)
+                replayed += 1
+        return replayed
+
+    def encode(self, data: Dict[str, Any], changes: Dict[Tuple[str, str], None]) -> bytes:
+        return self.encode_snapshot(data)
+
+    def encode_snapshot(self, data: Dict[str, Any]) -> bytes:
+        return self.codec.dumps(_plain(data))
+
+    def write(self, payload: bytes):
+        self._size = atomic_write(self.path, payload)
+        self._finish_upconvert()
+
+    def write_snapshot(self, payload: bytes):
+        self._size = atomic_write(self.path, payload)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self.needs_fold = False
+        self._finish_upconvert()
+
+    def _finish_upconvert(self):
+        if not self._upconvert:
+            return
+        self._upconvert = False
+        if self.path != self.legacy_path and self.legacy_path.exists():
+            os.replace(self.legacy_path, self.legacy_path.with_name(self.legacy_path.name + '.migrated'))
+        logger.info(f'✅ Database snapshot stored as {self.codec.name}')
+
+    def needs_compaction(self) -> bool:
+        return self.needs_fold or self._upconvert
+
+    def state(self) -> Tuple:
+        return self._stamp.current()
+
+    def size(self) -> int:
+        return self._size
+
+    def close(self):
+        pass
+
+class _JournalBackend(_JsonBackend):
+    name = 'journal'
+    append_only = True
+    incremental = True
+    COMPACT_MIN_BYTES = 262144
+
+    def __init__(self, data_dir: Path, codec=None):
+        super().__init__(data_dir, codec)
+        self._journal = None
+        self._journal_size = 0
+        self._record_codec = json_codec()
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        data = super().load()
+        self._journal_size = self.journal_path.stat().st_size if self.journal_path.exists() else 0
+        return data
+
+    def encode(self, data: Dict[str, Any], changes: Dict[Tuple[str, str], None]) -> bytes:
+        lines = []
+        for section, key in changes:
+            entries = data.get(section, {})
+            if key in entries:
+                record = ['s', section, key, entries[key]]
+            else:
+                record = ['d', section, key]
+            lines.append(self._record_codec.dumps(record))
+        return b'\n'.join(lines) + b'\n'
+
+    def write(self, payload: bytes):
+        if self._journal is None:
+            self._journal = open(self.journal_path, 'ab+')
+            end = self._journal.seek(0, os.SEEK_END)
+            if end:
+                self._journal.seek(end - 1)
+                if self._journal.read(1) != b'\n':
+                    payload = b'\n' + payload
+        self._journal.write(payload)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self._journal_size += len(payload)
+
+    def write_snapshot(self, payload: bytes):
+        self._size = atomic_write(self.path, payload)
+        self.close()
+        with open(self.journal_path, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        self._journal_size = 0
+        self._finish_upconvert()
+
+    def journal_size(self) -> int:
+        return self._journal_size
+
+    def needs_compaction(self) -> bool:
+        return self._upconvert or self._journal_size > max(self.COMPACT_MIN_BYTES, self._size)
+
+    def size(self) -> int:
+        return self._size + self._journal_size
+
+    def close(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+class _SQLiteBackend:
+    name = 'sqlite'
+    append_only = False
+    incremental = True
+
+    def __init__(self, data_dir: Path, codec=None):
+        self.data_dir = data_dir
+        self.codec = codec
+        self._values = json_codec()
+        self.path = data_dir / 'database.sqlite'
+        self._conn: Optional[sqlite3.Connection] = None
+        self._sql: Dict[str, Tuple[str, str, str]] = {}
+        self._legacy: Optional[_JsonBackend] = None
+
+    def _connect(self):
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, cached_statements=256)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute('CREATE TABLE IF NOT EXISTS sections (name TEXT PRIMARY KEY) WITHOUT ROWID')
+
+    def _statements(self, section: str) -> Tuple[str, str, str]:
+        sql = self._sql.get(section)
+        if sql is None:
+            table = '"s_' + section.replace('"', '""') + '"'
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY, value TEXT NOT NULL) WITHOUT ROWID')
+            self._conn.execute('INSERT OR IGNORE INTO sections (name) VALUES (?)', (section,))
+            sql = (f'INSERT OR REPLACE INTO {table} (key, value) VALUES (?, ?)', f'DELETE FROM {table} WHERE key = ?', f'DELETE FROM {table}')
+            self._sql[section] = sql
+        return sql
+
+    def load(self) -> Optional[Dict[str, Any]]:
+        fresh = not self.path.exists()
+        if self._conn is None:
+            self._connect()
+        if fresh:
+            legacy = _JsonBackend(self.data_dir, self.codec)
+            data = legacy.load()
+            if data is not None:
+                self._legacy = legacy
+                logger.info('🔄 Migrating database.json to SQLite storage')
+            return data
+        data = {}
+        for (section,) in self._conn.execute('SELECT name FROM sections').fetchall():
+            table = '"s_' + section.replace('"', '""') + '"'
+            data[section] = {key: self._values.loads(value) for key, value in self._conn.execute(f'SELECT key, value FROM {table}')}
+        return data
+
+    def encode(self, data: Dict[str, Any], changes: Dict[Tuple[str, str], None]) -> List[Tuple[str, str, Optional[str]]]:
+        ops = []
+        for section, key in changes:
+            entries = data.get(section, {})
+            value = self._values.dumps(entries[key]).decode('utf-8') if key in entries else None
+            ops.append((section, key, value))
+        return ops
+
+    def encode_snapshot(self, data: Dict[str, Any]) -> List[Tuple[str, Optional[str], Optional[str]]]:
+        ops = []
+        for section, entries in data.items():
+            ops.append((section, None, None))
+            ops.extend(((section, key, self._values.dumps(value).decode('utf-8')) for key, value in entries.items()))
+        return ops
+
+    def write(self, ops: List[Tuple[str, Optional[str], Optional[str]]]):
+        conn = self._conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for section, key, value in ops:
+                upsert, delete, clear = self._statements(section)
+                if key is None:
+                    conn.execute(clear)
+                elif value is None:
+                    conn.execute(delete, (key,))
+                else:
+                    conn.execute(upsert, (key, value))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def write_snapshot(self, ops: List[Tuple[str, Optional[str], Optional[str]]]):
+        self.write(ops)
+        if self._legacy is not None:
+            for path in {self._legacy.path, self._legacy.legacy_path, self._legacy.journal_path}:
+                if path.exists():
+                    os.replace(path, path.with_name(path.name + '.migrated'))
+            self._legacy = None
+            logger.info('✅ database.json migrated to SQLite')
+
+    def needs_compaction(self) -> bool:
+        return self._legacy is not None
+
+    def state(self) -> Optional[int]:
+        return self._conn.execute('PRAGMA data_version').fetchone()[0] if self._conn is not None else None
+
+    def size(self) -> int:
+        return sum((p.stat().st_size for p in (self.path, self.path.with_name(self.path.name + '-wal')) if p.exists()))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+_BACKENDS = {'json': _JsonBackend, 'journal': _JournalBackend, 'sqlite': _SQLiteBackend}
+
+class _View(Mapping):
+    __slots__ = ('_db', '_section', '_key')
+
+    def __init__(self, db: 'ArgentDatabase', section: str, key: Optional[str]=None):
+        self._db = db
+        self._section = section
+        self._key = key
+
+    def _target(self) -> Mapping:
+        self._db._sync()
+        entries = self._db._json_data.get(self._section, {})
+        if self._key is None:
+            return entries
+        value = entries.get(self._key)
+        return value if isinstance(value, dict) else {}
+
+    def __getitem__(self, key: str) -> Any:
+        return self._target()[key]
+
+    def __iter__(self):
+        return iter(self._target())
+
+    def __len__(self) -> int:
+        return len(self._target())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._target()
+
+    def __repr__(self) -> str:
+        return f'<view {self._section}' + (f'.{self._key}>' if self._key is not None else '>')
+
 class ArgentDatabase:
 
-    def __init__(self, data_dir: str='.argent_data'):
+    SHARD_IDLE_SECONDS = 300
+    RELOAD_INTERVAL = 0.25
+
+    def __init__(self, data_dir: str='.argent_data', write_behind: bool=False, flush_interval: float=2.0, storage: str='json', codec: str='auto', shards: int=0):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
-        self.json_db_path = self.data_dir / 'database.json'
+        if storage not in _BACKENDS:
+            logger.warning(f'⚠️ Unknown DB storage {storage!r}, falling back to json')
+            storage = 'json'
+        self.storage = storage
+        self.codec = get_codec(codec)
+        self._backend = _BACKENDS[storage](self.data_dir, self.codec)
+        self.json_db_path = self._backend.path
+        self.shards = max(0, int(shards)) if storage != 'sqlite' else 0
+        self._shard_root = self.data_dir / 'shards'
+        self._shards: Dict[str, ShardedSection] = {}
         self._json_data = {}
         self._lock = threading.RLock()
-        self._init_json_db()
+        self._io_lock = threading.Lock()
+        self._file_lock = FileLock(self.data_dir / 'database')
+        self._seen_state: Optional[Tuple] = None
+        self._state_checked = 0.0
+        self._reload_pending = False
+        self._reloaded: List[Tuple[str, str]] = []
+        self._changes: Dict[Tuple[str, str], None] = {}
+        self._versions: Dict[Tuple[str, str], int] = {}
+        self._key_fields: Dict[Tuple[str, str], int] = {}
+        self._section_fields: Dict[str, int] = {}
+        self._subscribers: Dict[Tuple[str, Optional[str]], List[Callable]] = {}
+        self._close_hooks: List[Callable] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self.write_behind = write_behind
+        self.flush_interval = max(0.1, float(flush_interval))
+        self._stop_event = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._queue_depth = 0
+        self._expiry = TimerWheel()
+        self._deadlines: Dict[Tuple[str, str], float] = {}
+        self._batch_depth = 0
+        self._batch_owner: Optional[int] = None
+        self._undo: Dict[Tuple[str, str], Any] = {}
+        self._batch_keys: Dict[Tuple[str, str], None] = {}
+        self._timeseries: Optional[TimeSeriesStore] = None
+        with self._file_lock:
+            self._init_json_db()
+        self._schedule_deadlines()
+        if self._deadlines:
+            self.flush()
+        if self.write_behind or self.storage == 'journal' or self._deadlines or self._shards:
+            self._start_flusher()
+
+    @property
+    def _dirty(self) -> bool:
+        return bool(self._changes) or any((shard.dirty for shard in self._shards.values()))
 
     def _init_json_db(self):
         try:
-            if self.json_db_path.exists():
-                with open(self.json_db_path, 'r', encoding='utf-8') as f:
-                    self._json_data = json.load(f)
+            data = self._backend.load()
+            if data is None:
+                self._json_data = _default_sections()
+                self._attach_shards()
+                self._wrap_records(self._json_data)
+                self._seen_state = self._state()
+                self.compact()
             else:
-                self._json_data = {'config': {}, 'modules': {}, 'users': {}, 'chats': {}, 'misc': {}}
-                self._save_json_db()
+                self._json_data = data
+                migrated = self._migrate_module_keys()
+                resharded = self._attach_shards()
+                dropped = self._wrap_records(self._json_data)
+                self._rebuild_counters()
+                self._seen_state = self._state()
+                if dropped:
+                    logger.info(f'🧹 Dropped {len(dropped)} empty user/chat records')
+                if migrated or resharded or dropped or self._backend.needs_compaction():
+                    self.compact()
+                if resharded and (not self.shards) and (not self._changes):
+                    os.replace(self._shard_root, self._shard_root.with_name(f'shards.migrated-{int(time.time())}'))
+                    logger.info('✅ Sharded users/chats merged back into the main database')
         except Exception as e:
             logger.error(f'❌ JSON DB init error: {e}')
-            self._json_data = {'config': {}, 'modules': {}, 'users': {}, 'chats': {}, 'misc': {}}
+            self._json_data = _default_sections()
+            self._shards = {}
+            self._wrap_records(self._json_data)
+            self._rebuild_counters()
+
+    def _attach_shards(self) -> bool:
+        if not self.shards:
+            if not self._shard_root.exists():
+                return False
+            for name in _SHARDED_SECTIONS:
+                self._json_data.setdefault(name, {}).update(ShardedSection.read_all(self._shard_root, name))
+            return True
+        moved = False
+        for name in _SHARDED_SECTIONS:
+            shard = ShardedSection(self._shard_root, name, self.shards, self.codec)
+            legacy = self._json_data.get(name)
+            if legacy:
+                shard.load_from(legacy)
+                moved = True
+                logger.info(f'🔄 Moved {len(legacy)} {name} entries into {self.shards} shard buckets')
+            self._json_data[name] = shard
+            self._shards[name] = shard
+        return moved
+
+    def _wrap_records(self, data: Dict[str, Any]) -> List[Tuple[str, str]]:
+        dropped = []
+        for name in _SHARDED_SECTIONS:
+            entries = data.get(name)
+            if name in self._shards or isinstance(entries, RecordSection):
+                continue
+            section = data[name] = RecordSection(entries)
+            for key in section.dropped:
+                self._changes[name, key] = None
+                dropped.append((name, key))
+        return dropped
+
+    def _main_data(self) -> Dict[str, Any]:
+        if not self._shards:
+            return self._json_data
+        return {section: entries for section, entries in self._json_data.items() if section not in self._shards}
+
+    def _detach(self, changes: Optional[Dict[Tuple[str, str], None]]=None) -> Dict[str, Any]:
+        data = self._main_data()
+        if changes is None:
+            return {section: entries.to_dict() if isinstance(entries, RecordSection) else {key: dict(value) if isinstance(value, dict) else value for key, value in entries.items()} for section, entries in data.items()}
+        detached = {}
+        for section, key in changes:
+            entries = data.get(section, {})
+            if key in entries:
+                value = entries[key]
+                detached.setdefault(section, {})[key] = dict(value) if isinstance(value, dict) else value
+        return detached
 
-    def _save_json_db(self):
+    def _collect_shards(self) -> list:
+        return [(shard, shard.collect()) for shard in self._shards.values() if shard.dirty]
+
+    def _schedule_deadlines(self):
+        self._deadlines = {}
+        self._expiry = TimerWheel()
+        for name, deadline in self._json_data.get(_EXPIRES, {}).items():
+            section, _, key = name.partition(_TTL_SEP)
+            self._deadlines[section, key] = deadline
+            self._expiry.schedule((section, key), deadline)
+
+    def _state(self) -> Tuple:
+        return (self._backend.state(), tuple((shard.state() for shard in self._shards.values())))
+
+    def _sync(self):
+        now = time.monotonic()
+        if now - self._state_checked < self.RELOAD_INTERVAL or self._in_batch():
+            return
+        self._state_checked = now
+        if self._reload_pending or self._state() == self._seen_state:
+            return
         try:
-            with self._lock:
-                with open(self.json_db_path, 'w', encoding='utf-8') as f:
-                    json.dump(self._json_data, f, ensure_ascii=False, indent=2)
+            asyncio.get_running_loop()
+        except RuntimeError:
+            self._reload_changed(blocking=False)
+            return
+        self._bind_loop()
+        self._reload_pending = True
+        try:
+            self._writer_pool().submit(self._reload_changed)
+        except RuntimeError:
+            self._reload_pending = False
+
+    def _reload_changed(self, blocking: bool=True):
+        try:
+            if not self._io_lock.acquire(blocking=blocking):
+                return
+            try:
+                with self._file_lock:
+                    if self._state() != self._seen_state:
+                        self._reload()
+            finally:
+                self._io_lock.release()
+            self._deliver_reloaded()
+        finally:
+            self._reload_pending = False
+
+    def _reload(self):
+        try:
+            data = self._backend.load()
+        except Exception as e:
+            logger.error(f'❌ JSON DB reload error: {e}')
+            return
+        if data is None:
+            return
+        with self._lock:
+            old = self._json_data
+            for section, key in self._changes:
+                entries = old.get(section, {})
+                if key in entries:
+                    data.setdefault(section, {})[key] = entries[key]
+                else:
+                    data.get(section, {}).pop(key, None)
+            changed = []
+            for section in set(old) | set(data):
+                if section in self._shards:
+                    continue
+                before, after = (old.get(section, {}), data.get(section, {}))
+                changed.extend(((section, key) for key in set(before) | set(after) if before.get(key, _MISSING) != after.get(key, _MISSING)))
+            for name, shard in self._shards.items():
+                shard.refresh()
+                data[name] = shard
+            self._wrap_records(data)
+            self._json_data = data
+            self._rebuild_counters()
+            for section, key in changed:
+                self._versions[section, key] = self._versions.get((section, key), 0) + 1
+            self._schedule_deadlines()
+            self._reloaded.extend(changed)
+        self._seen_state = self._state()
+        if changed:
+            logger.info(f'🔄 Database changed on disk, reloaded {len(changed)} keys')
+        if self._deadlines and self._flusher is None and (not self._stop_event.is_set()):
+            self._start_flusher()
+
+    def _deliver_reloaded(self):
+        if not self._reloaded:
+            return
+        with self._lock:
+            changed, self._reloaded = (self._reloaded, [])
+        if self._subscribers:
+            for section, key in changed:
+                if section != _EXPIRES:
+                    self._notify(section, key)
+
+    def _set_deadline(self, section: str, key: str, ttl: Optional[float]):
+        if ttl is None:
+            if (section, key) in self._deadlines:
+                self._remember(_EXPIRES, section + _TTL_SEP + key)
+                del self._deadlines[section, key]
+                self._expiry.cancel((section, key))
+                self._json_data.get(_EXPIRES, {}).pop(section + _TTL_SEP + key, None)
+                self._touch(_EXPIRES, section + _TTL_SEP + key)
+            return
+        deadline = time.time() + ttl
+        self._remember(_EXPIRES, section + _TTL_SEP + key)
+        self._deadlines[section, key] = deadline
+        self._expiry.schedule((section, key), deadline)
+        self._json_data.setdefault(_EXPIRES, {})[section + _TTL_SEP + key] = deadline
+        self._touch(_EXPIRES, section + _TTL_SEP + key)
+        if self._flusher is None and not self._stop_event.is_set():
+            self._start_flusher()
+
+    def _expire(self) -> int:
+        expired = []
+        with self._lock:
+            for section, key in self._expiry.advance():
+                self._deadlines.pop((section, key), None)
+                self._json_data.get(_EXPIRES, {}).pop(section + _TTL_SEP + key, None)
+                self._touch(_EXPIRES, section + _TTL_SEP + key)
+                entries = self._json_data.get(section)
+                if entries is not None and key in entries:
+                    del entries[key]
+                    self._touch(section, key)
+                    expired.append((section, key))
+        if self._subscribers:
+            for section, key in expired:
+                self._notify(section, key)
+        return len(expired)
+
+    def _migrate_module_keys(self) -> int:
+        modules = self._json_data.setdefault('modules', {})
+        migrated = 0
+        for flat_key in list(modules):
+            if flat_key in _LEGACY_MODULE_KEYS:
+                module_name, key = _LEGACY_MODULE_KEYS[flat_key]
+            elif '.' in flat_key:
+                module_name, key = flat_key.split('.', 1)
+            else:
+                continue
+            namespace = modules.setdefault(module_name, {})
+            if not isinstance(namespace, dict):
+                logger.warning(f'⚠️ Module key {flat_key!r} conflicts with {module_name!r}, left as is')
+                continue
+            namespace.setdefault(key, modules.pop(flat_key))
+            self._touch('modules', flat_key)
+            self._touch('modules', module_name)
+            migrated += 1
+        if migrated:
+            logger.info(f'🔄 Migrated {migrated} flat module keys to per-module namespaces')
+        return migrated
+
+    def _rebuild_counters(self):
+        self._key_fields = {}
+        self._section_fields = {}
+        for section, entries in self._json_data.items():
+            if section in self._shards:
+                continue
+            counts = entries.field_counts() if isinstance(entries, RecordSection) else {key: field_count(value) for key, value in entries.items()}
+            for key, count in counts.items():
+                self._key_fields[section, key] = count
+            self._section_fields[section] = sum(counts.values())
+
+    def _touch(self, section: str, key: str):
+        self._versions[section, key] = self._versions.get((section, key), 0) + 1
+        shard = self._shards.get(section)
+        if shard is not None:
+            shard.touch(key)
+            return
+        self._changes[section, key] = None
+        entries = self._json_data.get(section, {})
+        if isinstance(entries, RecordSection):
+            count = entries.count_fields(key)
+        else:
+            count = field_count(entries[key]) if key in entries else 0
+        previous = self._key_fields.pop((section, key), 0)
+        if count:
+            self._key_fields[section, key] = count
+        self._section_fields[section] = self._section_fields.get(section, 0) + count - previous
+
+    def _in_batch(self) -> bool:
+        return self._batch_depth > 0 and self._batch_owner == threading.get_ident()
+
+    def _remember(self, section: str, key: str):
+        if self._batch_depth and (section, key) not in self._undo:
+            entries = self._json_data.get(section, {})
+            self._undo[section, key] = copy.deepcopy(entries[key]) if key in entries else _MISSING
+
+    def _rollback(self):
+        undo, self._undo = (self._undo, {})
+        for (section, key), value in undo.items():
+            entries = self._json_data.setdefault(section, {})
+            if value is _MISSING:
+                entries.pop(key, None)
+            else:
+                entries[key] = value
+            self._touch(section, key)
+            if section == _EXPIRES:
+                target_section, _, target_key = key.partition(_TTL_SEP)
+                if value is _MISSING:
+                    self._deadlines.pop((target_section, target_key), None)
+                    self._expiry.cancel((target_section, target_key))
+                else:
+                    self._deadlines[target_section, target_key] = value
+                    self._expiry.schedule((target_section, target_key), value)
+
+    @contextmanager
+    def batch(self):
+        with self._lock:
+            outer = self._batch_depth == 0
+            if outer:
+                self._batch_owner = threading.get_ident()
+            self._batch_depth += 1
+            try:
+                yield self
+            except BaseException:
+                if outer:
+                    self._rollback()
+                    self._batch_keys = {}
+                raise
+            finally:
+                self._batch_depth -= 1
+                if outer:
+                    self._batch_owner = None
+                    self._undo = {}
+            if not outer:
+                return
+            keys, self._batch_keys = (self._batch_keys, {})
+        if self._subscribers:
+            for section, key in keys:
+                self._notify(section, key)
+        if keys and (not self.write_behind):
+            self._commit()
+
+    def _after_write(self, section: str, *keys: str):
+        if self._in_batch():
+            self._batch_keys.update(dict.fromkeys(((section, key) for key in keys)))
+            return
+        if self._subscribers:
+            for key in keys:
+                self._notify(section, key)
+        if not self.write_behind:
+            self._commit()
+
+    def _bind_loop(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if loop is not self._loop:
+            self._loop, self._loop_thread = (loop, threading.get_ident())
+
+    def _notify(self, section: str, key: str):
+        if (section, key) not in self._subscribers and (section, None) not in self._subscribers:
+            return
+        if self._loop_thread is not None and self._loop_thread != threading.get_ident() and (not self._loop.is_closed()):
+            try:
+                self._loop.call_soon_threadsafe(self._deliver, section, key)
+                return
+            except RuntimeError:
+                pass
+        self._deliver(section, key)
+
+    def _deliver(self, section: str, key: str):
+        callbacks = self._subscribers.get((section, key), []) + self._subscribers.get((section, None), [])
+        if not callbacks:
+            return
+        value = self.get(section, key)
+        for callback in callbacks:
+            try:
+                callback(section, key, value)
+            except Exception as e:
+                logger.error(f'❌ DB subscriber error for {section}.{key}: {e}')
+
+    def subscribe(self, section: str, key: Optional[str], callback: Callable):
+        self._bind_loop()
+        with self._lock:
+            callbacks = self._subscribers.get((section, key), [])
+            if callback not in callbacks:
+                self._subscribers[section, key] = callbacks + [callback]
+
+    def unsubscribe(self, section: str, key: Optional[str], callback: Callable):
+        with self._lock:
+            callbacks = [c for c in self._subscribers.get((section, key), []) if c != callback]
+            if callbacks:
+                self._subscribers[section, key] = callbacks
+            else:
+                self._subscribers.pop((section, key), None)
+
+    def version(self, section: str, key: str) -> int:
+        return self._versions.get((section, key), 0)
+
+    def view(self, section: str, key: Optional[str]=None) -> Any:
+        self._sync()
+        with self._lock:
+            entries = self._json_data.get(section, {})
+            if key is None:
+                return _View(self, section)
+            value = entries.get(key)
+            return _View(self, section, key) if isinstance(value, dict) else value
+
+    def _commit(self):
+        with self._io_lock, self._file_lock:
+            self._write(snapshot=False)
+        self._deliver_reloaded()
+
+    def compact(self):
+        with self._io_lock, self._file_lock:
+            self._write(snapshot=True)
+        self._deliver_reloaded()
+
+    def _write(self, snapshot: bool):
+        if self._state() != self._seen_state:
+            self._reload()
+        with self._lock:
+            changes = self._changes
+            shard_writes = self._collect_shards()
+            if not snapshot and (not changes) and (not shard_writes):
+                return
+            self._changes = {}
+            data = self._detach(changes if not snapshot and self._backend.incremental else None) if snapshot or changes else None
+        try:
+            tail = payload = None
+            if snapshot:
+                tail = self._backend.encode(data, changes) if changes and self._backend.append_only else None
+                payload = self._backend.encode_snapshot(data)
+            elif changes:
+                payload = self._backend.encode(data, changes)
+            for shard, collected in shard_writes:
+                shard.write(collected)
+            if tail:
+                self._backend.write(tail)
+            if snapshot:
+                self._backend.write_snapshot(payload)
+            elif payload is not None:
+                self._backend.write(payload)
+            self._seen_state = self._state()
         except Exception as e:
+            with self._lock:
+                changes.update(self._changes)
+                self._changes = changes
+                for shard, collected in shard_writes:
+                    shard.restore(collected)
             logger.error(f'❌ JSON DB save error: {e}')
 
+    def _start_flusher(self):
+        self._flusher = threading.Thread(target=self._flush_loop, name='argent-db-flusher', daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        idle_cycles = max(1, int(self.SHARD_IDLE_SECONDS / self.flush_interval))
+        while not self._stop_event.wait(self.flush_interval):
+            self.flush()
+            self._sync()
+            if self._backend.needs_compaction():
+                self.compact()
+            if self._shards:
+                with self._lock:
+                    for shard in self._shards.values():
+                        shard.evict(idle_cycles)
+
+    def flush(self):
+        if self._in_batch():
+            return
+        if self._deadlines:
+            self._expire()
+        if self._dirty:
+            self._commit()
+
+    def add_close_hook(self, callback: Callable):
+        if callback not in self._close_hooks:
+            self._close_hooks.append(callback)
+
+    def remove_close_hook(self, callback: Callable):
+        self._close_hooks = [hook for hook in self._close_hooks if hook != callback]
+
+    def close(self):
+        hooks, self._close_hooks = (self._close_hooks, [])
+        for hook in hooks:
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f'❌ DB close hook error: {e}')
+        if self._writer is not None:
+            self._writer.shutdown(wait=True)
+            self._writer = None
+        self._stop_event.set()
+        if self._flusher and self._flusher.is_alive() and self._flusher is not threading.current_thread():
+            self._flusher.join(timeout=self.flush_interval + 1)
+        self._flusher = None
+        self.flush()
+        self._backend.close()
+        self._file_lock.close()
+        if self._timeseries is not None:
+            self._timeseries.close()
+            self._timeseries = None
+
     def get(self, section: str, key: str, default: Any=None) -> Any:
+        self._sync()
         with self._lock:
+            if self._batch_depth:
+                self._remember(section, key)
+            if self._deadlines and self._deadlines.get((section, key), float('inf')) <= time.time():
+                return default
             return self._json_data.get(section, {}).get(key, default)
 
-    def set(self, section: str, key: str, value: Any):
+    def ttl(self, section: str, key: str) -> Optional[float]:
+        deadline = self._deadlines.get((section, key))
+        return None if deadline is None else max(0.0, deadline - time.time())
+
+    def set(self, section: str, key: str, value: Any, ttl: Optional[float]=None):
         with self._lock:
+            self._remember(section, key)
             if section not in self._json_data:
                 self._json_data[section] = {}
             self._json_data[section][key] = value
-            self._save_json_db()
+            self._touch(section, key)
+            self._set_deadline(section, key, ttl)
+        self._after_write(section, key)
+
+    def set_many(self, section: str, values: Dict[str, Any], ttl: Optional[float]=None):
+        with self._lock:
+            entries = self._json_data.setdefault(section, {})
+            for key, value in values.items():
+                self._remember(section, key)
+                entries[key] = value
+                self._touch(section, key)
+                self._set_deadline(section, key, ttl)
+        self._after_write(section, *values)
 
     def delete(self, section: str, key: str) -> bool:
         with self._lock:
-            if section in self._json_data and key in self._json_data[section]:
-                del self._json_data[section][key]
-                self._save_json_db()
-                return True
-            return False
+            if section not in self._json_data or key not in self._json_data[section]:
+                return False
+            self._remember(section, key)
+            del self._json_data[section][key]
+            self._touch(section, key)
+            self._set_deadline(section, key, None)
+        self._after_write(section, key)
+        return True
 
     def get_section(self, section: str) -> Dict[str, Any]:
+        self._sync()
         with self._lock:
             return self._json_data.get(section, {}).copy()
 
     def get_module_config(self, module_name: str, key: str, default: Any=None) -> Any:
-        return self.get('modules', f'{module_name}.{key}', default)
+        self._sync()
+        with self._lock:
+            self._remember('modules', module_name)
+            namespace = self._json_data.get('modules', {}).get(module_name)
+            return namespace.get(key, default) if isinstance(namespace, dict) else default
 
     def set_module_config(self, module_name: str, key: str, value: Any):
-        self.set('modules', f'{module_name}.{key}', value)
+        with self._lock:
+            self._remember('modules', module_name)
+            modules = self._json_data.setdefault('modules', {})
+            namespace = modules.get(module_name)
+            if not isinstance(namespace, dict):
+                namespace = modules[module_name] = {}
+            namespace[key] = value
+            self._touch('modules', module_name)
+        self._after_write('modules', module_name)
+
+    def delete_module_config(self, module_name: str, key: str) -> bool:
+        with self._lock:
+            namespace = self._json_data.get('modules', {}).get(module_name)
+            if not isinstance(namespace, dict) or key not in namespace:
+                return False
+            self._remember('modules', module_name)
+            del namespace[key]
+            self._touch('modules', module_name)
+        self._after_write('modules', module_name)
+        return True
 
     def get_user_data(self, user_id: int, key: str, default: Any=None) -> Any:
+        self._sync()
         with self._lock:
-            users = self._json_data.setdefault('users', {})
-            user_entry = users.setdefault(str(user_id), {})
-            return user_entry.get(key, default)
+            self._remember('users', str(user_id))
+            return self._json_data['users'].get_field(user_id, key, default)
 
     def set_user_data(self, user_id: int, key: str, value: Any):
         with self._lock:
-            users = self._json_data.setdefault('users', {})
-            user_entry = users.setdefault(str(user_id), {})
-            user_entry[key] = value
-            self._save_json_db()
+            self._remember('users', str(user_id))
+            self._json_data['users'].set_field(user_id, key, value)
+            self._touch('users', str(user_id))
+        self._after_write('users', str(user_id))
 
     def get_chat_data(self, chat_id: int, key: str, default: Any=None) -> Any:
+        self._sync()
         with self._lock:
-            chats = self._json_data.setdefault('chats', {})
-            chat_entry = chats.setdefault(str(chat_id), {})
-            return chat_entry.get(key, default)
+            self._remember('chats', str(chat_id))
+            return self._json_data['chats'].get_field(chat_id, key, default)
 
     def set_chat_data(self, chat_id: int, key: str, value: Any):
         with self._lock:
-            chats = self._json_data.setdefault('chats', {})
-            chat_entry = chats.setdefault(str(chat_id), {})
-            chat_entry[key] = value
-            self._save_json_db()
+            self._remember('chats', str(chat_id))
+            self._json_data['chats'].set_field(chat_id, key, value)
+            self._touch('chats', str(chat_id))
+        self._after_write('chats', str(chat_id))
 
     def get_config(self, key: str, default: Any=None) -> Any:
         return self.get('config', key, default)
 
-    def set_config(self, key: str, value: Any):
-        self.set('config', key, value)
+    def set_config(self, key: str, value: Any, ttl: Optional[float]=None):
+        self.set('config', key, value, ttl)
+
+    def export(self) -> Dict[str, Any]:
+        self._sync()
+        codec = json_codec()
+        with self._lock:
+            return codec.loads(codec.dumps({section: dict(entries.items()) for section, entries in self._json_data.items()}))
+
+    def export_json(self, path: Optional[str]=None) -> str:
+        payload = dumps_pretty(self.export())
+        if path is not None:
+            atomic_write(Path(path), payload)
+        return payload
+
+    def timeseries(self, name: str, capacity: int=1000) -> TimeSeries:
+        if self._timeseries is None:
+            self._timeseries = TimeSeriesStore(self.data_dir / 'timeseries.sqlite')
+        return self._timeseries.series(name, capacity)
+
+    @property
+    def write_queue_depth(self) -> int:
+        return self._queue_depth
+
+    def _writer_pool(self) -> ThreadPoolExecutor:
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='argent-db-writer')
+        return self._writer
+
+    async def _submit(self, func, *args):
+        if self._in_batch():
+            return func(*args)
+        self._bind_loop()
+        self._queue_depth += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._writer_pool(), func, *args)
+        finally:
+            self._queue_depth -= 1
+
+    async def aget(self, section: str, key: str, default: Any=None) -> Any:
+        if self._queue_depth:
+            return await self._submit(self.get, section, key, default)
+        return self.get(section, key, default)
+
+    async def aset(self, section: str, key: str, value: Any, ttl: Optional[float]=None):
+        await self._submit(self.set, section, key, value, ttl)
+
+    async def aset_many(self, section: str, values: Dict[str, Any], ttl: Optional[float]=None):
+        await self._submit(self.set_many, section, values, ttl)
+
+    async def adelete(self, section: str, key: str) -> bool:
+        return await self._submit(self.delete, section, key)
+
+    async def aget_config(self, key: str, default: Any=None) -> Any:
+        return await self.aget('config', key, default)
+
+    async def aset_config(self, key: str, value: Any, ttl: Optional[float]=None):
+        await self.aset('config', key, value, ttl)
 
     def get_stats(self) -> Dict[str, Any]:
-        stats = {'json_sections': len(self._json_data), 'json_size': self.json_db_path.stat().st_size if self.json_db_path.exists() else 0, 'sqlite_size': 0}
-        modules = self._json_data.get('modules', {})
-        users = self._json_data.get('users', {})
-        chats = self._json_data.get('chats', {})
-        stats['module_data_count'] = sum((len([k for k in modules.keys() if k.startswith(f'{m}.')]) for m in set((k.split('.')[0] for k in modules.keys())))) if modules else 0
-        stats['user_data_count'] = sum((len(v) for v in users.values())) if users else 0
-        stats['chat_data_count'] = sum((len(v) for v in chats.values())) if chats else 0
-        return stats
+        size = self._backend.size()
+        stats = {'storage': self.storage, 'codec': self.codec.name, 'json_sections': len(self._json_data), 'json_size': 0 if self.storage == 'sqlite' else size, 'sqlite_size': size if self.storage == 'sqlite' else 0, 'write_behind': self.write_behind, 'pending_flush': self._dirty, 'write_queue_depth': self._queue_depth, 'ttl_keys': len(self._deadlines)}
+        if self.storage == 'journal':
+            stats['journal_size'] = self._backend.journal_size()
+        for section, name in (('modules', 'module'), ('users', 'user'), ('chats', 'chat')):
+            shard = self._shards.get(section)
+            stats[f'{name}_count'] = len(self._json_data.get(section, {}))
+            stats[f'{name}_data_count'] = shard.fields if shard is not None else self._section_fields.get(section, 0)
+        if self._timeseries is not None:
+            stats['timeseries_size'] = self._timeseries.size()
+        if self._shards:
+            stats['shards'] = self.shards
+            stats['shards_loaded'] = sum((shard.loaded_buckets for shard in self._shards.values()))
+            stats['shard_size'] = sum((shard.size for shard in self._shards.values()))
+        return stats
\ No newline at end of file
@@ -0,0 +1,82 @@
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+logger = logging.getLogger(__name__)
+
+class FileLock:
+
+    def __init__(self, path: Path):
+        self.path = Path(str(path) + '.lock')
+        self._thread_lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._depth = 0
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                if self._fd is None:
+                    self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except OSError as e:
+                logger.warning(f'⚠️ Could not lock {self.path.name}: {e}')
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            except OSError:
+                pass
+        self._thread_lock.release()
+
+    def close(self):
+        with self._thread_lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+class FileStamp:
+    __slots__ = ('paths', 'interval', '_stamp', '_checked')
+
+    def __init__(self, *paths: Path, interval: float=0.25):
+        self.paths = tuple((Path(p) for p in paths))
+        self.interval = interval
+        self._stamp = self.current()
+        self._checked = time.monotonic()
+
+    def current(self) -> Tuple:
+        stamp = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                stamp.append((st.st_mtime_ns, st.st_ino, st.st_size))
+            except FileNotFoundError:
+                stamp.append(None)
+        return tuple(stamp)
+
+    def changed(self, force: bool=False) -> bool:
+        now = time.monotonic()
+        if not force and now - self._checked < self.interval:
+            return False
+        self._checked = now
+        return self.current() != self._stamp
+
+    def update(self):
+        self._stamp = self.current()
+        self._checked = time.monotonic()
\ No newline at end of file
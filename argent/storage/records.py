@@ -0,0 +1,139 @@
+import sys
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, List, Optional, Union
+_ABSENT = object()
+
+def record_key(key: Union[int, str]) -> Optional[int]:
+    if isinstance(key, int):
+        return key
+    if not isinstance(key, str):
+        return None
+    digits = key[1:] if key[:1] == '-' else key
+    if digits.isascii() and digits.isdigit():
+        number = int(key)
+        if str(number) == key:
+            return number
+    return None
+
+class FieldTable:
+    __slots__ = ('index', 'names')
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.names: List[str] = []
+
+    def column(self, name: str) -> int:
+        column = self.index.get(name)
+        if column is None:
+            name = sys.intern(name)
+            column = self.index[name] = len(self.names)
+            self.names.append(name)
+        return column
+
+class RecordSection(MutableMapping):
+    __slots__ = ('fields', '_rows', '_extra', 'dropped')
+
+    def __init__(self, entries: Optional[Dict[str, Any]]=None, fields: Optional[FieldTable]=None):
+        self.fields = fields or FieldTable()
+        self._rows: Dict[int, list] = {}
+        self._extra: Dict[str, Any] = {}
+        self.dropped: List[str] = []
+        for key, value in (entries or {}).items():
+            if isinstance(value, dict) and (not value):
+                self.dropped.append(key)
+            else:
+                self[key] = value
+
+    def _row(self, value: Dict[str, Any]) -> list:
+        columns = [(self.fields.column(name), item) for name, item in value.items()]
+        row = [_ABSENT] * (max((column for column, _ in columns)) + 1 if columns else 0)
+        for column, item in columns:
+            row[column] = item
+        return row
+
+    def _materialize(self, row: list) -> Dict[str, Any]:
+        names = self.fields.names
+        return {names[column]: item for column, item in enumerate(row) if item is not _ABSENT}
+
+    def __getitem__(self, key: str) -> Any:
+        number = record_key(key)
+        if number is not None and number in self._rows:
+            return self._materialize(self._rows[number])
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        number = record_key(key)
+        if number is not None and isinstance(value, dict):
+            self._rows[number] = self._row(value)
+            self._extra.pop(key, None)
+        else:
+            self._extra[key] = value
+            if number is not None:
+                self._rows.pop(number, None)
+
+    def __delitem__(self, key: str):
+        number = record_key(key)
+        if number is not None and number in self._rows:
+            del self._rows[number]
+        else:
+            del self._extra[key]
+
+    def __contains__(self, key: object) -> bool:
+        number = record_key(key)
+        return number is not None and number in self._rows or key in self._extra
+
+    def __iter__(self) -> Iterator[str]:
+        for number in list(self._rows):
+            yield str(number)
+        yield from list(self._extra)
+
+    def __len__(self) -> int:
+        return len(self._rows) + len(self._extra)
+
+    def get_field(self, key: Union[int, str], field: str, default: Any=None) -> Any:
+        number = record_key(key)
+        row = self._rows.get(number) if number is not None else None
+        if row is None:
+            value = self._extra.get(str(key))
+            return value.get(field, default) if isinstance(value, dict) else default
+        column = self.fields.index.get(field)
+        if column is None or column >= len(row) or row[column] is _ABSENT:
+            return default
+        return row[column]
+
+    def set_field(self, key: Union[int, str], field: str, value: Any):
+        number = record_key(key)
+        if number is None or (self._extra and str(key) in self._extra):
+            record = self._extra.get(str(key))
+            if not isinstance(record, dict):
+                record = self._extra[str(key)] = {}
+            record[field] = value
+            return
+        row = self._rows.setdefault(number, [])
+        column = self.fields.column(field)
+        if column >= len(row):
+            row.extend([_ABSENT] * (column + 1 - len(row)))
+        row[column] = value
+
+    def count_fields(self, key: Union[int, str]) -> int:
+        number = record_key(key)
+        row = self._rows.get(number) if number is not None else None
+        if row is not None:
+            return sum((1 for item in row if item is not _ABSENT))
+        if str(key) not in self._extra:
+            return 0
+        value = self._extra[str(key)]
+        return len(value) if isinstance(value, dict) else 1
+
+    def field_counts(self) -> Dict[str, int]:
+        counts = {str(number): sum((1 for item in row if item is not _ABSENT)) for number, row in self._rows.items()}
+        counts.update({key: len(value) if isinstance(value, dict) else 1 for key, value in self._extra.items()})
+        return counts
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {str(number): self._materialize(row) for number, row in self._rows.items()}
+        data.update(self._extra)
+        return data
+
+    def copy(self) -> Dict[str, Any]:
+        return self.to_dict()
\ No newline at end of file
@@ -1,11 +1,11 @@
 import os
-import json
 import logging
 from typing import Optional, Dict, List
 from pathlib import Path
 from datetime import datetime
 import hashlib
 import base64
+from .codec import read_file, write_file
 logger = logging.getLogger(__name__)
 
 class SessionStorage:
@@ -22,8 +22,7 @@ class SessionStorage:
     def _load_sessions_index(self):
         try:
             if self.sessions_index_path.exists():
-                with open(self.sessions_index_path, 'r', encoding='utf-8') as f:
-                    self._sessions_index = json.load(f)
+                self._sessions_index = read_file(self.sessions_index_path)
             else:
                 self._sessions_index = {'sessions': {}, 'default_session': None, 'created_at': datetime.now().isoformat()}
                 self._save_sessions_index()
@@ -33,8 +32,7 @@ class SessionStorage:
 
     def _save_sessions_index(self):
         try:
-            with open(self.sessions_index_path, 'w', encoding='utf-8') as f:
-                json.dump(self._sessions_index, f, ensure_ascii=False, indent=2)
+            write_file(self.sessions_index_path, self._sessions_index)
         except Exception as e:
             logger.error(f'❌ Ошибка сохранения индекса сессий: {e}')
 
@@ -179,8 +177,7 @@ class SessionStorage:
                 if session_file.exists():
                     with open(session_file, 'r', encoding='utf-8') as f:
                         backup_data['sessions'][session_id] = f.read()
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+            write_file(backup_path, backup_data, pretty=True)
             logger.info(f'✅ Резервная копия создана: {backup_path}')
             return str(backup_path)
         except Exception as e:
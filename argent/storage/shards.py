@@ -0,0 +1,277 @@
+import logging
+import zlib
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple, Union
+from .codec import atomic_write, codec_for_path, json_codec
+from .records import FieldTable, RecordSection
+logger = logging.getLogger(__name__)
+
+def field_count(value: Any) -> int:
+    return len(value) if isinstance(value, dict) else 1
+
+def _stamp(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+        return (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        return None
+
+class ShardedSection(MutableMapping):
+
+    def __init__(self, root: Path, name: str, buckets: int, codec):
+        self.name = name
+        self.buckets = buckets
+        self.codec = codec
+        self.dir = root / name
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.dir / 'manifest.json'
+        self._fields = FieldTable()
+        self._data: Dict[int, RecordSection] = {}
+        self._key_fields: Dict[int, Dict[str, int]] = {}
+        self._counts: Dict[int, List[int]] = {}
+        self._sizes: Dict[int, int] = {}
+        self._dirty: Dict[int, Set[str]] = {}
+        self._stamps: Dict[int, Optional[Tuple[int, int]]] = {}
+        self._manifest_stamp: Optional[Tuple[int, int]] = None
+        self._manifest_dirty = False
+        self._used: Dict[int, int] = {}
+        self._clock = 0
+        self._load_manifest()
+
+    def _bucket_path(self, bucket: int) -> Path:
+        return self.dir / f'{bucket:04d}{self.codec.suffix}'
+
+    def _bucket_of(self, key: str) -> int:
+        return zlib.crc32(key.encode('utf-8')) % self.buckets
+
+    def _load_manifest(self):
+        try:
+            self._manifest_stamp = _stamp(self.manifest_path)
+            manifest = json_codec().loads(self.manifest_path.read_bytes())
+            if manifest.get('buckets') != self.buckets or manifest.get('codec') != self.codec.suffix:
+                self._reshard(manifest)
+                return
+            self._counts = {int(bucket): list(counts) for bucket, counts in manifest.get('counts', {}).items()}
+            self._sizes = {int(bucket): size for bucket, size in manifest.get('sizes', {}).items()}
+        except FileNotFoundError:
+            self._rebuild_counts()
+        except Exception as e:
+            logger.warning(f'⚠️ Shard manifest for {self.name} is unreadable, rebuilding: {e}')
+            self._rebuild_counts()
+
+    def _rebuild_counts(self):
+        self._counts = {}
+        for bucket in range(self.buckets):
+            path = self._bucket_path(bucket)
+            if path.exists():
+                self._sizes[bucket] = path.stat().st_size
+                self._bucket(bucket)
+        self._manifest_dirty = True
+
+    def _reshard(self, manifest: Dict[str, Any]):
+        old_buckets = manifest.get('buckets', 0)
+        suffix = manifest.get('codec', self.codec.suffix)
+        entries = {}
+        for bucket in range(old_buckets):
+            path = self.dir / f'{bucket:04d}{suffix}'
+            if path.exists():
+                entries.update(codec_for_path(path).loads(path.read_bytes()))
+                path.unlink()
+        logger.info(f'🔄 Resharding {self.name}: {old_buckets} -> {self.buckets} buckets')
+        self._counts = {}
+        self.load_from(entries)
+
+    def _bucket(self, bucket: int) -> RecordSection:
+        self._used[bucket] = self._clock
+        data = self._data.get(bucket)
+        if data is None:
+            data = self._read_bucket(bucket)
+            self._data[bucket] = data
+            self._count_bucket(bucket)
+        return data
+
+    def _read_bucket(self, bucket: int) -> RecordSection:
+        path = self._bucket_path(bucket)
+        self._stamps[bucket] = _stamp(path)
+        data = RecordSection(self.codec.loads(path.read_bytes()) if self._stamps[bucket] is not None else None, self._fields)
+        if data.dropped:
+            self._dirty.setdefault(bucket, set()).update(data.dropped)
+            self._manifest_dirty = True
+        return data
+
+    def _count_bucket(self, bucket: int):
+        fields = self._data[bucket].field_counts()
+        self._key_fields[bucket] = fields
+        counts = [len(fields), sum(fields.values())]
+        if self._counts.get(bucket, [0, 0]) != counts:
+            self._counts[bucket] = counts
+            self._manifest_dirty = True
+
+    def load_from(self, entries: Dict[str, Any]):
+        for key, value in entries.items():
+            self[key] = value
+            self.touch(key)
+
+    def touch(self, key: str):
+        bucket = self._bucket_of(key)
+        data = self._bucket(bucket)
+        fields = self._key_fields[bucket]
+        counts = self._counts.setdefault(bucket, [0, 0])
+        previous = fields.pop(key, None)
+        if previous is not None:
+            counts[0] -= 1
+            counts[1] -= previous
+        if key in data:
+            count = data.count_fields(key)
+            fields[key] = count
+            counts[0] += 1
+            counts[1] += count
+        self._dirty.setdefault(bucket, set()).add(key)
+        self._manifest_dirty = True
+
+    def state(self) -> Optional[Tuple[int, int]]:
+        return _stamp(self.manifest_path)
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._dirty) or self._manifest_dirty
+
+    @property
+    def fields(self) -> int:
+        return sum((counts[1] for counts in self._counts.values()))
+
+    @property
+    def loaded_buckets(self) -> int:
+        return len(self._data)
+
+    @property
+    def size(self) -> int:
+        return sum(self._sizes.values())
+
+    def _merge_manifest(self):
+        stamp = _stamp(self.manifest_path)
+        if stamp is None or stamp == self._manifest_stamp:
+            return
+        self._manifest_stamp = stamp
+        try:
+            manifest = json_codec().loads(self.manifest_path.read_bytes())
+        except Exception as e:
+            logger.warning(f'⚠️ Shard manifest for {self.name} changed but is unreadable: {e}')
+            return
+        if manifest.get('buckets') != self.buckets:
+            return
+        loaded = set(self._data)
+        self._counts = {bucket: counts for bucket, counts in self._counts.items() if bucket in loaded}
+        self._counts.update({int(bucket): list(counts) for bucket, counts in manifest.get('counts', {}).items() if int(bucket) not in loaded})
+        self._sizes.update({int(bucket): size for bucket, size in manifest.get('sizes', {}).items() if int(bucket) not in loaded})
+
+    def _merge_bucket(self, bucket: int, keys: Set[str]):
+        if _stamp(self._bucket_path(bucket)) == self._stamps.get(bucket):
+            return
+        local = self._data[bucket]
+        merged = self._read_bucket(bucket)
+        for key in keys:
+            if key in local:
+                merged[key] = local[key]
+            else:
+                merged.pop(key, None)
+        self._data[bucket] = merged
+        self._count_bucket(bucket)
+
+    def refresh(self) -> int:
+        self._merge_manifest()
+        dropped = 0
+        for bucket in list(self._data):
+            if bucket not in self._dirty and _stamp(self._bucket_path(bucket)) != self._stamps.get(bucket):
+                del self._data[bucket]
+                del self._key_fields[bucket]
+                self._stamps.pop(bucket, None)
+                dropped += 1
+        return dropped
+
+    def collect(self) -> Tuple[List[Tuple[int, Dict[str, Any], Set[str]]], Dict[str, List[int]]]:
+        self._merge_manifest()
+        for bucket, keys in self._dirty.items():
+            if bucket in self._data:
+                self._merge_bucket(bucket, keys)
+        buckets = [(bucket, self._data[bucket].to_dict(), keys) for bucket, keys in sorted(self._dirty.items()) if bucket in self._data]
+        counts = {str(bucket): list(counts) for bucket, counts in self._counts.items() if counts[0]}
+        self._dirty = {}
+        self._manifest_dirty = False
+        return (buckets, counts)
+
+    def write(self, collected: Tuple[List[Tuple[int, Dict[str, Any], Set[str]]], Dict[str, List[int]]]):
+        buckets, counts = collected
+        for bucket, entries, _ in buckets:
+            payload = self.codec.dumps(entries)
+            path = self._bucket_path(bucket)
+            atomic_write(path, payload)
+            self._sizes[bucket] = len(payload)
+            self._stamps[bucket] = _stamp(path)
+        manifest = json_codec().dumps({'buckets': self.buckets, 'codec': self.codec.suffix, 'counts': counts, 'sizes': {str(bucket): size for bucket, size in self._sizes.items()}})
+        atomic_write(self.manifest_path, manifest)
+        self._manifest_stamp = _stamp(self.manifest_path)
+
+    def restore(self, collected: Tuple[List[Tuple[int, Dict[str, Any], Set[str]]], Dict[str, List[int]]]):
+        for bucket, _, keys in collected[0]:
+            self._dirty.setdefault(bucket, set()).update(keys)
+        self._manifest_dirty = True
+
+    def evict(self, idle_cycles: int) -> int:
+        self._clock += 1
+        evicted = 0
+        for bucket in list(self._data):
+            if bucket not in self._dirty and self._clock - self._used.get(bucket, 0) > idle_cycles:
+                del self._data[bucket]
+                del self._key_fields[bucket]
+                self._used.pop(bucket, None)
+                self._stamps.pop(bucket, None)
+                evicted += 1
+        return evicted
+
+    def get_field(self, key: Union[int, str], field: str, default: Any=None) -> Any:
+        return self._bucket(self._bucket_of(str(key))).get_field(key, field, default)
+
+    def set_field(self, key: Union[int, str], field: str, value: Any):
+        self._bucket(self._bucket_of(str(key))).set_field(key, field, value)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._bucket(self._bucket_of(key))[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self._bucket(self._bucket_of(key))[key] = value
+
+    def __delitem__(self, key: str):
+        del self._bucket(self._bucket_of(key))[key]
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and key in self._bucket(self._bucket_of(key))
+
+    def get(self, key: str, default: Any=None) -> Any:
+        if not isinstance(key, str):
+            return default
+        return self._bucket(self._bucket_of(key)).get(key, default)
+
+    def __len__(self) -> int:
+        return sum((counts[0] for counts in self._counts.values()))
+
+    def __iter__(self) -> Iterator[str]:
+        for bucket in range(self.buckets):
+            if bucket in self._data or bucket in self._counts:
+                yield from list(self._bucket(bucket))
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    @staticmethod
+    def read_all(root: Path, name: str) -> Dict[str, Any]:
+        directory = root / name
+        entries = {}
+        if not directory.exists():
+            return entries
+        for path in sorted(directory.iterdir()):
+            if path.name == 'manifest.json' or path.suffix == '.tmp':
+                continue
+            entries.update(codec_for_path(path).loads(path.read_bytes()))
+        return entries
\ No newline at end of file
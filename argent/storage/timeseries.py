@@ -0,0 +1,121 @@
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from .codec import json_codec
+logger = logging.getLogger(__name__)
+
+class TimeSeriesStore:
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None, cached_statements=128)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._lock = threading.RLock()
+        self._series: Dict[str, 'TimeSeries'] = {}
+
+    def series(self, name: str, capacity: int=1000) -> 'TimeSeries':
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                series = self._series[name] = TimeSeries(self, name, capacity)
+            elif series.capacity != capacity:
+                series.capacity = max(1, int(capacity))
+            return series
+
+    def execute(self, sql: str, params: Tuple=()) -> sqlite3.Cursor:
+        with self._lock:
+            return self._conn.execute(sql, params)
+
+    def executemany(self, sql: str, rows: List[Tuple]) -> int:
+        with self._lock:
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                self._conn.executemany(sql, rows)
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                raise
+            return self._conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+
+    def fetch(self, sql: str, params: Tuple=()) -> List[Tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def size(self) -> int:
+        return sum((p.stat().st_size for p in (self.path, self.path.with_name(self.path.name + '-wal')) if p.exists()))
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+class TimeSeries:
+
+    def __init__(self, store: TimeSeriesStore, name: str, capacity: int=1000):
+        self.store = store
+        self.name = name
+        self.capacity = max(1, int(capacity))
+        self._codec = json_codec()
+        table = '"ts_' + name.replace('"', '""') + '"'
+        index = 'ix_ts_' + name.replace('"', '""')
+        store.execute(f'CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, ts REAL NOT NULL, type TEXT NOT NULL, data TEXT)')
+        store.execute(f'CREATE INDEX IF NOT EXISTS "{index}_ts" ON {table} (ts)')
+        store.execute(f'CREATE INDEX IF NOT EXISTS "{index}_type" ON {table} (type, ts)')
+        self._table = table
+
+    def _row(self, type: str, data: Any, ts: Optional[float]) -> Tuple:
+        return (time.time() if ts is None else ts, type, None if data is None else self._codec.dumps(data).decode('utf-8'))
+
+    def _trim(self, row_id: int):
+        if row_id > self.capacity:
+            self.store.execute(f'DELETE FROM {self._table} WHERE id <= ?', (row_id - self.capacity,))
+
+    def append(self, type: str, data: Any=None, ts: Optional[float]=None) -> int:
+        row_id = self.store.execute(f'INSERT INTO {self._table} (ts, type, data) VALUES (?, ?, ?)', self._row(type, data, ts)).lastrowid
+        self._trim(row_id)
+        return row_id
+
+    def extend(self, records: List[Tuple[str, Any, Optional[float]]]) -> int:
+        if records:
+            self._trim(self.store.executemany(f'INSERT INTO {self._table} (ts, type, data) VALUES (?, ?, ?)', [self._row(*record) for record in records]))
+        return len(records)
+
+    def _where(self, since: Optional[float], until: Optional[float], type: Optional[str]) -> Tuple[str, Tuple]:
+        clauses, params = ([], [])
+        if type is not None:
+            clauses.append('type = ?')
+            params.append(type)
+        if since is not None:
+            clauses.append('ts >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('ts < ?')
+            params.append(until)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else '', tuple(params))
+
+    def query(self, since: Optional[float]=None, until: Optional[float]=None, type: Optional[str]=None, limit: Optional[int]=None, newest_first: bool=False) -> List[Dict[str, Any]]:
+        where, params = self._where(since, until, type)
+        sql = f"SELECT id, ts, type, data FROM {self._table}{where} ORDER BY id {('DESC' if newest_first else 'ASC')}"
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params += (limit,)
+        return [{'id': row_id, 'ts': ts, 'type': kind, 'data': None if data is None else self._codec.loads(data)} for row_id, ts, kind, data in self.store.fetch(sql, params)]
+
+    def last(self, type: Optional[str]=None) -> Optional[Dict[str, Any]]:
+        records = self.query(type=type, limit=1, newest_first=True)
+        return records[0] if records else None
+
+    def count(self, since: Optional[float]=None, until: Optional[float]=None, type: Optional[str]=None) -> int:
+        where, params = self._where(since, until, type)
+        return self.store.fetch(f'SELECT COUNT(*) FROM {self._table}{where}', params)[0][0]
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def clear(self):
+        self.store.execute(f'DELETE FROM {self._table}')
\ No newline at end of file
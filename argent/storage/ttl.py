@@ -0,0 +1,93 @@
+import math
+import time
+from typing import Dict, Hashable, List, Optional, Set, Tuple
+
+class TimerWheel:
+
+    def __init__(self, resolution: float=1.0, slots: int=256, levels: int=4, now: Optional[float]=None):
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        self._spans = [slots ** level for level in range(levels + 1)]
+        self._wheels: List[List[Set[Hashable]]] = [[set() for _ in range(slots)] for _ in range(levels)]
+        self._overflow: Set[Hashable] = set()
+        self._due: Set[Hashable] = set()
+        self._ticks: Dict[Hashable, int] = {}
+        self._where: Dict[Hashable, Optional[Tuple[int, int]]] = {}
+        self._tick = int((time.time() if now is None else now) / resolution)
+
+    def __len__(self) -> int:
+        return len(self._ticks)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._ticks
+
+    def _place(self, item: Hashable, tick: int):
+        delta = tick - self._tick
+        for level in range(self.levels):
+            if delta < self._spans[level + 1]:
+                slot = tick // self._spans[level] % self.slots
+                self._wheels[level][slot].add(item)
+                self._where[item] = (level, slot)
+                return
+        self._overflow.add(item)
+        self._where[item] = None
+
+    def schedule(self, item: Hashable, deadline: float):
+        self.cancel(item)
+        tick = int(math.ceil(deadline / self.resolution))
+        self._ticks[item] = tick
+        if tick <= self._tick:
+            self._due.add(item)
+            self._where[item] = (-1, 0)
+        else:
+            self._place(item, tick)
+
+    def cancel(self, item: Hashable) -> bool:
+        if item not in self._ticks:
+            return False
+        del self._ticks[item]
+        where = self._where.pop(item)
+        if where is None:
+            self._overflow.discard(item)
+        elif where[0] < 0:
+            self._due.discard(item)
+        else:
+            self._wheels[where[0]][where[1]].discard(item)
+        return True
+
+    def _cascade(self, level: int):
+        slot = self._wheels[level][self._tick // self._spans[level] % self.slots]
+        items = list(slot)
+        slot.clear()
+        for item in items:
+            self._place(item, self._ticks[item])
+
+    def advance(self, now: Optional[float]=None) -> List[Hashable]:
+        target = int((time.time() if now is None else now) / self.resolution)
+        expired = list(self._due)
+        for item in expired:
+            del self._ticks[item]
+            del self._where[item]
+        self._due.clear()
+        while self._tick < target:
+            if not self._ticks:
+                self._tick = target
+                break
+            self._tick += 1
+            if self._tick % self._spans[self.levels] == 0 and self._overflow:
+                items = list(self._overflow)
+                self._overflow.clear()
+                for item in items:
+                    self._place(item, self._ticks[item])
+            for level in range(self.levels - 1, 0, -1):
+                if self._tick % self._spans[level] == 0:
+                    self._cascade(level)
+            slot = self._wheels[0][self._tick % self.slots]
+            if slot:
+                for item in slot:
+                    del self._ticks[item]
+                    del self._where[item]
+                expired.extend(slot)
+                slot.clear()
+        return expired
\ No newline at end of file
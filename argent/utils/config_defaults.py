@@ -1,2 +1,2 @@
-DEFAULT_CONFIG = {'userbot': {'name': 'Argent UserBot', 'version': '2.0.0', 'author': 'github.com/lonly19/Argent-Userbot', 'emoji': '⚗️', 'command_prefix': '.', 'language': 'ru', 'timezone': 'Europe/Moscow'}, 'logging': {'level': 'INFO', 'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s', 'file_logging': True, 'console_logging': True, 'max_log_size': 10485760, 'backup_count': 5}, 'modules': {'auto_load': True, 'load_on_startup': ['core_commands', 'system_info', 'module_manager', 'utils'], 'disabled_modules': [], 'module_timeout': 30}, 'security': {'allow_inline': True, 'check_permissions': True, 'admin_only_commands': ['eval', 'exec', 'terminal', 'restart'], 'trusted_users': [], 'blacklisted_users': []}, 'performance': {'flood_sleep_threshold': 60, 'request_retries': 3, 'connection_retries': 5, 'timeout': 30, 'max_concurrent_requests': 10}, 'database': {'backup_interval': 3600, 'auto_backup': True, 'max_backups': 10, 'compress_backups': True}, 'interface': {'show_startup_banner': True, 'show_command_help': True, 'use_emojis': True, 'compact_mode': False, 'hide_commands': False}, 'notifications': {'startup_message': True, 'error_notifications': True, 'module_load_notifications': False, 'command_execution_notifications': False}}
+DEFAULT_CONFIG = {'userbot': {'name': 'Argent UserBot', 'version': '2.0.0', 'author': 'github.com/lonly19/Argent-Userbot', 'emoji': '⚗️', 'command_prefix': '.', 'language': 'ru', 'timezone': 'Europe/Moscow'}, 'logging': {'level': 'INFO', 'format': '%(asctime)s - %(name)s - %(levelname)s - %(message)s', 'file_logging': True, 'console_logging': True, 'max_log_size': 10485760, 'backup_count': 5}, 'modules': {'auto_load': True, 'load_on_startup': ['core_commands', 'system_info', 'module_manager', 'utils'], 'disabled_modules': [], 'module_timeout': 30}, 'security': {'allow_inline': True, 'check_permissions': True, 'admin_only_commands': ['eval', 'exec', 'terminal', 'restart'], 'trusted_users': [], 'blacklisted_users': []}, 'performance': {'flood_sleep_threshold': 60, 'request_retries': 3, 'connection_retries': 5, 'timeout': 30, 'max_concurrent_requests': 10}, 'database': {'backup_interval': 3600, 'auto_backup': True, 'max_backups': 10, 'compress_backups': True, 'storage': 'json', 'write_behind': True, 'flush_interval': 2.0, 'codec': 'auto', 'shards': 0}, 'interface': {'show_startup_banner': True, 'show_command_help': True, 'use_emojis': True, 'compact_mode': False, 'hide_commands': False}, 'notifications': {'startup_message': True, 'error_notifications': True, 'module_load_notifications': False, 'command_execution_notifications': False}}
 DEFAULT_MODULE_CONFIG = {'core_commands': {'enabled': True, 'category': 'core'}, 'system_info': {'enabled': True, 'category': 'utils', 'show_detailed_info': True}, 'module_manager': {'enabled': True, 'category': 'core', 'allow_remote_install': False}, 'utils': {'enabled': True, 'category': 'utils'}}
@@ -1,41 +1,147 @@
-import json
+import asyncio
 import logging
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from pathlib import Path
+from contextlib import contextmanager
 from .config_defaults import DEFAULT_CONFIG, DEFAULT_MODULE_CONFIG
+from .config_schema import ArgentSettings, build_settings, to_bool
+from ..storage.codec import json_codec, read_file, write_file
+from ..storage.filelock import FileLock, FileStamp
+from .config_watcher import ConfigWatcher
 logger = logging.getLogger(__name__)
+_MISSING = object()
 
 class ConfigManager:
+    SAVE_DELAY = 0.5
 
-    def __init__(self, data_dir: str='.argent_data'):
+    def __init__(self, data_dir: str='.argent_data', save_delay: Optional[float]=None):
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         self.config_path = self.data_dir / 'config.json'
         self.user_config_path = self.data_dir / 'user_config.json'
+        self._paths = {'config': self.config_path, 'user_config': self.user_config_path}
         self._config = {}
         self._user_config = {}
-        self._load_env()
+        self._ops: Dict[str, List[Tuple[str, Optional[str], Any]]] = {'config': [], 'user_config': []}
+        self._flat: Optional[Dict[str, Any]] = None
+        self._settings: Optional[ArgentSettings] = None
+        self._published: Optional[Dict[str, Any]] = None
+        self._subscribers: Dict[str, List[Callable]] = {}
+        self._watcher: Optional[ConfigWatcher] = None
+        self._file_lock = FileLock(self.data_dir / 'config')
+        self._stamp = FileStamp(self.config_path, self.user_config_path)
+        self._batch_depth = 0
+        self._batch_snapshot = None
+        self._pending_saves = set()
+        self.save_delay = self.SAVE_DELAY if save_delay is None else max(0.0, float(save_delay))
+        self._save_handle: Optional[asyncio.TimerHandle] = None
         self._load_config()
+        self._load_env()
 
     def _load_config(self):
-        if self.config_path.exists():
-            try:
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    self._config = json.load(f)
-            except Exception as e:
-                logger.error(f'❌ Ошибка загрузки config.json: {e}')
-                self._config = {}
-        if self.user_config_path.exists():
+        with self._file_lock:
+            self._reload()
+            if not self._user_config:
+                self._mutate('user_config', 'reset', None)
+                self._write_layer('user_config')
+
+    def _reload(self):
+        for layer, path in self._paths.items():
+            if not path.exists():
+                continue
             try:
-                with open(self.user_config_path, 'r', encoding='utf-8') as f:
-                    self._user_config = json.load(f)
+                data = read_file(path)
             except Exception as e:
-                logger.error(f'❌ Ошибка загрузки user_config.json: {e}')
-                self._user_config = {}
-        if not self._user_config:
-            self._user_config = self._deep_copy_dict(DEFAULT_CONFIG)
-            self._save_user_config()
+                logger.error(f'❌ Ошибка загрузки {path.name}: {e}')
+                continue
+            setattr(self, '_' + layer, data)
+            for op in self._ops[layer]:
+                self._apply(layer, *op)
+        self._invalidate()
+        self._stamp.update()
+
+    def _sync(self):
+        if not self._batch_depth and self._stamp.changed():
+            with self._file_lock:
+                self._reload()
+            self._publish()
+
+    def refresh(self) -> bool:
+        if self._batch_depth or not self._stamp.changed(force=True):
+            return False
+        with self._file_lock:
+            self._reload()
+        logger.info('🔄 Конфигурация перечитана с диска')
+        self._publish()
+        return True
+
+    def start_watcher(self, loop=None, poll_interval: Optional[float]=None):
+        if self._watcher is None:
+            self._watcher = ConfigWatcher(self._paths.values(), self.refresh, poll_interval)
+            self._watcher.start(loop)
+
+    def stop_watcher(self):
+        if self._watcher is not None:
+            self._watcher.stop()
+            self._watcher = None
+
+    def subscribe(self, prefix: str, callback: Callable):
+        if self._published is None:
+            self._publish(force=True)
+        callbacks = self._subscribers.get(prefix, [])
+        if callback not in callbacks:
+            self._subscribers[prefix] = callbacks + [callback]
+
+    def unsubscribe(self, prefix: str, callback: Callable):
+        callbacks = [c for c in self._subscribers.get(prefix, []) if c != callback]
+        if callbacks:
+            self._subscribers[prefix] = callbacks
+        else:
+            self._subscribers.pop(prefix, None)
+        if not self._subscribers:
+            self._published = None
+
+    def _publish(self, force: bool=False):
+        if not (self._subscribers or force) or self._batch_depth:
+            return
+        flat = self._flat or self._compile()
+        leaves = self._deep_copy_dict({path: value for path, value in flat.items() if not isinstance(value, dict)})
+        old, self._published = (self._published, leaves)
+        if old is None:
+            return
+        changes = sorted((path for path in old.keys() | leaves.keys() if old.get(path, _MISSING) != leaves.get(path, _MISSING)))
+        for path in changes:
+            for prefix, callbacks in list(self._subscribers.items()):
+                if prefix and path != prefix and (not path.startswith(prefix + '.')):
+                    continue
+                for callback in callbacks:
+                    try:
+                        callback(path, old.get(path), leaves.get(path))
+                    except Exception as e:
+                        logger.error(f'❌ Ошибка обработчика конфигурации {path}: {e}')
+
+    def _invalidate(self):
+        self._flat = None
+        self._settings = None
+
+    def _apply(self, layer: str, kind: str, path: Optional[str], value: Any=None):
+        self._invalidate()
+        data = getattr(self, '_' + layer)
+        if kind == 'set':
+            self._set_nested_value(data, path, value)
+        elif kind == 'delete':
+            self._delete_nested_value(data, path)
+        elif path is None:
+            setattr(self, '_' + layer, self._deep_copy_dict(DEFAULT_CONFIG))
+        else:
+            default_value = self._get_nested_value(DEFAULT_CONFIG, path)
+            if default_value is not None:
+                self._set_nested_value(data, path, self._deep_copy_dict({'v': default_value})['v'])
+
+    def _mutate(self, layer: str, kind: str, path: Optional[str], value: Any=None):
+        self._apply(layer, kind, path, value)
+        self._ops[layer].append((kind, path, value))
 
     def _load_env(self):
         try:
@@ -47,35 +153,91 @@ class ConfigManager:
             api_id = os.getenv('TELEGRAM_API_ID') or os.getenv('API_ID')
             api_hash = os.getenv('TELEGRAM_API_HASH') or os.getenv('API_HASH')
             bot_token = os.getenv('TELEGRAM_BOT_TOKEN') or os.getenv('BOT_TOKEN')
+            values = {}
             if api_id and api_hash:
-                try:
-                    self.set_system('api_id', int(api_id), save=False)
-                except Exception:
-                    self.set_system('api_id', api_id, save=False)
-                self.set_system('api_hash', str(api_hash), save=False)
+                values['api_id'] = int(api_id) if api_id.strip().isdigit() else api_id
+                values['api_hash'] = str(api_hash)
             if bot_token:
-                self.set_system('bot_token', str(bot_token), save=False)
-            if self._config:
-                self._save_config()
+                values['bot_token'] = str(bot_token)
+            for path, value in values.items():
+                if self._config.get(path) != value:
+                    self._mutate('config', 'set', path, value)
+                    self._pending_saves.add('config')
         except Exception:
             pass
 
-    def _save_config(self):
+    @contextmanager
+    def batch(self):
+        outer = self._batch_depth == 0
+        if outer:
+            self._batch_snapshot = (self._deep_copy_dict(self._config), self._deep_copy_dict(self._user_config), {layer: len(ops) for layer, ops in self._ops.items()}, set(self._pending_saves))
+        self._batch_depth += 1
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._config, f, ensure_ascii=False, indent=2)
-        except Exception as e:
-            logger.error(f'❌ Ошибка сохранения config.json: {e}')
+            yield self
+        except BaseException:
+            if outer:
+                self._config, self._user_config, op_counts, self._pending_saves = self._batch_snapshot
+                for layer, count in op_counts.items():
+                    del self._ops[layer][count:]
+                self._invalidate()
+            raise
+        finally:
+            self._batch_depth -= 1
+            if outer:
+                self._batch_snapshot = None
+        if outer:
+            if self._pending_saves and (not self._schedule_save()):
+                self.flush()
+            self._publish()
 
-    def _save_user_config(self):
+    def _schedule_save(self) -> bool:
+        if self.save_delay <= 0:
+            return False
         try:
-            with open(self.user_config_path, 'w', encoding='utf-8') as f:
-                json.dump(self._user_config, f, ensure_ascii=False, indent=2)
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        if self._save_handle is None:
+            self._save_handle = loop.call_later(self.save_delay, self.flush)
+        return True
+
+    def flush(self):
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+        if self._batch_depth:
+            return
+        pending, self._pending_saves = (self._pending_saves, set())
+        for layer in self._paths:
+            if layer in pending:
+                self._write_layer(layer)
+
+    def _save_layer(self, layer: str):
+        self._pending_saves.add(layer)
+        if not self._batch_depth and (not self._schedule_save()):
+            self.flush()
+
+    def _write_layer(self, layer: str):
+        path = self._paths[layer]
+        try:
+            with self._file_lock:
+                if self._stamp.changed(force=True):
+                    self._reload()
+                write_file(path, getattr(self, '_' + layer), pretty=True)
+                self._stamp.update()
+                self._ops[layer] = []
         except Exception as e:
-            logger.error(f'❌ Ошибка сохранения user_config.json: {e}')
+            logger.error(f'❌ Ошибка сохранения {path.name}: {e}')
+
+    def _save_config(self):
+        self._save_layer('config')
+
+    def _save_user_config(self):
+        self._save_layer('user_config')
 
     def _deep_copy_dict(self, d: Dict) -> Dict:
-        return json.loads(json.dumps(d))
+        codec = json_codec()
+        return codec.loads(codec.dumps(d))
 
     def _get_nested_value(self, data: Dict, path: str, default: Any=None) -> Any:
         keys = path.split('.')
@@ -96,65 +258,129 @@ class ConfigManager:
             current = current[key]
         current[keys[-1]] = value
 
+    def _delete_nested_value(self, data: Dict, path: str) -> bool:
+        self._invalidate()
+        keys = path.split('.')
+        current = data
+        for key in keys[:-1]:
+            if key not in current or not isinstance(current[key], dict):
+                return False
+            current = current[key]
+        if keys[-1] in current:
+            del current[keys[-1]]
+            return True
+        return False
+
+    def _flatten(self, flat: Dict[str, Any], data: Dict, prefix: str=''):
+        for key, value in data.items():
+            if not isinstance(key, str) or '.' in key or value is None:
+                continue
+            path = prefix + key
+            if path not in flat:
+                flat[path] = value
+            if isinstance(value, dict):
+                self._flatten(flat, value, path + '.')
+
+    def _compile(self) -> Dict[str, Any]:
+        flat = {}
+        for layer in (self._user_config, self._config, DEFAULT_CONFIG):
+            self._flatten(flat, layer)
+        self._flat = flat
+        return flat
+
     def get(self, path: str, default: Any=None) -> Any:
-        value = self._get_nested_value(self._user_config, path)
-        if value is not None:
+        self._sync()
+        return (self._flat or self._compile()).get(path, default)
+
+    @property
+    def settings(self) -> ArgentSettings:
+        self._sync()
+        settings = self._settings
+        if settings is None:
+            settings, errors = build_settings(self._flat or self._compile())
+            for error in errors:
+                logger.warning(f'⚠️ Некорректное значение конфигурации {error}, используется значение по умолчанию')
+            self._settings = settings
+        return settings
+
+    def get_bool(self, path: str, default: bool=False) -> bool:
+        value = self.get(path, _MISSING)
+        if value is _MISSING:
+            return default
+        try:
+            return to_bool(value)
+        except ValueError:
+            return default
+
+    def get_int(self, path: str, default: int=0) -> int:
+        value = self.get(path, _MISSING)
+        if isinstance(value, int) and (not isinstance(value, bool)):
             return value
-        value = self._get_nested_value(self._config, path)
-        if value is not None:
+        try:
+            return int(value) if value is not _MISSING and (not isinstance(value, bool)) else default
+        except (TypeError, ValueError):
+            return default
+
+    def get_float(self, path: str, default: float=0.0) -> float:
+        value = self.get(path, _MISSING)
+        if isinstance(value, float):
             return value
-        value = self._get_nested_value(DEFAULT_CONFIG, path)
-        if value is not None:
+        try:
+            return float(value) if value is not _MISSING and (not isinstance(value, bool)) else default
+        except (TypeError, ValueError):
+            return default
+
+    def get_str(self, path: str, default: str='') -> str:
+        value = self.get(path, _MISSING)
+        if isinstance(value, str):
             return value
-        return default
+        return default if value is _MISSING or isinstance(value, (dict, list)) else str(value)
+
+    def get_list(self, path: str, default: Optional[List]=None) -> List:
+        value = self.get(path, _MISSING)
+        if isinstance(value, list):
+            return value
+        if isinstance(value, (tuple, set)):
+            return list(value)
+        if isinstance(value, str) and value:
+            return [item.strip() for item in value.split(',') if item.strip()]
+        return [] if default is None else default
 
     def set(self, path: str, value: Any, save: bool=True):
-        self._set_nested_value(self._user_config, path, value)
+        self._mutate('user_config', 'set', path, value)
         if save:
             self._save_user_config()
+        self._publish()
 
     def set_system(self, path: str, value: Any, save: bool=True):
-        self._set_nested_value(self._config, path, value)
+        self._mutate('config', 'set', path, value)
         if save:
             self._save_config()
+        self._publish()
 
     def delete_system(self, path: str, save: bool=True) -> bool:
-        keys = path.split('.')
-        current = self._config
-        for key in keys[:-1]:
-            if key not in current or not isinstance(current[key], dict):
-                return False
-            current = current[key]
-        if keys[-1] in current:
-            del current[keys[-1]]
-            if save:
-                self._save_config()
-            return True
-        return False
+        if not self._delete_nested_value(self._config, path):
+            return False
+        self._ops['config'].append(('delete', path, None))
+        if save:
+            self._save_config()
+        self._publish()
+        return True
 
     def delete(self, path: str, save: bool=True) -> bool:
-        keys = path.split('.')
-        current = self._user_config
-        for key in keys[:-1]:
-            if key not in current:
-                return False
-            current = current[key]
-        if keys[-1] in current:
-            del current[keys[-1]]
-            if save:
-                self._save_user_config()
-            return True
-        return False
+        if not self._delete_nested_value(self._user_config, path):
+            return False
+        self._ops['user_config'].append(('delete', path, None))
+        if save:
+            self._save_user_config()
+        self._publish()
+        return True
 
     def reset_to_default(self, path: str=None, save: bool=True):
-        if path is None:
-            self._user_config = self._deep_copy_dict(DEFAULT_CONFIG)
-        else:
-            default_value = self._get_nested_value(DEFAULT_CONFIG, path)
-            if default_value is not None:
-                self._set_nested_value(self._user_config, path, default_value)
+        self._mutate('user_config', 'reset', path)
         if save:
             self._save_user_config()
+        self._publish()
 
     def get_api_credentials(self) -> Optional[Dict[str, Any]]:
         api_id = self.get('api_id')
@@ -164,8 +390,9 @@ class ConfigManager:
         return None
 
     def set_api_credentials(self, api_id: int, api_hash: str):
-        self.set_system('api_id', api_id)
-        self.set_system('api_hash', api_hash)
+        with self.batch():
+            self.set_system('api_id', api_id)
+            self.set_system('api_hash', api_hash)
 
     def get_session_string(self) -> Optional[str]:
         s = self.get('session_string')
@@ -179,8 +406,9 @@ class ConfigManager:
 
     def clear_argent_session_key(self):
         try:
-            removed1 = self.delete_system('user_session', save=False)
-            removed2 = self.delete_system('session_string', save=True)
+            with self.batch():
+                removed1 = self.delete_system('user_session')
+                removed2 = self.delete_system('session_string')
             return removed1 or removed2
         except Exception:
             return False
@@ -208,6 +436,7 @@ class ConfigManager:
         self.set_system('setup_completed', True)
 
     def get_all_config(self) -> Dict[str, Any]:
+        self._sync()
         result = self._deep_copy_dict(DEFAULT_CONFIG)
         for key, value in self._config.items():
             if isinstance(value, dict) and key in result:
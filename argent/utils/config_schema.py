@@ -0,0 +1,171 @@
+from dataclasses import dataclass, fields, is_dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union, get_args, get_origin
+from .config_defaults import DEFAULT_CONFIG
+_MISSING = object()
+TRUE_STRINGS = frozenset(('1', 'true', 'yes', 'on', 'да'))
+FALSE_STRINGS = frozenset(('0', 'false', 'no', 'off', 'нет', ''))
+
+@dataclass(frozen=True)
+class UserbotSettings:
+    name: str
+    version: str
+    author: str
+    emoji: str
+    command_prefix: str
+    language: str
+    timezone: str
+
+@dataclass(frozen=True)
+class LoggingSettings:
+    level: str
+    format: str
+    file_logging: bool
+    console_logging: bool
+    max_log_size: int
+    backup_count: int
+
+@dataclass(frozen=True)
+class ModulesSettings:
+    auto_load: bool
+    load_on_startup: Tuple[str, ...]
+    disabled_modules: Tuple[str, ...]
+    module_timeout: float
+
+@dataclass(frozen=True)
+class SecuritySettings:
+    allow_inline: bool
+    check_permissions: bool
+    admin_only_commands: Tuple[str, ...]
+    trusted_users: tuple
+    blacklisted_users: tuple
+
+@dataclass(frozen=True)
+class PerformanceSettings:
+    flood_sleep_threshold: int
+    request_retries: int
+    connection_retries: int
+    timeout: float
+    max_concurrent_requests: int
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    backup_interval: int
+    auto_backup: bool
+    max_backups: int
+    compress_backups: bool
+    storage: str
+    write_behind: bool
+    flush_interval: float
+    codec: str
+    shards: int
+
+@dataclass(frozen=True)
+class InterfaceSettings:
+    show_startup_banner: bool
+    show_command_help: bool
+    use_emojis: bool
+    compact_mode: bool
+    hide_commands: bool
+
+@dataclass(frozen=True)
+class NotificationsSettings:
+    startup_message: bool
+    error_notifications: bool
+    module_load_notifications: bool
+    command_execution_notifications: bool
+
+@dataclass(frozen=True)
+class ArgentSettings:
+    userbot: UserbotSettings
+    logging: LoggingSettings
+    modules: ModulesSettings
+    security: SecuritySettings
+    performance: PerformanceSettings
+    database: DatabaseSettings
+    interface: InterfaceSettings
+    notifications: NotificationsSettings
+    api_id: Optional[int]
+    api_hash: Optional[str]
+    bot_token: Optional[str]
+    session_string: Optional[str]
+    setup_completed: bool
+
+def to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str):
+        lowered = value.strip().lower()
+        if lowered in TRUE_STRINGS:
+            return True
+        if lowered in FALSE_STRINGS:
+            return False
+    elif isinstance(value, (int, float)):
+        return bool(value)
+    raise ValueError('expected bool')
+
+def _to_int(value: Any) -> int:
+    if isinstance(value, bool):
+        raise ValueError('expected int')
+    if isinstance(value, float) and (not value.is_integer()):
+        raise ValueError('expected int')
+    return int(value)
+
+def _to_float(value: Any) -> float:
+    if isinstance(value, bool):
+        raise ValueError('expected float')
+    return float(value)
+
+def _to_str(value: Any) -> str:
+    if isinstance(value, (dict, list, tuple, bool)) or value is None:
+        raise ValueError('expected str')
+    return str(value)
+
+def _to_tuple(value: Any) -> tuple:
+    if isinstance(value, (list, tuple, set)):
+        return tuple(value)
+    if isinstance(value, str):
+        return tuple((item.strip() for item in value.split(',') if item.strip()))
+    raise ValueError('expected list')
+_COERCERS: Dict[Any, Callable[[Any], Any]] = {bool: to_bool, int: _to_int, float: _to_float, str: _to_str, tuple: _to_tuple}
+
+def _converter(annotation: Any) -> Tuple[Callable[[Any], Any], bool]:
+    origin = get_origin(annotation)
+    if origin is Union:
+        inner = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return (_converter(inner[0])[0], True)
+    return (_COERCERS[origin or annotation], False)
+
+def _default(path: str) -> Any:
+    current = DEFAULT_CONFIG
+    for key in path.split('.'):
+        if not isinstance(current, dict) or key not in current:
+            return _MISSING
+        current = current[key]
+    return current
+
+def _build(cls, values: Dict[str, Any], prefix: str, errors: List[str]):
+    kwargs = {}
+    for item in fields(cls):
+        path = prefix + item.name
+        if is_dataclass(item.type):
+            kwargs[item.name] = _build(item.type, values, path + '.', errors)
+            continue
+        convert, optional = _converter(item.type)
+        for candidate in (values.get(path, _MISSING), _default(path)):
+            if candidate is _MISSING or candidate is None:
+                if optional:
+                    kwargs[item.name] = None
+                    break
+                continue
+            try:
+                kwargs[item.name] = convert(candidate)
+                break
+            except (TypeError, ValueError):
+                errors.append(f'{path}={candidate!r}')
+        else:
+            kwargs[item.name] = (get_origin(item.type) or item.type)()
+    return cls(**kwargs)
+
+def build_settings(values: Dict[str, Any]) -> Tuple[ArgentSettings, List[str]]:
+    errors: List[str] = []
+    return (_build(ArgentSettings, values, '', errors), errors)
\ No newline at end of file
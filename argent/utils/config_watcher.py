@@ -0,0 +1,123 @@
+import asyncio
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+from ..storage.filelock import FileStamp
+logger = logging.getLogger(__name__)
+_IN_MODIFY = 2
+_IN_CLOSE_WRITE = 8
+_IN_MOVED_TO = 128
+_IN_CREATE = 256
+_IN_DELETE = 512
+_EVENT = struct.Struct('iIII')
+
+def _inotify():
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        return libc if hasattr(libc, 'inotify_init1') else None
+    except OSError:
+        return None
+
+class ConfigWatcher:
+    POLL_INTERVAL = 1.0
+    DEBOUNCE = 0.05
+
+    def __init__(self, paths: Iterable[Path], callback: Callable[[], None], poll_interval: Optional[float]=None):
+        self.paths = [Path(path) for path in paths]
+        self.names = {path.name for path in self.paths}
+        self.callback = callback
+        self.poll_interval = poll_interval or self.POLL_INTERVAL
+        self.mode: Optional[str] = None
+        self._fd: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._poller: Optional[asyncio.Task] = None
+        self._pending: Optional[asyncio.TimerHandle] = None
+
+    def start(self, loop: Optional[asyncio.AbstractEventLoop]=None):
+        if self.mode is not None:
+            return
+        self._loop = loop or asyncio.get_running_loop()
+        if self._start_inotify():
+            self.mode = 'inotify'
+        else:
+            self._poller = self._loop.create_task(self._poll(FileStamp(*self.paths, interval=0)))
+            self.mode = 'poll'
+        logger.info(f'👀 Config watcher started ({self.mode})')
+
+    def _start_inotify(self) -> bool:
+        libc = _inotify()
+        if libc is None:
+            return False
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return False
+        mask = _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE | _IN_MODIFY
+        for directory in {path.parent for path in self.paths}:
+            if libc.inotify_add_watch(fd, str(directory).encode(), mask) < 0:
+                logger.warning(f'⚠️ inotify watch failed for {directory}: {os.strerror(ctypes.get_errno())}')
+                os.close(fd)
+                return False
+        try:
+            self._loop.add_reader(fd, self._on_inotify)
+        except (NotImplementedError, RuntimeError):
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def _on_inotify(self):
+        try:
+            payload = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            logger.error(f'❌ Config watcher read error: {e}')
+            return
+        offset = 0
+        relevant = False
+        while offset + _EVENT.size <= len(payload):
+            _, _, _, length = _EVENT.unpack_from(payload, offset)
+            name = payload[offset + _EVENT.size:offset + _EVENT.size + length].rstrip(b'\x00').decode('utf-8', 'replace')
+            offset += _EVENT.size + length
+            relevant = relevant or name in self.names
+        if relevant:
+            self._schedule()
+
+    def _schedule(self):
+        if self._pending is not None:
+            self._pending.cancel()
+        self._pending = self._loop.call_later(self.DEBOUNCE, self._fire)
+
+    def _fire(self):
+        self._pending = None
+        try:
+            self.callback()
+        except Exception as e:
+            logger.error(f'❌ Config watcher callback error: {e}')
+
+    async def _poll(self, stamp: FileStamp):
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if stamp.changed():
+                stamp.update()
+                self._fire()
+
+    def stop(self):
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._fd is not None:
+            try:
+                self._loop.remove_reader(self._fd)
+            except Exception:
+                pass
+            os.close(self._fd)
+            self._fd = None
+        if self._poller is not None:
+            self._poller.cancel()
+            self._poller = None
+        self.mode = None
\ No newline at end of file
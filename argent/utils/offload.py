@@ -0,0 +1,75 @@
+import asyncio
+import functools
+import logging
+import os
+import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+logger = logging.getLogger(__name__)
+_SHUTDOWN_KWARGS = {'cancel_futures': True} if sys.version_info >= (3, 9) else {}
+
+class PoolStats:
+    __slots__ = ('submitted', 'active', 'completed', 'failed', 'busy_time', 'max_time')
+
+    def __init__(self):
+        self.submitted = 0
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.max_time = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+class Offloader:
+
+    def __init__(self, threads: Optional[int]=None, processes: Optional[int]=None):
+        self.threads = threads or min(32, (os.cpu_count() or 1) + 4)
+        self.processes = processes or max(1, (os.cpu_count() or 1) - 1)
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {'thread': PoolStats(), 'process': PoolStats()}
+
+    def _pool(self, kind: str) -> Executor:
+        if kind == 'process':
+            if self._process_pool is None:
+                self._process_pool = ProcessPoolExecutor(max_workers=self.processes)
+            return self._process_pool
+        if self._thread_pool is None:
+            self._thread_pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix='argent-offload')
+        return self._thread_pool
+
+    async def _submit(self, kind: str, func: Callable, args: tuple, kwargs: dict) -> Any:
+        call = functools.partial(func, *args, **kwargs) if kwargs else functools.partial(func, *args)
+        stats = self.stats[kind]
+        stats.submitted += 1
+        stats.active += 1
+        started = time.perf_counter()
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self._pool(kind), call)
+            stats.completed += 1
+            return result
+        except Exception:
+            stats.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            stats.active -= 1
+            stats.busy_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        return await self._submit('thread', func, args, kwargs)
+
+    async def run_process(self, func: Callable, *args, **kwargs) -> Any:
+        return await self._submit('process', func, args, kwargs)
+
+    def shutdown(self, wait: bool=False):
+        for pool in (self._thread_pool, self._process_pool):
+            if pool is not None:
+                pool.shutdown(wait=wait, **_SHUTDOWN_KWARGS)
+        self._thread_pool = None
+        self._process_pool = None
+offloader = Offloader()
\ No newline at end of file
@@ -7,6 +7,7 @@ from datetime import datetime, timedelta
 import hashlib
 import random
 import string
+from .offload import offloader
 logger = logging.getLogger(__name__)
 
 class ArgentUtils:
@@ -156,8 +157,11 @@ class ArgentUtils:
 
     @staticmethod
     async def run_sync(func, *args, **kwargs):
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, func, *args, **kwargs)
+        return await offloader.run(func, *args, **kwargs)
+
+    @staticmethod
+    async def run_process(func, *args, **kwargs):
+        return await offloader.run_process(func, *args, **kwargs)
 
     @staticmethod
     async def sleep_random(min_seconds: float, max_seconds: float):